@@ -9,7 +9,17 @@ SEARCH_SETTINGS = {
     'default_top_matches': 3,
     'fuzzy_threshold': 60,
     'high_similarity_threshold': 70,
-    'items_per_page': 4
+    'items_per_page': 4,
+    'fulltext_prefilter': False, # MATCH ... AGAINST candidate set before exact matching; FULLTEXT only
+                                 # matches whole words/prefixes, so "sql" in "MySQL" would be missed
+    'stream_chunk_size': 200,    # rows per fetchmany() from the unbuffered resumes cursor
+    'resume_cache_size': 32,     # full resume rows kept for summary / view CV
+    'progressive_results': True, # emit provisional top-k while the corpus is still being scanned
+    'progressive_interval_ms': 150,
+    'ranking': 'count',          # 'count' = total matches, 'bm25' = BM25F over resume_terms postings
+    'field_boosts': {'skills': 3.0, 'experience': 2.0, 'body': 1.0},
+    'bm25_k1': 1.2,
+    'bm25_b': 0.75
 }
 
 ENCRYPTION_SETTINGS = {
@@ -20,5 +30,50 @@ ENCRYPTION_SETTINGS = {
         'address', 
         'phone_number'
     ],
-    'master_key': 'BukitDuri_SecureKey_CV_Analyzer'
-}
\ No newline at end of file
+    'master_key': 'BukitDuri_SecureKey_CV_Analyzer',
+    'key_id': 1,                     # stored in every ciphertext envelope, bump when rotating master_key
+    'plaintext_cache_size': 2048,    # decrypted values kept in memory, keyed by ciphertext
+    'plaintext_cache_ttl': 300,      # seconds
+    'blind_index_key': None,         # None = derive from master_key
+    'blind_index_prefix_min': 2,     # shortest name prefix that can be searched
+    'reencrypt_chunk_size': 500,     # rows per chunk/commit in encrypt_existing_data.py
+    'reencrypt_workers': 2
+}
+
+INGEST_SETTINGS = {
+    'source': 'text',  # 'text' = data/regex & data/string corpus (PDF fallback), 'pdf' = PyMuPDF only
+    'workers': 2,
+    'timeout_seconds': 30,
+    'memory_limit_mb': 1536
+}
+
+SERVICE_SETTINGS = {
+    'host': '127.0.0.1',             # localhost only
+    'port': 8765,
+    'source': 'corpus',              # 'corpus' = in-memory data/regex text, 'db' = MySQL
+    'workers': 2,                    # search worker processes, each keeps the corpus in memory
+    'max_concurrent_searches': 2,    # searches running at once
+    'max_queued_searches': 32,       # waiting searches beyond this get 503
+    'keepalive_timeout': 15,         # seconds an idle keep-alive connection stays open
+    'max_body_bytes': 65536,
+    'default_top_k': 10,
+    'max_top_k': 100
+}
+
+TRACING_SETTINGS = {
+    'enabled': False,                                 # export satu record JSONL per search (env BUKDUR_TRACE=1)
+    'path': 'logs/search_trace.jsonl',                # relatif ke root project
+    'max_bytes': 5 * 1024 * 1024,                     # rotasi ke .1 .. .<backups> setelah ukuran ini
+    'backups': 3
+}
+
+PROFILING_SETTINGS = {
+    'targets': [],                    # 'search', 'extract', 'ingest' (env BUKDUR_PROFILE menimpa ini)
+    'profiler': 'cprofile',           # 'cprofile' (deterministik) atau 'sample' (env BUKDUR_PROFILER)
+    'sample_interval_ms': 5,
+    'output_dir': 'logs/profiles',    # relatif ke root project
+    'top_n': 30,                      # baris per tabel di ringkasan .txt
+    'tracemalloc': False,             # snapshot alokasi per run (env BUKDUR_TRACEMALLOC); lambat di loop matcher
+    'tracemalloc_frames': 5,
+    'min_duration_ms': 0              # run yang lebih cepat tidak ditulis
+}
@@ -4,10 +4,11 @@ import subprocess
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 sys.path.append(os.path.dirname(__file__))
-from config import DATABASE_CONFIG
+from config import DATABASE_CONFIG, INGEST_SETTINGS
 
-from db.db_connector import DatabaseManager
-from core.extractor import extract_text_from_pdf, extract_profile_data
+from db.db_connector import DatabaseManager, profile_column_type
+from core.ingest import IsolatedIngestPool, get_ingest_source
+from core.profiling import profile_run
 
 def setup_database():
     """Setup database and load initial data"""
@@ -29,12 +30,20 @@ def setup_database():
     print("Running seeding SQL file...")
     run_seeding_sql(DATABASE_CONFIG)
     
+    print("Building name blind index for applicant profiles...")
+    db.rebuild_blind_index('ApplicantProfile')
+    
     # Add profile columns to resumes table
     print("Adding profile columns to resumes table...")
     add_profile_columns_to_resumes(db)
     
-    print("Loading resume data from PDF files...")
-    load_resume_data(db)
+    print("Loading resume data...")
+    with profile_run("ingest", role="setup_database"):
+        load_resume_data(db)
+    
+    # postings dibangun sekali setelah load, bukan per insert
+    print("Building term index (BM25 / structured query postings)...")
+    db.rebuild_term_index()
     
     db.disconnect()
     print("Database setup completed successfully!")
@@ -80,14 +89,14 @@ def add_profile_columns_to_resumes(db: DatabaseManager):
         cursor = db.connection.cursor()
         
         # Add new columns to existing resumes table
-        alter_resumes = """
+        alter_resumes = f"""
         ALTER TABLE resumes 
         ADD COLUMN IF NOT EXISTS applicant_id INT DEFAULT NULL,
-        ADD COLUMN IF NOT EXISTS first_name VARCHAR(50) DEFAULT NULL,
-        ADD COLUMN IF NOT EXISTS last_name VARCHAR(50) DEFAULT NULL,
+        ADD COLUMN IF NOT EXISTS first_name {profile_column_type('first_name', 'VARCHAR(50)')} DEFAULT NULL,
+        ADD COLUMN IF NOT EXISTS last_name {profile_column_type('last_name', 'VARCHAR(50)')} DEFAULT NULL,
         ADD COLUMN IF NOT EXISTS date_of_birth DATE DEFAULT NULL,
-        ADD COLUMN IF NOT EXISTS address VARCHAR(255) DEFAULT NULL,
-        ADD COLUMN IF NOT EXISTS phone_number VARCHAR(20) DEFAULT NULL,
+        ADD COLUMN IF NOT EXISTS address {profile_column_type('address', 'VARCHAR(255)')} DEFAULT NULL,
+        ADD COLUMN IF NOT EXISTS phone_number {profile_column_type('phone_number', 'VARCHAR(20)')} DEFAULT NULL,
         ADD COLUMN IF NOT EXISTS application_role VARCHAR(100) DEFAULT NULL
         """
         
@@ -98,11 +107,11 @@ def add_profile_columns_to_resumes(db: DatabaseManager):
             # Try adding columns one by one if batch fails
             columns_to_add = [
                 ('applicant_id', 'INT DEFAULT NULL'),
-                ('first_name', 'VARCHAR(50) DEFAULT NULL'),
-                ('last_name', 'VARCHAR(50) DEFAULT NULL'),
+                ('first_name', f"{profile_column_type('first_name', 'VARCHAR(50)')} DEFAULT NULL"),
+                ('last_name', f"{profile_column_type('last_name', 'VARCHAR(50)')} DEFAULT NULL"),
                 ('date_of_birth', 'DATE DEFAULT NULL'),
-                ('address', 'VARCHAR(255) DEFAULT NULL'),
-                ('phone_number', 'VARCHAR(20) DEFAULT NULL'),
+                ('address', f"{profile_column_type('address', 'VARCHAR(255)')} DEFAULT NULL"),
+                ('phone_number', f"{profile_column_type('phone_number', 'VARCHAR(20)')} DEFAULT NULL"),
                 ('application_role', 'VARCHAR(100) DEFAULT NULL')
             ]
             
@@ -121,7 +130,7 @@ def add_profile_columns_to_resumes(db: DatabaseManager):
         db.connection.rollback()
 
 def load_resume_data(db: DatabaseManager):
-    """Load resume data from PDF files into database with profile integration"""
+    """Load resume data from the text corpus (or PDF files) into database with profile integration"""
     base_dir = os.path.dirname(os.path.abspath(__file__))
     pdf_dir = os.path.join(base_dir, "data", "pdf")
     
@@ -146,124 +155,134 @@ def load_resume_data(db: DatabaseManager):
     
     loaded_count = 0
     error_count = 0
-    total_files = 0
     
-    # Count total files
-    for category in os.listdir(pdf_dir):
-        category_path = os.path.join(pdf_dir, category)
-        if os.path.isdir(category_path):
-            pdf_files = [f for f in os.listdir(category_path) if f.endswith('.pdf')]
-            total_files += len(pdf_files)
+    source = get_ingest_source(
+        os.path.join(base_dir, "data"),
+        INGEST_SETTINGS.get('source', 'text')
+    )
     
-    print(f"Total PDF files found: {total_files}")
-
-    limit = None
-    for category in os.listdir(pdf_dir):
-        category_path = os.path.join(pdf_dir, category)
-        if not os.path.isdir(category_path):
-            continue
-            
-        print(f"\nProcessing category: {category}")
-        
-        pdf_files = [f for f in os.listdir(category_path) if f.endswith('.pdf')]
+    tasks = []
+    for category, pdf_files in source.categories():
         print(f"Found {len(pdf_files)} PDF files in {category}")
+        tasks.extend(source.make_task(category, filename) for filename in pdf_files)
+    
+    sidecar_count = sum(1 for task in tasks if task['text_path'])
+    print(f"Using {sidecar_count} pre-extracted text files, {len(tasks) - sidecar_count} PDFs need extraction")
+    
+    total_files = len(tasks)
+    print(f"Total PDF files found: {total_files}")
+    
+    # each document runs in an isolated worker with a time and memory budget
+    pool = IsolatedIngestPool(
+        workers=INGEST_SETTINGS.get('workers', 2),
+        timeout_seconds=INGEST_SETTINGS.get('timeout_seconds', 30),
+        memory_limit_mb=INGEST_SETTINGS.get('memory_limit_mb'),
+        on_failure=lambda task, reason, mode: db.insert_ingest_failure(
+            task['filename'], task['category'], task['file_path'], mode, reason
+        )
+    )
+    
+    for idx, (task, result) in enumerate(pool.run(tasks), 1):
+        filename = task['filename']
+        category = task['category']
+        pdf_path = task['file_path']
         
-        files_to_process = pdf_files if limit is None else pdf_files[:limit]
-        if limit and len(pdf_files) > limit:
-            print(f"Processing first {limit} files only...")
-        
-        for idx, filename in enumerate(files_to_process, 1):
-            pdf_path = os.path.join(category_path, filename)
+        try:
+            print(f"Processing ({idx}/{total_files}): {category}/{filename}")
+            
+            if result['error']:
+                print(f"Skipping {filename}: {result['error']}")
+                error_count += 1
+                continue
             
-            try:
-                print(f"Processing ({idx}/{len(files_to_process)}): {filename}")
-                
-                extracted_text = extract_text_from_pdf(pdf_path)
-                if not extracted_text:
-                    print(f"No text extracted from {filename}")
-                    error_count += 1
-                    continue
-                
-                print(f"Extracted {len(extracted_text)} characters")
-                
-                profile = extract_profile_data(extracted_text)
-                
-                skills = ", ".join(profile.get('skills', []))[:2000] 
-                
-                experience_list = []
-                for exp in profile.get('experience', []):
-                    exp_text = f"{exp.get('title', '')} at {exp.get('company', '')} ({exp.get('period', '')})"
-                    experience_list.append(exp_text)
-                experience = " | ".join(experience_list)[:2000] 
-                
-                education_list = []
-                for edu in profile.get('education', []):
-                    edu_text = f"{edu.get('degree', '')} in {edu.get('field', '')} from {edu.get('institution', '')}"
-                    education_list.append(edu_text)
-                education = " | ".join(education_list)[:1000]  
-                
-                gpa = None
-                if profile.get('gpa'):
-                    try:
-                        gpa = float(profile['gpa'][0])
-                    except:
-                        gpa = None
-                        
-                certifications = ", ".join(profile.get('certifications', []))[:1000]
-                
-                # Check if this file has seeding profile data
-                relative_path = f"data/pdf/{category}/{filename}"
-                seeding_data = seeding_profiles.get(relative_path)
-                
-                if seeding_data:
-                    # Use seeding profile data
-                    resume_id = db.insert_resume_with_profile(
-                        filename=filename,
-                        category=category,
-                        file_path=pdf_path,
-                        extracted_text=extracted_text[:100000],
-                        skills=skills,
-                        experience=experience,
-                        education=education,
-                        gpa=gpa,
-                        certifications=certifications,
-                        applicant_id=seeding_data['applicant_id'],
-                        first_name=seeding_data['first_name'],
-                        last_name=seeding_data['last_name'],
-                        date_of_birth=seeding_data['date_of_birth'],
-                        address=seeding_data['address'],
-                        phone_number=seeding_data['phone_number'],
-                        application_role=seeding_data['application_role']
-                    )
-                    print(f"✓ Inserted with profile data: {seeding_data['first_name']} {seeding_data['last_name']}")
-                else:
-                    # Regular insert without profile data
-                    resume_id = db.insert_resume(
-                        filename=filename,
-                        category=category,
-                        file_path=pdf_path,
-                        extracted_text=extracted_text[:100000],
-                        skills=skills,
-                        experience=experience,
-                        education=education,
-                        gpa=gpa,
-                        certifications=certifications
-                    )
-                    print(f"✓ Inserted without profile data")
-                
-                if resume_id > 0:
-                    loaded_count += 1
-                else:
-                    print(f"✗ Failed to insert {filename}")
-                    error_count += 1
-                        
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
+            extracted_text = result['text']
+            if not extracted_text:
+                print(f"No text extracted from {filename}")
                 error_count += 1
                 continue
             
-            if idx % 3 == 0:  # Show progress every 3 files
-                print(f"Progress: {idx}/{len(files_to_process)} files in {category}")
+            print(f"Extracted {len(extracted_text)} characters ({result['mode']})")
+            
+            profile = result['profile']
+            
+            skills = ", ".join(profile.get('skills', []))[:2000] 
+            
+            experience_list = []
+            for exp in profile.get('experience', []):
+                exp_text = f"{exp.get('title', '')} at {exp.get('company', '')} ({exp.get('period', '')})"
+                experience_list.append(exp_text)
+            experience = " | ".join(experience_list)[:2000] 
+            
+            education_list = []
+            for edu in profile.get('education', []):
+                edu_text = f"{edu.get('degree', '')} in {edu.get('field', '')} from {edu.get('institution', '')}"
+                education_list.append(edu_text)
+            education = " | ".join(education_list)[:1000]  
+            
+            gpa = None
+            if profile.get('gpa'):
+                try:
+                    gpa = float(profile['gpa'][0])
+                except:
+                    gpa = None
+                    
+            certifications = ", ".join(profile.get('certifications', []))[:1000]
+            
+            # Check if this file has seeding profile data
+            relative_path = f"data/pdf/{category}/{filename}"
+            seeding_data = seeding_profiles.get(relative_path)
+            
+            if seeding_data:
+                # Use seeding profile data
+                resume_id = db.insert_resume_with_profile(
+                    filename=filename,
+                    category=category,
+                    file_path=pdf_path,
+                    extracted_text=extracted_text[:100000],
+                    skills=skills,
+                    experience=experience,
+                    education=education,
+                    gpa=gpa,
+                    certifications=certifications,
+                    applicant_id=seeding_data['applicant_id'],
+                    first_name=seeding_data['first_name'],
+                    last_name=seeding_data['last_name'],
+                    date_of_birth=seeding_data['date_of_birth'],
+                    address=seeding_data['address'],
+                    phone_number=seeding_data['phone_number'],
+                    application_role=seeding_data['application_role'],
+                    index_terms=False
+                )
+                print(f"✓ Inserted with profile data: {seeding_data['first_name']} {seeding_data['last_name']}")
+            else:
+                # Regular insert without profile data
+                resume_id = db.insert_resume(
+                    filename=filename,
+                    category=category,
+                    file_path=pdf_path,
+                    extracted_text=extracted_text[:100000],
+                    skills=skills,
+                    experience=experience,
+                    education=education,
+                    gpa=gpa,
+                    certifications=certifications,
+                    index_terms=False
+                )
+                print(f"✓ Inserted without profile data")
+            
+            if resume_id > 0:
+                loaded_count += 1
+            else:
+                print(f"✗ Failed to insert {filename}")
+                error_count += 1
+                    
+        except Exception as e:
+            print(f"Error processing {filename}: {e}")
+            error_count += 1
+            continue
+        
+        if idx % 3 == 0:  # Show progress every 3 files
+            print(f"Progress: {idx}/{total_files} files")
     
     print(f"\nFinal Summary:")
     print(f"Successfully loaded: {loaded_count} resumes")
@@ -0,0 +1,107 @@
+"""Helper bersama untuk benchmark: load corpus teks, statistik waktu, baseline JSON"""
+
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+
+def load_texts(corpus="string", data_dir=DATA_DIR, limit=None) -> list:
+    """
+    [(category, filename, text)] dari data/string atau data/regex, urutan deterministik.
+    """
+    corpus_dir = os.path.join(data_dir, corpus)
+    texts = []
+    if not os.path.isdir(corpus_dir):
+        return texts
+    for category in sorted(os.listdir(corpus_dir)):
+        category_path = os.path.join(corpus_dir, category)
+        if not os.path.isdir(category_path):
+            continue
+        for filename in sorted(os.listdir(category_path)):
+            if not filename.endswith(".txt"):
+                continue
+            with open(os.path.join(category_path, filename), "r", encoding="utf-8") as f:
+                texts.append((category, filename, f.read()))
+            if limit is not None and len(texts) >= limit:
+                return texts
+    return texts
+
+def percentile(values, fraction):
+    """Nearest-rank percentile"""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+def summarize_times(seconds, bytes_scanned=0) -> dict:
+    """Ringkasan list durasi (detik): median/p95/min dalam ms dan throughput MB/s dari median"""
+    median = percentile(seconds, 0.5)
+    return {
+        "runs": len(seconds),
+        "median_ms": round(median * 1000, 3),
+        "p95_ms": round(percentile(seconds, 0.95) * 1000, 3),
+        "min_ms": round(min(seconds) * 1000, 3) if seconds else 0.0,
+        "mb_per_s": round(bytes_scanned / median / 1e6, 3) if median > 0 and bytes_scanned else 0.0
+    }
+
+def environment_info() -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+def peak_rss_mb():
+    """Peak resident set size process ini (MB), None kalau tidak tersedia (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+def write_json(path, report):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {path}")
+
+def compare_reports(current, baseline, key_fields, metric="median_ms", threshold=0.10) -> list:
+    """
+    Cocokkan result current vs baseline berdasarkan key_fields.
+    Returns [(key, baseline_value, current_value, ratio, regressed)] untuk case yang ada di keduanya.
+    """
+    def index(report):
+        return {tuple(result.get(field) for field in key_fields): result for result in report.get("results", [])}
+
+    baseline_index = index(baseline)
+    rows = []
+    for key, result in index(current).items():
+        previous = baseline_index.get(key)
+        if previous is None or not previous.get(metric):
+            continue
+        ratio = result[metric] / previous[metric]
+        rows.append((key, previous[metric], result[metric], ratio, ratio > 1 + threshold))
+    return rows
+
+def print_comparison(rows, metric="median_ms", threshold=0.10) -> int:
+    """Print tabel perbandingan, return jumlah regresi"""
+    regressions = 0
+    print(f"\n=== Comparison vs baseline ({metric}, threshold +{threshold * 100:.0f}%) ===")
+    for key, previous, current, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        regressions += regressed
+        label = " / ".join(str(part) for part in key)
+        print(f"{label:<45} {previous:>10.3f} -> {current:>10.3f}  x{ratio:.2f} {flag}")
+    print(f"{len(rows)} cases compared, {regressions} regressions")
+    return regressions
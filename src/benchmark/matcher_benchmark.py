@@ -0,0 +1,200 @@
+"""
+Micro-benchmark kmp_search / bm_search / ac_search / fuzzy_search atas data/string (atau data/regex).
+
+Sweep: panjang pattern, jumlah pattern, hit density (porsi pattern yang ada di teks) dan ukuran corpus.
+Pattern dibangkitkan deterministik dari seed, sehingga dua run bisa dibandingkan.
+
+    python src/benchmark/matcher_benchmark.py --output baseline.json
+    python src/benchmark/matcher_benchmark.py --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark.common import (DATA_DIR, compare_reports, environment_info, load_texts, print_comparison,
+                              summarize_times, write_json)
+from core.matcher import kmp_search, bm_search, ac_search, fuzzy_search
+
+ENGINES = {
+    "kmp": lambda text, patterns: sum(len(kmp_search(text, pattern)) for pattern in patterns),
+    "bm": lambda text, patterns: sum(len(bm_search(text, pattern)) for pattern in patterns),
+    # AC mencari semua pattern dalam satu pass
+    "ac": lambda text, patterns: len(ac_search(text, patterns)),
+    "fuzzy": lambda text, patterns: sum(len(fuzzy_search(text, pattern)) for pattern in patterns),
+}
+
+# nilai default tiap dimensi; setiap sweep hanya mengubah satu dimensi
+BASE_CASE = {"pattern_length": 8, "pattern_count": 4, "hit_density": 0.5, "docs": 50}
+
+SWEEPS = {
+    "pattern_length": [3, 6, 12, 24],
+    "pattern_count": [1, 4, 16],
+    "hit_density": [0.0, 0.5, 1.0],
+    "docs": [10, 50, 200],
+}
+
+QUICK_SWEEPS = {
+    "pattern_length": [4, 16],
+    "pattern_count": [1, 8],
+    "hit_density": [0.0, 1.0],
+    "docs": [10, 40],
+}
+
+_WORD_START = re.compile(r"\b\w")
+RESULT_KEY = ("sweep", "value", "engine")
+
+def make_patterns(texts, length, count, hit_density, rng) -> list:
+    """
+    count pattern sepanjang length: round(count * hit_density) diambil dari teks (awal kata),
+    sisanya string acak yang tidak muncul di corpus.
+    """
+    corpus_lower = "\n".join(texts).lower()
+    hits = round(count * hit_density)
+    patterns = []
+
+    attempts = 0
+    while len(patterns) < hits and attempts < 1000:
+        attempts += 1
+        text = rng.choice(texts)
+        starts = [match.start() for match in _WORD_START.finditer(text)]
+        if not starts:
+            continue
+        start = rng.choice(starts)
+        candidate = text[start:start + length]
+        if len(candidate) == length and "\n" not in candidate:
+            patterns.append(candidate)
+
+    attempts = 0
+    while len(patterns) < count and attempts < 1000:
+        attempts += 1
+        candidate = "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        if candidate not in corpus_lower:
+            patterns.append(candidate)
+    return patterns
+
+def time_engine(engine, texts, patterns, repeats, warmup=1):
+    """(durasi per run dalam detik, jumlah match) untuk satu engine atas semua teks"""
+    search = ENGINES[engine]
+    for _ in range(warmup):
+        matches = sum(search(text, patterns) for text in texts)
+
+    durations = []
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            matches = sum(search(text, patterns) for text in texts)
+            durations.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return durations, matches
+
+def run_benchmark(corpus="string", engines=None, sweeps=None, repeats=5, seed=42,
+                  fuzzy_docs=10, verbose=True, data_dir=DATA_DIR) -> dict:
+    engines = engines or list(ENGINES)
+    sweeps = sweeps or SWEEPS
+    all_texts = [text for _, _, text in load_texts(corpus, data_dir)]
+    if not all_texts:
+        raise ValueError(f"No .txt files found for corpus '{corpus}'")
+
+    results = []
+    for sweep, values in sweeps.items():
+        for value in values:
+            case = dict(BASE_CASE, **{sweep: value})
+            texts = all_texts[:case["docs"]]
+            # seed per case: pattern sama untuk semua engine dan antar run
+            rng = random.Random(f"{seed}:{sweep}:{value}")
+            patterns = make_patterns(texts, case["pattern_length"], case["pattern_count"], case["hit_density"], rng)
+
+            for engine in engines:
+                # fuzzy (SequenceMatcher per kata) jauh lebih lambat: corpus dibatasi
+                engine_texts = texts[:fuzzy_docs] if engine == "fuzzy" else texts
+                # throughput = byte teks corpus per detik untuk seluruh set pattern (sebanding antar engine)
+                bytes_scanned = sum(len(text.encode("utf-8")) for text in engine_texts)
+                durations, matches = time_engine(engine, engine_texts, patterns, repeats)
+                result = {
+                    "sweep": sweep,
+                    "value": value,
+                    "engine": engine,
+                    "docs": len(engine_texts),
+                    "pattern_length": case["pattern_length"],
+                    "pattern_count": len(patterns),
+                    "hit_density": case["hit_density"],
+                    "bytes": bytes_scanned,
+                    "matches": matches
+                }
+                result.update(summarize_times(durations, bytes_scanned))
+                results.append(result)
+                if verbose:
+                    print(f"{sweep:>15}={value!s:<5} {engine:<6} median {result['median_ms']:>10.3f} ms  "
+                          f"p95 {result['p95_ms']:>10.3f} ms  {result['mb_per_s']:>8.3f} MB/s  matches {matches}")
+
+    return {
+        "benchmark": "matcher",
+        "corpus": corpus,
+        "seed": seed,
+        "repeats": repeats,
+        "base_case": BASE_CASE,
+        "environment": environment_info(),
+        "results": results
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="String matcher micro-benchmark")
+    parser.add_argument("--corpus", choices=["string", "regex"], default="string")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory containing string/ and regex/ (e.g. a synthetic corpus)")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="Comma separated: kmp,bm,ac,fuzzy")
+    parser.add_argument("--sweeps", default=None, help=f"Comma separated subset of {','.join(SWEEPS)}")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fuzzy-docs", type=int, default=10, help="Documents used for the fuzzy engine")
+    parser.add_argument("--quick", action="store_true", help="Smaller sweeps and 3 repeats")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed median slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    engines = [engine.strip() for engine in args.engines.split(",") if engine.strip()]
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        parser.error(f"Unknown engines: {unknown}")
+
+    sweeps = QUICK_SWEEPS if args.quick else SWEEPS
+    if args.sweeps:
+        names = [name.strip() for name in args.sweeps.split(",")]
+        unknown = [name for name in names if name not in sweeps]
+        if unknown:
+            parser.error(f"Unknown sweeps: {unknown}")
+        sweeps = {name: sweeps[name] for name in names}
+    repeats = min(args.repeats, 3) if args.quick else args.repeats
+
+    report = run_benchmark(args.corpus, engines, sweeps, repeats, args.seed, args.fuzzy_docs, data_dir=args.data_dir)
+    if args.output:
+        write_json(args.output, report)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("seed") != report["seed"] or baseline.get("corpus") != report["corpus"]:
+            print("Warning: baseline was produced with a different seed or corpus")
+        rows = compare_reports(report, baseline, RESULT_KEY, threshold=args.threshold)
+        if print_comparison(rows, threshold=args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+End-to-end benchmark pipeline search (fetch -> exact -> fuzzy -> merge/rank) pada corpus sintetis.
+
+Setiap skala dijalankan di process terpisah supaya peak RSS per skala akurat.
+Corpus di-stream dari SyntheticCorpus, jadi memory yang terukur adalah milik pipeline search.
+
+    python src/benchmark/search_benchmark.py --scales 10000,100000 --output e2e.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(SRC_DIR)
+sys.path.append(os.path.dirname(SRC_DIR))  # config.py
+
+from benchmark.common import (compare_reports, environment_info, peak_rss_mb, percentile,
+                              print_comparison, write_json)
+
+DEFAULT_QUERIES = ["python, sql", "accounting, budget", "\"customer service\" AND sales"]
+# typo -> keyword tidak ditemukan exact -> fuzzy pass atas seluruh corpus (lambat)
+FUZZY_QUERIES = ["acounting"]
+PHASES = ("fetch", "exact", "fuzzy", "merge_rank")
+RESULT_KEY = ("docs", "phase")
+
+class TimedSource:
+    """Proxy source yang mengukur waktu produksi chunk iter_resumes (fetch) per pass"""
+
+    def __init__(self, source):
+        self.source = source
+        self.pass_seconds = []
+        self.bytes_fetched = 0
+
+    def __getattr__(self, name):
+        return getattr(self.source, name)
+
+    def iter_resumes(self, *args, **kwargs):
+        self.pass_seconds.append(0.0)
+        iterator = iter(self.source.iter_resumes(*args, **kwargs))
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                self.pass_seconds[-1] += time.perf_counter() - start
+                return
+            self.pass_seconds[-1] += time.perf_counter() - start
+            if len(self.pass_seconds) == 1:
+                self.bytes_fetched += sum(len(row.get('extracted_text') or '') for row in chunk)
+            yield chunk
+
+def phase_times(timing, pass_seconds) -> dict:
+    """Pisahkan waktu fetch dari exact/fuzzy (streaming: fetch terjadi di dalam kedua pass)"""
+    exact_fetch = pass_seconds[0] * 1000 if pass_seconds else 0.0
+    fuzzy_fetch = sum(pass_seconds[1:]) * 1000
+    return {
+        "fetch": round(exact_fetch + fuzzy_fetch, 3),
+        "exact": round(max(0.0, timing['exact_time'] - exact_fetch), 3),
+        "fuzzy": round(max(0.0, timing['fuzzy_time'] - fuzzy_fetch), 3),
+        "merge_rank": round(max(0.0, timing['total_time'] - timing['exact_time'] - timing['fuzzy_time']), 3),
+        "total": round(timing['total_time'], 3)
+    }
+
+def run_scale(docs, queries, method, top_k, seed, distribution, chunk_size):
+    """Dijalankan di child process: semua query pada satu skala"""
+    from config import SEARCH_SETTINGS
+    from benchmark.synthetic_corpus import SyntheticCorpus, SyntheticCorpusGenerator, load_section_model
+    from core.search_engine import SearchEngine
+
+    model = load_section_model()
+    corpus = SyntheticCorpus(SyntheticCorpusGenerator(model, seed, distribution), docs)
+    settings = dict(SEARCH_SETTINGS, progressive_results=False, ranking='count', stream_chunk_size=chunk_size)
+
+    rss_before = peak_rss_mb()
+    query_results = []
+    for keywords in queries:
+        source = TimedSource(corpus)
+        engine = SearchEngine(source, method, settings=settings)
+        results, timing = engine.search(keywords, top_k)
+        phases = phase_times(timing, source.pass_seconds)
+        query_results.append({
+            "keywords": keywords,
+            "phases_ms": phases,
+            "hits": timing['exact_count'] + timing['fuzzy_count'],
+            "top": [result['resume_id'] for result in results],
+            "mb_per_s": round(source.bytes_fetched / (phases['total'] / 1000) / 1e6, 3) if phases['total'] else 0.0
+        })
+        print(f"  [{docs} docs] {keywords!r}: " +
+              ", ".join(f"{phase} {phases[phase]:.1f} ms" for phase in PHASES + ("total",)), flush=True)
+
+    return {
+        "docs": docs,
+        "bytes": source.bytes_fetched,
+        "queries": query_results,
+        "rss_after_load_mb": rss_before,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def summarize_scale(scale) -> list:
+    """Satu baris per fase: median dan p95 antar query"""
+    rows = []
+    for phase in PHASES + ("total",):
+        values = [query["phases_ms"][phase] for query in scale["queries"]]
+        rows.append({
+            "docs": scale["docs"],
+            "phase": phase,
+            "median_ms": round(percentile(values, 0.5), 3),
+            "p95_ms": round(percentile(values, 0.95), 3)
+        })
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end search benchmark on a synthetic corpus")
+    parser.add_argument("--scales", default="1000,10000", help="Comma separated corpus sizes, e.g. 10000,100000,1000000")
+    parser.add_argument("--queries", default=None, help="JSON lines file with {\"keywords\": ...} (default: built-in set)")
+    parser.add_argument("--fuzzy", action="store_true", help="Add a typo query that triggers the fuzzy pass (slow)")
+    parser.add_argument("--method", default="KMP")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--distribution", choices=["observed", "uniform"], default="observed")
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    scales = [int(value) for value in args.scales.split(",") if value.strip()]
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            queries = [json.loads(line)["keywords"] for line in f if line.strip() and not line.startswith("#")]
+    else:
+        queries = list(DEFAULT_QUERIES)
+    if args.fuzzy:
+        queries.extend(FUZZY_QUERIES)
+
+    scale_reports = []
+    context = multiprocessing.get_context("spawn")
+    for docs in scales:
+        print(f"Scale {docs} documents...")
+        # process baru per skala: ru_maxrss tidak bisa di-reset
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            scale = executor.submit(run_scale, docs, queries, args.method, args.top_k,
+                                    args.seed, args.distribution, args.chunk_size).result()
+        scale_reports.append(scale)
+        print(f"  peak RSS {scale['peak_rss_mb']} MB, {scale['bytes'] / 1e6:.1f} MB of text")
+
+    report = {
+        "benchmark": "search_e2e",
+        "method": args.method,
+        "seed": args.seed,
+        "distribution": args.distribution,
+        "queries": queries,
+        "environment": environment_info(),
+        "scales": scale_reports,
+        "results": [row for scale in scale_reports for row in summarize_scale(scale)]
+    }
+
+    print("\n=== Median latency per phase (ms) ===")
+    print(f"{'docs':>10} " + " ".join(f"{phase:>12}" for phase in PHASES + ("total",)) + f" {'peak RSS MB':>12}")
+    for scale in scale_reports:
+        medians = {row["phase"]: row["median_ms"] for row in summarize_scale(scale)}
+        print(f"{scale['docs']:>10} " + " ".join(f"{medians[phase]:>12.1f}" for phase in PHASES + ("total",)) +
+              f" {scale['peak_rss_mb'] or 0:>12.1f}")
+
+    if args.output:
+        write_json(args.output, report)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_reports(report, baseline, RESULT_KEY, threshold=args.threshold)
+        if print_comparison(rows, threshold=args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Corpus CV sintetis untuk benchmark skala besar.
+
+Teks data/string dipecah per section (Summary, Skills, Experience, ...) dan dikelompokkan per kategori.
+Dokumen sintetis = header kategori + section yang diambil acak dari pool kategori tersebut,
+dengan distribusi kategori dan peluang tiap section mengikuti corpus asli.
+Setiap dokumen dibangkitkan dari (seed, doc_id), jadi corpus 1M dokumen bisa di-stream
+tanpa disimpan di memory atau disk.
+
+    python src/benchmark/synthetic_corpus.py --docs 10000 --write /tmp/synthetic
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+from collections import Counter, defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark.common import DATA_DIR, load_texts
+
+# variasi header -> slot; urutan slot = urutan section di dokumen sintetis
+SECTION_HEADERS = {
+    "summary": ["Professional Summary", "Executive Profile", "Career Overview", "Summary"],
+    "highlights": ["Skill Highlights", "Core Qualifications", "Highlights", "Qualifications"],
+    "accomplishments": ["Core Accomplishments", "Accomplishments"],
+    "experience": ["Professional Experience", "Work Experience", "Work History", "Experience"],
+    "education": ["Education and Training", "Education"],
+    "skills": ["Skills"],
+    "certifications": ["Certifications"],
+    "affiliations": ["Professional Affiliations", "Affiliations"],
+    "additional": ["Additional Information", "Personal Information", "Interests", "Languages"],
+}
+SECTION_ORDER = list(SECTION_HEADERS)
+
+_HEADER_TO_SLOT = {header: slot for slot, headers in SECTION_HEADERS.items() for header in headers}
+# header terpanjang dulu supaya "Professional Summary" tidak terpotong jadi "Summary"
+_HEADER_PATTERN = re.compile(
+    r"\b(%s)\b" % "|".join(re.escape(header) for header in sorted(_HEADER_TO_SLOT, key=len, reverse=True))
+)
+
+# peluang section diambil dari kategori lain, supaya kombinasi lebih beragam
+CROSS_CATEGORY_RATE = 0.1
+
+def split_sections(text: str) -> dict:
+    """{slot: (header, body)} untuk section pertama tiap slot di satu teks data/string"""
+    sections = {}
+    matches = list(_HEADER_PATTERN.finditer(text))
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        body = text[match.end():end].strip()
+        slot = _HEADER_TO_SLOT[match.group(1)]
+        if body and slot not in sections:
+            sections[slot] = (match.group(1), body)
+    return sections
+
+class SectionModel:
+    """Pool section per kategori + distribusi kategori dan peluang kemunculan section"""
+
+    def __init__(self, texts):
+        self.pools = defaultdict(lambda: defaultdict(list))   # category -> slot -> [(header, body)]
+        self.slot_rates = defaultdict(Counter)                 # category -> slot -> jumlah dokumen
+        self.category_counts = Counter()
+
+        for category, _, text in texts:
+            self.category_counts[category] += 1
+            for slot, section in split_sections(text).items():
+                self.pools[category][slot].append(section)
+                self.slot_rates[category][slot] += 1
+
+        self.categories = sorted(self.category_counts)
+        self.all_pools = defaultdict(list)
+        for category in self.categories:
+            for slot, sections in self.pools[category].items():
+                self.all_pools[slot].extend(sections)
+
+    def category_weights(self, distribution="observed"):
+        if distribution == "uniform":
+            return [1] * len(self.categories)
+        return [self.category_counts[category] for category in self.categories]
+
+    def slot_probability(self, category, slot):
+        return self.slot_rates[category][slot] / max(1, self.category_counts[category])
+
+def load_section_model(data_dir=DATA_DIR) -> SectionModel:
+    texts = load_texts("string", data_dir)
+    if not texts:
+        raise ValueError(f"No data/string texts found under {data_dir}")
+    return SectionModel(texts)
+
+class SyntheticCorpusGenerator:
+    def __init__(self, model: SectionModel, seed=42, distribution="observed"):
+        self.model = model
+        self.seed = seed
+        self.weights = model.category_weights(distribution)
+
+    def document(self, doc_id: int) -> dict:
+        """Dokumen ke-doc_id, selalu sama untuk seed yang sama"""
+        rng = random.Random(self.seed * 1_000_003 + doc_id)
+        category = rng.choices(self.model.categories, self.weights)[0]
+
+        parts = [category]
+        for slot in SECTION_ORDER:
+            if rng.random() >= self.model.slot_probability(category, slot):
+                continue
+            pool = self.model.pools[category].get(slot)
+            if not pool or rng.random() < CROSS_CATEGORY_RATE:
+                pool = self.model.all_pools.get(slot)
+            if pool:
+                header, body = rng.choice(pool)
+                parts.append(f"{header} {body}")
+
+        return {
+            'id': doc_id,
+            'filename': f"{doc_id:08d}.pdf",
+            'category': category,
+            'extracted_text': " ".join(parts)
+        }
+
+    def documents(self, count: int, start: int = 1):
+        for doc_id in range(start, start + count):
+            yield self.document(doc_id)
+
+class SyntheticCorpus:
+    """
+    Source untuk SearchEngine: dokumen dibangkitkan saat di-stream oleh iter_resumes,
+    memory tetap sebanding chunk_size walaupun jumlah dokumen jutaan.
+    """
+
+    def __init__(self, generator: SyntheticCorpusGenerator, size: int):
+        self.generator = generator
+        self.size = size
+
+    def connect(self):
+        return True
+
+    def disconnect(self):
+        pass
+
+    def __len__(self):
+        return self.size
+
+    def iter_resumes(self, columns=None, resume_ids=None, with_profile=True, chunk_size=200, **kwargs):
+        ids = range(1, self.size + 1) if resume_ids is None else sorted(i for i in resume_ids if 1 <= i <= self.size)
+        chunk = []
+        for doc_id in ids:
+            document = self.generator.document(doc_id)
+            chunk.append({column: document.get(column) for column in columns} if columns else document)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def get_fulltext_candidate_ids(self, keywords):
+        return None
+
+    def get_term_statistics(self, terms):
+        # tidak ada posting index: structured query diverifikasi dengan full scan
+        return {'total_docs': 0, 'avg_lengths': {}, 'doc_freqs': {}}
+
+    def get_resume_metadata(self, resume_ids):
+        metadata = {}
+        for doc_id in resume_ids:
+            if 1 <= doc_id <= self.size:
+                document = self.generator.document(doc_id)
+                metadata[doc_id] = {
+                    'id': doc_id, 'filename': document['filename'], 'category': document['category'],
+                    'first_name': None, 'last_name': None, 'application_role': None
+                }
+        return metadata
+
+def write_corpus(generator, count, output_dir) -> int:
+    """Tulis dokumen dengan layout data/string: <output_dir>/string/<CATEGORY>/<id>_string.txt"""
+    written = 0
+    for document in generator.documents(count):
+        category_dir = os.path.join(output_dir, "string", document['category'])
+        os.makedirs(category_dir, exist_ok=True)
+        stem = os.path.splitext(document['filename'])[0]
+        with open(os.path.join(category_dir, f"{stem}_string.txt"), "w", encoding="utf-8") as f:
+            f.write(document['extracted_text'])
+        written += 1
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic CV corpus from data/string sections")
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--distribution", choices=["observed", "uniform"], default="observed",
+                        help="Category distribution: as in data/string, or uniform")
+    parser.add_argument("--write", required=True, help="Output directory (data/string layout)")
+    args = parser.parse_args(argv)
+
+    model = load_section_model()
+    generator = SyntheticCorpusGenerator(model, args.seed, args.distribution)
+    written = write_corpus(generator, args.docs, args.write)
+    print(f"Wrote {written} synthetic resumes to {os.path.join(args.write, 'string')}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Headless batch search: baca query JSON lines, jalankan di worker pool, tulis hasil + timing per query.
+Format query (satu object per baris):
+    {"id": "q1", "keywords": "python, sql", "method": "KMP", "top_k": 10}
+id, method dan top_k opsional.
+"""
+
+import json
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core import profiling, tracing
+from core.search_engine import SearchEngine, QuerySyntaxError, SearchCancelled
+
+# source per worker process, dibuka sekali di initializer
+_worker_source = None
+
+def read_queries(path, default_method="KMP", default_top_k=10) -> list:
+    """Parse file JSON lines; baris kosong dan baris '#' dilewati"""
+    queries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}")
+            if isinstance(item, str):
+                item = {"keywords": item}
+            if not item.get("keywords"):
+                raise ValueError(f"{path}:{line_number}: missing 'keywords'")
+            queries.append({
+                "id": item.get("id", line_number),
+                "keywords": item["keywords"],
+                "method": item.get("method") or default_method,
+                "top_k": int(item.get("top_k") or default_top_k)
+            })
+    return queries
+
+def open_source(spec):
+    """
+    spec: {'type': 'corpus', 'data_dir', 'with_profile'} atau {'type': 'db', 'password'}.
+    Returns source yang sudah connect, atau None.
+    """
+    if spec.get("type") == "db":
+        from db.db_connector import DatabaseManager
+        db = DatabaseManager(password=spec.get("password"))
+        return db if db.connect() else None
+
+    from core.corpus import load_text_corpus
+    corpus = load_text_corpus(spec.get("data_dir"), with_profile=spec.get("with_profile", False))
+    return corpus if len(corpus) else None
+
+def _init_worker(spec):
+    global _worker_source
+    _worker_source = open_source(spec)
+
+def worker_ready() -> bool:
+    """Dipanggil di worker process: True kalau source sudah dimuat oleh initializer"""
+    return _worker_source is not None
+
+def run_query(query, source=None) -> dict:
+    """
+    Satu query -> record hasil (results, timing, latency_ms, error, error_kind).
+    error_kind: 'request' (query / parameter salah) atau 'server' (source tidak tersedia, DB gagal).
+    """
+    source = source if source is not None else _worker_source
+    record = {
+        "id": query["id"],
+        "keywords": query["keywords"],
+        "method": query["method"],
+        "top_k": query["top_k"],
+        "results": [],
+        "timing": None,
+        "latency_ms": 0.0,
+        "error": None,
+        "error_kind": None
+    }
+    start_time = time.perf_counter()
+    try:
+        if source is None:
+            raise RuntimeError("search source is not available")
+        attrs = {"query_id": query["id"], "keywords": query["keywords"], "method": query["method"],
+                 "top_k": query["top_k"]}
+        # BUKDUR_PROFILE=search: satu profile per query, lihat core/profiling.py
+        with profiling.profile_run("search", **attrs):
+            with tracing.start_trace("batch_search", **attrs) as trace:
+                engine = SearchEngine(source, query["method"])
+                record["results"], record["timing"] = engine.search(query["keywords"], query["top_k"])
+        record["timing"]["trace_id"] = trace.trace_id
+        record["timing"]["phases"] = trace.phases()
+    except (QuerySyntaxError, ValueError) as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        record["error_kind"] = "request"
+    except (RuntimeError, SearchCancelled) as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        record["error_kind"] = "server"
+    record["latency_ms"] = (time.perf_counter() - start_time) * 1000
+    return record
+
+def run_batch(queries, spec, workers=1):
+    """Yield record per query, urutan sama dengan input. workers <= 1 = jalan di process ini"""
+    if workers <= 1:
+        source = open_source(spec)
+        try:
+            for query in queries:
+                yield run_query(query, source)
+        finally:
+            if source is not None:
+                source.disconnect()
+        return
+
+    # spawn supaya konsisten di semua OS; tiap worker memuat corpus / koneksi DB sendiri
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(spec,)) as executor:
+        for record in executor.map(run_query, queries):
+            yield record
+
+def percentile(values, fraction):
+    """Nearest-rank percentile dari list yang sudah diurutkan"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+def summarize(records, wall_seconds) -> dict:
+    latencies = sorted(record["latency_ms"] for record in records)
+    return {
+        "queries": len(records),
+        "errors": sum(1 for record in records if record["error"]),
+        "wall_seconds": round(wall_seconds, 3),
+        "qps": round(len(records) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0
+        }
+    }
+
+def run_batch_to_file(queries_path, output_path, spec, workers=1, default_method="KMP", default_top_k=10) -> dict:
+    """Jalankan semua query dari queries_path, tulis JSON lines ke output_path, return ringkasan"""
+    queries = read_queries(queries_path, default_method, default_top_k)
+    records = []
+    start_time = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as out:
+        for record in run_batch(queries, spec, workers):
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+            records.append({"latency_ms": record["latency_ms"], "error": record["error"]})
+    return summarize(records, time.perf_counter() - start_time)
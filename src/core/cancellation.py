@@ -0,0 +1,21 @@
+import threading
+
+class SearchCancelled(Exception):
+    """Raised inside a search when its token has been cancelled"""
+
+class CancellationToken:
+    """Cooperative cancellation flag, dicek di antara shard/chunk resume"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise SearchCancelled()
@@ -0,0 +1,172 @@
+import os
+import time
+from collections import defaultdict
+
+from core.ingest import get_ingest_source, load_task_text
+from core.profiling import aggregate_run, profile_run
+from core.scoring import FIELDS, build_postings
+
+class TextCorpus:
+    """
+    Corpus resume in-memory dari data/regex & data/string (tanpa MySQL).
+    Menyediakan subset method DatabaseManager yang dipakai SearchEngine dan DatabasePostingSource,
+    sehingga search, structured query dan BM25 bisa jalan headless.
+    """
+
+    def __init__(self, data_dir: str, with_profile: bool = False, limit: int = None):
+        self.data_dir = data_dir
+        self.with_profile = with_profile
+        self.limit = limit
+        self._rows = {}            # resume_id -> row dict (kolom seperti tabel resumes)
+        self._postings = {}        # term -> {resume_id: {field: [positions]}}
+        self._lengths = {}         # resume_id -> {field: length}
+        self.load_seconds = 0.0
+
+    def connect(self):
+        """Load corpus (sekali); signature sama dengan DatabaseManager.connect"""
+        if not self._rows:
+            self.load()
+        return bool(self._rows)
+
+    def disconnect(self):
+        pass
+
+    def load(self):
+        with profile_run("ingest", source="corpus", with_profile=self.with_profile), \
+                aggregate_run("extract", source="corpus"):
+            self._load()
+
+    def _load(self):
+        start_time = time.time()
+        source = get_ingest_source(self.data_dir, "text", self.limit)
+        postings = defaultdict(dict)
+
+        resume_id = 0
+        for task in source.tasks():
+            # sama dengan worker ingest: sidecar kosong/tidak ada -> ekstrak PDF, jadi corpus = isi DB
+            text = load_task_text(task['file_path'], task['text_path'])
+            if not text:
+                continue
+
+            resume_id += 1
+            skills, experience = "", ""
+            if self.with_profile:
+                skills, experience = self._profile_fields(text)
+
+            self._rows[resume_id] = {
+                'id': resume_id,
+                'filename': task['filename'],
+                'category': task['category'],
+                'file_path': task['file_path'],
+                'extracted_text': text,
+                'skills': skills,
+                'experience': experience,
+                'first_name': None,
+                'last_name': None,
+                'application_role': None
+            }
+
+            doc_postings, lengths = build_postings({'skills': skills, 'experience': experience, 'body': text})
+            for (term, field), positions in doc_postings.items():
+                postings[term].setdefault(resume_id, {})[field] = positions
+            self._lengths[resume_id] = lengths
+
+        self._postings = dict(postings)
+        self.load_seconds = time.time() - start_time
+        print(f"Loaded {len(self._rows)} resumes into memory in {self.load_seconds:.2f}s")
+
+    @staticmethod
+    def _profile_fields(text):
+        """skills / experience dengan format yang sama seperti setup_database"""
+        from core.extractor import extract_profile_data
+        profile = extract_profile_data(text)
+        skills = ", ".join(profile.get('skills', []))[:2000]
+        experience = " | ".join(
+            f"{exp.get('title', '')} at {exp.get('company', '')} ({exp.get('period', '')})"
+            for exp in profile.get('experience', [])
+        )[:2000]
+        return skills, experience
+
+    def __len__(self):
+        return len(self._rows)
+
+    # --- interface DatabaseManager ----------------------------------------------
+
+    def iter_resumes(self, columns=None, resume_ids=None, with_profile=True, chunk_size=200, **kwargs):
+        """Chunk list of dict, urut id, hanya kolom yang diminta"""
+        ids = sorted(self._rows) if resume_ids is None else sorted(i for i in resume_ids if i in self._rows)
+        for start in range(0, len(ids), chunk_size):
+            chunk = []
+            for resume_id in ids[start:start + chunk_size]:
+                row = self._rows[resume_id]
+                chunk.append({column: row.get(column) for column in columns} if columns else dict(row))
+            yield chunk
+
+    def get_fulltext_candidate_ids(self, keywords):
+        # tidak ada FULLTEXT index: exact matcher (substring) butuh full scan
+        return None
+
+    def get_term_statistics(self, terms):
+        total_docs = len(self._lengths)
+        avg_lengths = {}
+        if total_docs:
+            for field in FIELDS:
+                avg_lengths[field] = sum(lengths.get(field, 0) for lengths in self._lengths.values()) / total_docs
+        doc_freqs = {term: len(self._postings[term]) for term in terms if term in self._postings}
+        return {'total_docs': total_docs, 'avg_lengths': avg_lengths, 'doc_freqs': doc_freqs}
+
+    def get_term_postings(self, terms, resume_ids=None, with_positions=False):
+        allowed = None if resume_ids is None else set(resume_ids)
+        rows = []
+        for term in terms:
+            for resume_id, by_field in self._postings.get(term, {}).items():
+                if allowed is not None and resume_id not in allowed:
+                    continue
+                for field, positions in by_field.items():
+                    row = (term, field, resume_id, len(positions))
+                    if with_positions:
+                        row += (','.join(map(str, positions)),)
+                    rows.append(row)
+        return rows
+
+    def get_indexed_resume_ids(self):
+        return list(self._lengths)
+
+    def get_field_lengths(self, resume_ids):
+        return {resume_id: dict(self._lengths[resume_id]) for resume_id in resume_ids if resume_id in self._lengths}
+
+    def get_resume_metadata(self, resume_ids):
+        metadata = {}
+        for resume_id in resume_ids:
+            row = self._rows.get(resume_id)
+            if row is not None:
+                metadata[resume_id] = {
+                    column: row[column]
+                    for column in ('id', 'filename', 'category', 'file_path', 'first_name', 'last_name', 'application_role')
+                }
+        return metadata
+
+    def get_resume_by_id(self, resume_id):
+        row = self._rows.get(resume_id)
+        return dict(row) if row is not None else None
+
+    def get_statistics(self):
+        categories = defaultdict(int)
+        for row in self._rows.values():
+            categories[row['category']] += 1
+        return {
+            'total_resumes': len(self._rows),
+            'resumes_by_category': [
+                {'category': category, 'count': count}
+                for category, count in sorted(categories.items(), key=lambda item: -item[1])
+            ],
+            'indexed_terms': len(self._postings)
+        }
+
+def load_text_corpus(data_dir: str = None, with_profile: bool = False, limit: int = None) -> TextCorpus:
+    """TextCorpus yang sudah di-load; default data_dir = <project>/data"""
+    if data_dir is None:
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+    corpus = TextCorpus(data_dir, with_profile=with_profile, limit=limit)
+    corpus.load()
+    return corpus
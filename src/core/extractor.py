@@ -2,23 +2,47 @@ import fitz
 import re
 import os
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from PDF file using PyMuPDF"""
-    text = ""
+from core.profiling import profiled
+from core.tracing import traced
+
+def iter_pdf_pages(pdf_path: str, with_blocks: bool = False):
+    """
+    Yield teks mentah per halaman PDF (generator), satu halaman di memori per langkah.
+    with_blocks=True: yield (page_text, blocks), blocks = [(x0, y0, x1, y1, text)] hanya block teks.
+    """
+    doc = None
     try:
         doc = fitz.open(pdf_path)
         for page_num in range(len(doc)):
             page = doc.load_page(page_num)
-            text += page.get_text()
-        doc.close()
-        
-        text = text.replace('\n\n', '\n').strip()
-        
+            page_text = page.get_text()
+
+            if with_blocks:
+                # block[6] == 0: block teks (1 = gambar)
+                blocks = [
+                    (block[0], block[1], block[2], block[3], block[4])
+                    for block in page.get_text("blocks")
+                    if block[6] == 0
+                ]
+                yield page_text, blocks
+            else:
+                yield page_text
+
     except Exception as e:
         print(f"Error extracting text from {pdf_path}: {e}")
-    
-    return text
+    finally:
+        if doc is not None:
+            doc.close()
+
+@traced("extract.pdf")
+def extract_text_from_pdf(pdf_path: str) -> str:
+    """Extract text from PDF file using PyMuPDF (halaman di-join sekali, bukan += per halaman)"""
+    text = "".join(iter_pdf_pages(pdf_path))
+    # normalisasi atas seluruh teks, termasuk \n\n di batas halaman
+    return text.replace('\n\n', '\n').strip()
 
+@traced("extract.profile")
+@profiled("extract")
 def extract_profile_data(text: str) -> dict:
     """Extract structured profile data from resume text"""
     profile = {
@@ -0,0 +1,308 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from core.extractor import extract_text_from_pdf, extract_profile_data
+from core.profiling import aggregate_run, is_enabled, profile_run
+
+try:
+    import resource
+except ImportError:  # windows tidak punya modul resource
+    resource = None
+
+def empty_profile() -> dict:
+    """Profile kosong untuk mode degraded (text only)"""
+    return {
+        "overview": None,
+        "skills": [],
+        "experience": [],
+        "education": [],
+        "gpa": [],
+        "certifications": [],
+        "achievements": [],
+    }
+
+def _apply_memory_limit(memory_limit_mb):
+    """Batasi address space worker process (hanya POSIX)"""
+    if not memory_limit_mb or resource is None:
+        return
+    try:
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        print(f"Warning: could not apply ingest memory limit: {e}")
+
+def read_text_sidecar(text_path: str) -> str:
+    """Read a pre-extracted text file from data/regex or data/string"""
+    with open(text_path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+def load_task_text(pdf_path: str, text_path: str = None) -> str:
+    """Teks satu dokumen: sidecar kalau ada dan tidak kosong, selain itu diekstrak dari PDF"""
+    text = None
+    if text_path:
+        try:
+            text = read_text_sidecar(text_path)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Could not read {text_path}, falling back to PDF: {e}")
+    if not text:
+        text = extract_text_from_pdf(pdf_path)
+    return text
+
+class PdfSource:
+    """Ingest source: every PDF under data/pdf/<CATEGORY>, text extracted with PyMuPDF"""
+
+    def __init__(self, pdf_dir: str, limit: int = None):
+        self.pdf_dir = pdf_dir
+        self.limit = limit
+
+    def categories(self):
+        """Return [(category, [pdf filenames])] for categories that contain PDFs"""
+        result = []
+        if not os.path.exists(self.pdf_dir):
+            return result
+
+        for category in sorted(os.listdir(self.pdf_dir)):
+            category_path = os.path.join(self.pdf_dir, category)
+            if not os.path.isdir(category_path):
+                continue
+            pdf_files = sorted(f for f in os.listdir(category_path) if f.endswith('.pdf'))
+            if self.limit is not None:
+                pdf_files = pdf_files[:self.limit]
+            if pdf_files:
+                result.append((category, pdf_files))
+        return result
+
+    def make_task(self, category: str, filename: str) -> dict:
+        return {
+            'filename': filename,
+            'category': category,
+            'file_path': os.path.join(self.pdf_dir, category, filename),
+            'text_path': None
+        }
+
+    def tasks(self) -> list:
+        return [
+            self.make_task(category, filename)
+            for category, pdf_files in self.categories()
+            for filename in pdf_files
+        ]
+
+class TextCorpusSource(PdfSource):
+    """
+    Ingest source yang membaca teks hasil ekstraksi dari data/regex (line-preserving)
+    atau data/string. PDF hanya diekstrak kalau tidak ada sidecar teks.
+    """
+
+    def __init__(self, pdf_dir: str, regex_dir: str, string_dir: str = None, limit: int = None):
+        super().__init__(pdf_dir, limit)
+        self.regex_dir = regex_dir
+        self.string_dir = string_dir
+
+    def find_sidecar(self, category: str, filename: str):
+        stem = os.path.splitext(filename)[0]
+        # regex corpus menyimpan baris asli, dibutuhkan oleh extract_profile_data
+        candidates = [(self.regex_dir, f"{stem}_regex.txt"), (self.string_dir, f"{stem}_string.txt")]
+        for base_dir, sidecar_name in candidates:
+            if not base_dir:
+                continue
+            sidecar_path = os.path.join(base_dir, category, sidecar_name)
+            if os.path.isfile(sidecar_path):
+                return sidecar_path
+        return None
+
+    def make_task(self, category: str, filename: str) -> dict:
+        task = super().make_task(category, filename)
+        task['text_path'] = self.find_sidecar(category, filename)
+        return task
+
+def get_ingest_source(data_dir: str, source_type: str = "text", limit: int = None):
+    """Build the configured ingest source ('text' = text corpus with PDF fallback, 'pdf' = PDF only)"""
+    pdf_dir = os.path.join(data_dir, "pdf")
+    if source_type == "pdf":
+        return PdfSource(pdf_dir, limit)
+    return TextCorpusSource(
+        pdf_dir,
+        os.path.join(data_dir, "regex"),
+        os.path.join(data_dir, "string"),
+        limit
+    )
+
+def _ingest_worker_main(conn, memory_limit_mb):
+    """Loop worker process: terima (pdf_path, text_path, text_only), kirim balik (text, profile, error)"""
+    _apply_memory_limit(memory_limit_mb)
+
+    # satu profile per worker (bukan per dokumen); worker yang di-kill karena timeout tidak menulis profile
+    with profile_run("ingest", role="worker"), aggregate_run("extract", role="ingest worker"):
+        _ingest_worker_loop(conn)
+
+def _ingest_worker_loop(conn):
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        pdf_path, text_path, text_only = job
+        try:
+            text = load_task_text(pdf_path, text_path)
+            profile = None
+            if text and not text_only:
+                profile = extract_profile_data(text)
+            conn.send((text, profile, None))
+        except BaseException as e:
+            # MemoryError dari rlimit juga masuk sini, worker tetap hidup
+            conn.send((None, None, f"{type(e).__name__}: {e}"))
+
+    conn.close()
+
+class _WorkerSlot:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.job = None        # (task, text_only)
+        self.deadline = None
+
+class IsolatedIngestPool:
+    """Run PDF extraction per dokumen di worker process terpisah dengan batas waktu dan memori"""
+
+    def __init__(self, workers=2, timeout_seconds=30, memory_limit_mb=1536, on_failure=None):
+        self.workers = max(1, int(workers or 1))
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self.on_failure = on_failure
+        # spawn supaya aman dipanggil dari QThread dan konsisten di semua OS
+        self._ctx = multiprocessing.get_context("spawn")
+
+    def _spawn_worker(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_ingest_worker_main,
+            args=(child_conn, self.memory_limit_mb),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _WorkerSlot(process, parent_conn)
+
+    def _kill_worker(self, slot):
+        try:
+            slot.conn.close()
+        except OSError:
+            pass
+        if slot.process.is_alive():
+            slot.process.terminate()
+        slot.process.join(1)
+
+    def _record_failure(self, task, reason, mode):
+        print(f"Ingest failure ({mode}) for {task.get('filename')}: {reason}")
+        if self.on_failure:
+            try:
+                self.on_failure(task, reason, mode)
+            except Exception as e:
+                print(f"Error recording ingest failure: {e}")
+
+    @staticmethod
+    def _pause_deadlines(slots, suspended_at):
+        """
+        Waktu caller memproses hasil yang di-yield (mis. insert ke DB) tidak dihitung ke budget worker:
+        deadline semua job yang sedang jalan digeser sebesar waktu generator ter-suspend.
+        """
+        suspended = time.monotonic() - suspended_at
+        for slot in slots:
+            if slot.job is not None and slot.deadline is not None:
+                slot.deadline += suspended
+
+    def run(self, tasks):
+        """
+        Proses semua task, yield (task, result) sesuai urutan selesai.
+        task: dict dengan minimal 'file_path' (dan 'filename', 'category' untuk logging),
+        opsional 'text_path' untuk membaca teks hasil ekstraksi tanpa PyMuPDF.
+        result: dict {'text', 'profile', 'mode', 'error'}.
+        Dokumen yang timeout/crash di mode 'full' dicatat lalu diulang di mode 'text_only'.
+        timeout_seconds hanya menghitung waktu selama generator ini berjalan, bukan waktu caller.
+        """
+        pending = deque((task, False) for task in tasks)
+        if not pending:
+            return
+
+        slots = [self._spawn_worker() for _ in range(min(self.workers, len(pending)))]
+
+        try:
+            while pending or any(slot.job for slot in slots):
+                # assign pekerjaan ke worker yang idle
+                for slot in slots:
+                    if slot.job is None and pending:
+                        task, text_only = pending.popleft()
+                        slot.job = (task, text_only)
+                        slot.deadline = time.monotonic() + self.timeout_seconds if self.timeout_seconds else None
+                        slot.conn.send((task['file_path'], task.get('text_path'), text_only))
+
+                busy = [slot for slot in slots if slot.job]
+                ready = wait([slot.conn for slot in busy], timeout=0.2)
+
+                for index, slot in enumerate(slots):
+                    if slot.job is None:
+                        continue
+
+                    task, text_only = slot.job
+                    mode = "text_only" if text_only else "full"
+                    reason = None
+
+                    has_result = slot.conn in ready
+                    timed_out = False
+                    if not has_result and slot.deadline and time.monotonic() > slot.deadline:
+                        # `ready` bisa basi: caller memproses hasil yang di-yield sebelumnya, sementara
+                        # worker ini sudah selesai; cek pipe dulu sebelum menganggap timeout
+                        has_result = slot.conn.poll()
+                        timed_out = not has_result
+
+                    if has_result:
+                        try:
+                            text, profile, error = slot.conn.recv()
+                        except (EOFError, OSError):
+                            text, profile, error = None, None, f"worker crashed (exit code {slot.process.exitcode})"
+
+                        if error is None:
+                            slot.job = None
+                            suspended_at = time.monotonic()
+                            yield task, {
+                                'text': text or "",
+                                'profile': profile if profile is not None else empty_profile(),
+                                'mode': mode,
+                                'error': None
+                            }
+                            self._pause_deadlines(slots, suspended_at)
+                            continue
+                        reason = error
+                    elif timed_out:
+                        reason = f"timeout after {self.timeout_seconds}s"
+                    else:
+                        continue
+
+                    # worker gagal: matikan, ganti dengan worker baru
+                    self._kill_worker(slot)
+                    slots[index] = self._spawn_worker()
+                    self._record_failure(task, reason, mode)
+
+                    if not text_only:
+                        pending.appendleft((task, True))
+                    else:
+                        suspended_at = time.monotonic()
+                        yield task, {'text': "", 'profile': empty_profile(), 'mode': mode, 'error': reason}
+                        self._pause_deadlines(slots, suspended_at)
+        finally:
+            for slot in slots:
+                try:
+                    slot.conn.send(None)
+                except (OSError, ValueError):
+                    pass
+            # worker yang di-profile masih menulis file profile saat keluar
+            join_timeout = 30 if is_enabled("ingest") or is_enabled("extract") else 1
+            for slot in slots:
+                slot.process.join(join_timeout)
+                self._kill_worker(slot)
@@ -2,6 +2,8 @@ from fuzzywuzzy import fuzz
 import re
 from typing import List, Tuple
 
+from core.tracing import count
+
 def compute_lps(pattern: str) -> list[int]:
     """
     Membuat tabel lps (longest prefix suffix) untuk KMP.
@@ -25,6 +27,8 @@ def compute_lps(pattern: str) -> list[int]:
 
 
 def kmp_search(text_normal: str, pattern_normal: str) -> list[int]:
+    count("matcher.kmp")
+    count("matcher.chars", len(text_normal))
     text = text_normal.lower()
     pattern = pattern_normal.lower()
     
@@ -88,6 +92,8 @@ def good_suffix_table(pattern: str) -> list[int]:
 
 
 def bm_search(text_normal: str, pattern_normal: str) -> list[int]:
+    count("matcher.bm")
+    count("matcher.chars", len(text_normal))
     text = text_normal.lower()
     pattern = pattern_normal.lower()
     
@@ -117,6 +123,8 @@ def bm_search(text_normal: str, pattern_normal: str) -> list[int]:
 
 
 def fuzzy_search(text: str, pattern: str, threshold: int = 60) -> list[tuple[int, str, int]]:
+    count("matcher.fuzzy")
+    count("matcher.chars", len(text))
     results = []
     words = re.findall(r'\w+', text)
     
@@ -165,6 +173,8 @@ def build_ac_automaton(patterns: list[str]) -> AhoCorasickNode:
     return root
 
 def ac_search(text_normal: str, patterns_normal: list[str]) -> list[tuple[int, str]]:
+    count("matcher.ac")
+    count("matcher.chars", len(text_normal))
     text = text_normal.lower()
     patterns = [p.lower() for p in patterns_normal]
     
@@ -0,0 +1,138 @@
+"""
+Kunci pencarian nama yang tahan leetspeak dan typo.
+Nama di-canonicalize (huruf kecil, 4->a, 0->o, ...), lalu tiap token disimpan sebagai:
+  canon : bentuk canonical
+  phon  : kode Soundex dari bentuk canonical
+  del1  : bentuk canonical dengan satu huruf dihapus (symmetric delete, untuk typo 1 huruf)
+Kunci ini di-hash oleh BlindIndexer dan disimpan di name_blind_index.
+"""
+
+import re
+import unicodedata
+
+KIND_CANON = "canon"
+KIND_PHONETIC = "phon"
+KIND_DELETE = "del1"
+NAME_KEY_KINDS = (KIND_CANON, KIND_PHONETIC, KIND_DELETE)
+
+LEET_MAP = str.maketrans({
+    '4': 'a', '@': 'a',
+    '8': 'b',
+    '3': 'e',
+    '6': 'g', '9': 'g',
+    '1': 'i', '!': 'i', '|': 'i',
+    '0': 'o',
+    '5': 's', '$': 's',
+    '7': 't',
+    '2': 'z',
+})
+
+_SOUNDEX_CODES = {}
+for _letters, _code in (('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'), ('l', '4'), ('mn', '5'), ('r', '6')):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = _code
+
+_NON_LETTER = re.compile(r"[^a-z]+")
+_TOKEN_SPLIT = re.compile(r"[\s,.\-_/]+")
+
+# token pendek menghasilkan terlalu banyak kandidat del1
+MIN_DELETE_LENGTH = 4
+
+def canonical_token(token: str) -> str:
+    text = unicodedata.normalize("NFKD", token)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_LETTER.sub("", text.lower().translate(LEET_MAP))
+
+def canonical_tokens(name) -> list:
+    """Token nama canonical, tanpa duplikat; leet dipetakan sebelum tanda baca dibuang"""
+    if not name:
+        return []
+    tokens = (canonical_token(part) for part in _TOKEN_SPLIT.split(str(name)))
+    return list(dict.fromkeys(token for token in tokens if token))
+
+def soundex(token: str) -> str:
+    if not token:
+        return ""
+    first = token[0]
+    digits = []
+    previous = _SOUNDEX_CODES.get(first, '')
+    for letter in token[1:]:
+        code = _SOUNDEX_CODES.get(letter, '')
+        if code and code != previous:
+            digits.append(code)
+        if letter not in 'hw':
+            previous = code
+    return (first.upper() + "".join(digits) + "000")[:4]
+
+def deletion_keys(token: str) -> set:
+    if len(token) < MIN_DELETE_LENGTH:
+        return set()
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+def name_keys(name) -> set:
+    """Semua (kind, key) plaintext untuk satu nilai nama"""
+    keys = set()
+    for token in canonical_tokens(name):
+        keys.add((KIND_CANON, token))
+        keys.add((KIND_PHONETIC, soundex(token)))
+        for deleted in deletion_keys(token):
+            keys.add((KIND_DELETE, deleted))
+    return keys
+
+def query_keys(token: str) -> set:
+    """
+    Kunci lookup untuk satu token query canonical: bentuk canonical dan soundex,
+    plus token & delete-nya terhadap del1 (menemukan kandidat dengan jarak edit <= 1 atau 2).
+    """
+    keys = {(KIND_CANON, token), (KIND_PHONETIC, soundex(token))}
+    if len(token) >= MIN_DELETE_LENGTH:
+        keys.add((KIND_DELETE, token))
+        for deleted in deletion_keys(token):
+            keys.add((KIND_DELETE, deleted))
+            keys.add((KIND_CANON, deleted))
+    return keys
+
+def levenshtein(a: str, b: str, max_distance: int = None) -> int:
+    """Edit distance; berhenti lebih awal (return max_distance + 1) kalau sudah pasti melebihi batas"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+def match_name(query, candidate_names, max_distance=1, phonetic=True):
+    """
+    Cocokkan setiap token query ke token nama kandidat (gabungan first/last name).
+    Returns total jarak edit (0 = canonical sama) atau None kalau ada token yang tidak cocok.
+    """
+    name_tokens = []
+    for name in candidate_names:
+        name_tokens.extend(canonical_tokens(name))
+    if not name_tokens:
+        return None
+
+    total = 0
+    for token in canonical_tokens(query):
+        best = min(levenshtein(token, name_token, max_distance) for name_token in name_tokens)
+        if best > max_distance:
+            if phonetic and any(soundex(token) == soundex(name_token) for name_token in name_tokens):
+                best = max_distance
+            else:
+                return None
+        total += best
+    return total
@@ -0,0 +1,310 @@
+"""
+Profiling opsional untuk hot path (search, extract_profile_data, ingest).
+
+Mati secara default. Aktifkan lewat env var atau PROFILING_SETTINGS['targets']:
+
+    BUKDUR_PROFILE=search            # hanya search
+    BUKDUR_PROFILE=search,ingest     # beberapa target
+    BUKDUR_PROFILE=all               # search, extract, ingest
+
+Profiler 'cprofile' (default) menulis <output_dir>/<waktu>_<target>_<pid>_<n>.prof (pstats, bisa dibuka
+snakeviz); 'sample' (BUKDUR_PROFILER=sample) mengambil stack thread tiap interval dan menulis .folded
+(format flamegraph). Overhead sampling kecil, cocok untuk loop matcher yang melambat puluhan kali di cProfile.
+Keduanya menulis .txt berisi ringkasan top-N. Snapshot tracemalloc (top alokasi + peak) opsional lewat
+BUKDUR_TRACEMALLOC=1 atau config: setiap alokasi di-trace, loop matcher bisa 25x lebih lambat.
+Run di dalam run lain (mis. extract_profile_data di dalam worker ingest) ikut ke profile luar.
+Di dalam aggregate_run("extract") (worker ingest, load corpus) semua pemanggilan extract_profile_data
+dikumpulkan ke satu profile per run, bukan satu file per resume.
+"""
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+ENV_VAR = "BUKDUR_PROFILE"
+PROFILER_ENV_VAR = "BUKDUR_PROFILER"
+TRACEMALLOC_ENV_VAR = "BUKDUR_TRACEMALLOC"
+TARGETS = ("search", "extract", "ingest")
+PROFILERS = ("cprofile", "sample")
+
+_DEFAULT_SETTINGS = {
+    'targets': [],
+    'profiler': 'cprofile',
+    'sample_interval_ms': 5,
+    'output_dir': os.path.join('logs', 'profiles'),
+    'top_n': 30,
+    'tracemalloc': False,
+    'tracemalloc_frames': 5,
+    'min_duration_ms': 0
+}
+
+_local = threading.local()
+_sequence = itertools.count(1)
+_settings = None
+
+def _load_settings():
+    settings = dict(_DEFAULT_SETTINGS)
+    try:
+        from config import PROFILING_SETTINGS
+        settings.update(PROFILING_SETTINGS)
+    except ImportError:
+        pass
+    if not os.path.isabs(settings['output_dir']):
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        settings['output_dir'] = os.path.join(project_root, settings['output_dir'])
+    return settings
+
+def get_settings() -> dict:
+    global _settings
+    if _settings is None:
+        _settings = _load_settings()
+    return _settings
+
+def enabled_targets() -> set:
+    """Target dari env var (kalau di-set) atau dari config"""
+    value = os.environ.get(ENV_VAR)
+    if value is None:
+        targets = get_settings().get('targets') or []
+    else:
+        targets = [target.strip().lower() for target in value.split(",") if target.strip()]
+    if any(target in ("1", "all", "true", "yes") for target in targets):
+        return set(TARGETS)
+    return {target for target in targets if target in TARGETS}
+
+def is_enabled(target) -> bool:
+    return target in enabled_targets()
+
+def profiler_kind() -> str:
+    kind = (os.environ.get(PROFILER_ENV_VAR) or get_settings().get('profiler') or 'cprofile').strip().lower()
+    return kind if kind in PROFILERS else 'cprofile'
+
+class StackSampler:
+    """Sampling profiler: stack satu thread diambil tiap interval oleh thread daemon"""
+
+    def __init__(self, thread_id, interval_ms=5):
+        self.thread_id = thread_id
+        self.interval = max(0.001, interval_ms / 1000)
+        self.stacks = Counter()   # (frame root ... leaf) -> jumlah sample
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno or code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def enable(self):
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def total(self):
+        return sum(self.stacks.values())
+
+    def dump_folded(self, path):
+        """Satu baris 'root;...;leaf count' per stack (input flamegraph.pl / speedscope)"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {samples}\n")
+
+    def write_summary(self, out, top_n):
+        total = self.total
+        out.write(f"{total} samples every {self.interval * 1000:.0f} ms\n")
+        if not total:
+            return
+        self_counts, cumulative_counts = Counter(), Counter()
+        for stack, samples in self.stacks.items():
+            self_counts[stack[-1]] += samples
+            # fungsi rekursif hanya dihitung sekali per stack
+            for frame in set(_function_of(entry) for entry in stack):
+                cumulative_counts[frame] += samples
+        for title, counts in (("cumulative (function)", cumulative_counts), ("self (line)", self_counts)):
+            out.write(f"\n=== Top {top_n} by {title} ===\n")
+            for name, samples in counts.most_common(top_n):
+                out.write(f"{samples / total * 100:6.1f}% {samples:>7}  {name}\n")
+
+def _function_of(entry):
+    """'kmp_search (matcher.py:41)' -> 'kmp_search (matcher.py)'"""
+    name, _, location = entry.rpartition(" (")
+    return f"{name} ({location.rsplit(':', 1)[0]})"
+
+def tracemalloc_enabled() -> bool:
+    value = os.environ.get(TRACEMALLOC_ENV_VAR)
+    if value is None:
+        return bool(get_settings().get('tracemalloc'))
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def _run_path(target):
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(get_settings()['output_dir'], f"{stamp}_{target}_{os.getpid()}_{next(_sequence)}")
+
+def format_summary(target, attrs, duration_ms, profiler, snapshot, peak_bytes, top_n) -> str:
+    """Ringkasan teks: header run, top-N cumulative / tottime, top-N alokasi"""
+    out = io.StringIO()
+    out.write(f"target: {target}\n")
+    for key, value in attrs.items():
+        out.write(f"{key}: {value}\n")
+    out.write(f"wall time: {duration_ms:.1f} ms\n")
+    if peak_bytes is not None:
+        out.write(f"tracemalloc peak: {peak_bytes / 1024 / 1024:.2f} MB\n")
+
+    if isinstance(profiler, StackSampler):
+        profiler.write_summary(out, top_n)
+    elif profiler is not None:
+        stats = pstats.Stats(profiler, stream=out)
+        for sort_key in ("cumulative", "tottime"):
+            out.write(f"\n=== Top {top_n} functions by {sort_key} ===\n")
+            stats.sort_stats(sort_key).print_stats(top_n)
+
+    if snapshot is not None:
+        out.write(f"\n=== Top {top_n} allocations by line ===\n")
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        for stat in snapshot.statistics("lineno")[:top_n]:
+            out.write(f"{stat}\n")
+    return out.getvalue()
+
+def _write_run(target, path, attrs, duration_ms, profiler, snapshot=None, peak_bytes=None):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(profiler, StackSampler):
+            profiler.dump_folded(path + ".folded")
+        elif profiler is not None:
+            profiler.dump_stats(path + ".prof")
+        summary = format_summary(target, attrs, duration_ms, profiler, snapshot,
+                                 peak_bytes, get_settings().get('top_n', 30))
+        with open(path + ".txt", "w", encoding="utf-8") as f:
+            f.write(summary)
+        print(f"Profile ({target}, {duration_ms:.0f} ms) written to {path}.txt")
+    except OSError as e:
+        print(f"Warning: could not write profile: {e}")
+
+@contextmanager
+def profile_run(target, **attrs):
+    """
+    Profile blok ini kalau target aktif; no-op kalau tidak (atau sudah di dalam run lain).
+    Yield path dasar file output (tanpa ekstensi) atau None kalau tidak di-profile.
+    """
+    if getattr(_local, 'active', False) or not is_enabled(target):
+        yield None
+        return
+
+    settings = get_settings()
+    path = _run_path(target)
+    if profiler_kind() == 'sample':
+        profiler = StackSampler(threading.get_ident(), settings.get('sample_interval_ms', 5))
+    else:
+        profiler = cProfile.Profile()
+    started_tracemalloc = False
+    if tracemalloc_enabled() and not tracemalloc.is_tracing():
+        tracemalloc.start(settings.get('tracemalloc_frames', 5))
+        started_tracemalloc = True
+
+    _local.active = True
+    start = time.perf_counter()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # profiler lain sudah aktif (mis. run di thread lain): tetap ukur waktu dan memori
+        print(f"Warning: profiler unavailable for {target}: {e}")
+        profiler = None
+
+    try:
+        yield path
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        duration_ms = (time.perf_counter() - start) * 1000
+        _local.active = False
+
+        snapshot, peak_bytes = None, None
+        if started_tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        if duration_ms >= settings.get('min_duration_ms', 0):
+            _write_run(target, path, attrs, duration_ms, profiler, snapshot, peak_bytes)
+
+class _Aggregate:
+    """Satu cProfile yang hanya aktif selama pemanggilan fungsi @profiled(target)"""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.calls = 0
+        self.seconds = 0.0
+
+@contextmanager
+def aggregate_run(target, **attrs):
+    """
+    Kumpulkan semua pemanggilan @profiled(target) di blok ini (thread ini) ke satu profile.
+    Selalu memakai cProfile: sampler tidak bisa dinyalakan/dimatikan per pemanggilan.
+    """
+    aggregates = getattr(_local, 'aggregates', None)
+    if aggregates is None:
+        aggregates = _local.aggregates = {}
+    if target in aggregates or not is_enabled(target):
+        yield None
+        return
+
+    aggregate = aggregates[target] = _Aggregate()
+    start = time.perf_counter()
+    try:
+        yield aggregate
+    finally:
+        del aggregates[target]
+        if aggregate.calls:
+            duration_ms = (time.perf_counter() - start) * 1000
+            summary_attrs = dict(attrs, calls=aggregate.calls,
+                                 time_in_calls_ms=round(aggregate.seconds * 1000, 1))
+            _write_run(target, _run_path(target), summary_attrs, duration_ms, aggregate.profiler)
+
+def profiled(target):
+    """
+    Decorator: kalau target aktif, setiap pemanggilan menjadi satu run,
+    atau masuk ke aggregate_run(target) yang sedang terbuka.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'active', False) or not is_enabled(target):
+                # tidak di-profile, atau sudah tercakup run luar
+                return func(*args, **kwargs)
+            aggregate = getattr(_local, 'aggregates', {}).get(target)
+            if aggregate is None:
+                with profile_run(target, function=func.__qualname__):
+                    return func(*args, **kwargs)
+
+            aggregate.calls += 1
+            start = time.perf_counter()
+            try:
+                aggregate.profiler.enable()
+            except ValueError:
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                aggregate.profiler.disable()
+                aggregate.seconds += time.perf_counter() - start
+        return wrapper
+    return decorator
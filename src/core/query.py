@@ -0,0 +1,392 @@
+"""
+Query language untuk keyword box:
+    python AND (django OR flask) NOT php
+    "machine learning"  skills:sql  experience:"data engineer"  "sql server"~3
+Kata yang berdampingan tanpa operator = AND, koma = OR.
+Query tanpa sintaks ini (mis. "python, java") tetap memakai pencarian lama.
+"""
+
+import re
+from bisect import bisect_right
+
+from core.scoring import FIELDS, tokenize
+
+FIELD_ALIASES = {
+    'skills': 'skills', 'skill': 'skills',
+    'experience': 'experience', 'exp': 'experience',
+    'body': 'body', 'text': 'body'
+}
+
+_LEXER = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\() | (?P<rparen>\)) | (?P<comma>,) |
+        (?:(?P<field>[A-Za-z_]+):)?
+        (?: "(?P<phrase>[^"]*)"(?:~(?P<slop>\d+))? | (?P<word>[^\s(),"]+) )
+    )''', re.VERBOSE)
+
+_STRUCTURED_HINT = re.compile(r'["()]|\b(?:AND|OR|NOT)\b|\b(?:%s):' % '|'.join(FIELD_ALIASES))
+
+class QuerySyntaxError(ValueError):
+    pass
+
+class Literal:
+    __slots__ = ('text', 'tokens', 'field', 'slop', 'phrase')
+
+    def __init__(self, text, field=None, phrase=False, slop=None):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.field = field
+        self.phrase = phrase
+        self.slop = slop
+
+    @property
+    def label(self):
+        text = f'"{self.text}"' if self.phrase else self.text
+        if self.slop is not None:
+            text += f"~{self.slop}"
+        return f"{self.field}:{text}" if self.field else text
+
+class And:
+    __slots__ = ('children',)
+
+    def __init__(self, children):
+        self.children = children
+
+class Or:
+    __slots__ = ('children',)
+
+    def __init__(self, children):
+        self.children = children
+
+class Not:
+    __slots__ = ('child',)
+
+    def __init__(self, child):
+        self.child = child
+
+def is_structured_query(text: str) -> bool:
+    """True kalau query memakai operator, frasa, kurung atau field scope"""
+    return bool(text and _STRUCTURED_HINT.search(text))
+
+def _lex(text):
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _LEXER.match(text, position)
+        if not match or match.end() == position:
+            raise QuerySyntaxError(f"Unexpected character at {position}: {text[position:position + 10]!r}")
+        position = match.end()
+
+        if match.group('lparen'):
+            tokens.append(('(', None))
+        elif match.group('rparen'):
+            tokens.append((')', None))
+        elif match.group('comma'):
+            tokens.append(('OR', None))
+        else:
+            field = match.group('field')
+            if field is not None:
+                if field.lower() not in FIELD_ALIASES:
+                    raise QuerySyntaxError(f"Unknown field: {field}")
+                field = FIELD_ALIASES[field.lower()]
+
+            if match.group('phrase') is not None:
+                slop = int(match.group('slop')) if match.group('slop') else None
+                tokens.append(('LIT', Literal(match.group('phrase'), field, phrase=True, slop=slop)))
+            elif field is None and match.group('word') in ('AND', 'OR', 'NOT'):
+                tokens.append((match.group('word'), None))
+            else:
+                tokens.append(('LIT', Literal(match.group('word'), field)))
+    return tokens
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self):
+        return self.tokens[self.index][0] if self.index < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Unexpected {self.peek()}")
+        return node
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.peek() == 'OR':
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self):
+        children = [self.parse_not()]
+        while self.peek() in ('AND', 'NOT', 'LIT', '('):
+            if self.peek() == 'AND':
+                self.take()
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self):
+        if self.peek() == 'NOT':
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self):
+        kind = self.peek()
+        if kind == '(':
+            self.take()
+            node = self.parse_or()
+            if self.peek() != ')':
+                raise QuerySyntaxError("Missing closing parenthesis")
+            self.take()
+            return node
+        if kind == 'LIT':
+            literal = self.take()[1]
+            if not literal.tokens:
+                raise QuerySyntaxError(f"Empty term: {literal.label}")
+            return literal
+        raise QuerySyntaxError(f"Expected a term, got {kind or 'end of query'}")
+
+def literal_occurrences(literal, doc_postings) -> int:
+    """
+    Jumlah kemunculan literal dalam satu dokumen.
+    doc_postings: {(term, field): [positions]} seperti hasil build_postings.
+    """
+    fields = [literal.field] if literal.field else FIELDS
+    total = 0
+    for field in fields:
+        position_lists = [doc_postings.get((term, field)) for term in literal.tokens]
+        if not all(position_lists):
+            continue
+        if len(position_lists) == 1:
+            total += len(position_lists[0])
+            continue
+
+        following = [set(positions) for positions in position_lists[1:]]
+        if literal.slop is None:
+            # frasa: token ke-i tepat di posisi p + i
+            total += sum(
+                1 for start in position_lists[0]
+                if all(start + offset in positions for offset, positions in enumerate(following, 1))
+            )
+        else:
+            total += sum(1 for start in position_lists[0] if sloppy_match(start, position_lists[1:], literal.slop))
+    return total
+
+def sloppy_match(start, following, slop) -> bool:
+    """
+    Proximity berurutan: token ke-i muncul setelah token ke-(i-1), dengan total kata sisipan <= slop.
+    "a b"~0 sama dengan frasa, "a b"~2 juga cocok dengan "a x y b" tapi tidak dengan "b a".
+    Untuk start tertentu, memilih posisi terdekat berikutnya selalu memberi span terkecil.
+    """
+    position = start
+    for positions in following:
+        index = bisect_right(positions, position)
+        if index == len(positions):
+            return False
+        position = positions[index]
+    return position - start - len(following) <= slop
+
+class QueryPlan:
+    """Query yang sudah di-parse: kandidat dari posting list, lalu verifikasi per dokumen"""
+
+    def __init__(self, text, root):
+        self.text = text
+        self.root = root
+        self.literals = []
+        self._collect(root, negated=False)
+
+    def _collect(self, node, negated):
+        if isinstance(node, Literal):
+            if not negated:
+                self.literals.append(node)
+        elif isinstance(node, Not):
+            self._collect(node.child, not negated)
+        else:
+            for child in node.children:
+                self._collect(child, negated)
+
+    @property
+    def labels(self):
+        """Label per literal positif (ditampilkan sebagai 'skills' di kartu hasil)"""
+        return [literal.label for literal in self.literals] or [self.text]
+
+    def positive_terms(self):
+        terms = []
+        for literal in self.literals:
+            terms.extend(literal.tokens)
+        return list(dict.fromkeys(terms))
+
+    # --- evaluasi per dokumen -------------------------------------------------
+
+    def matches(self, doc_postings) -> bool:
+        return self._matches(self.root, doc_postings)
+
+    def _matches(self, node, doc_postings):
+        if isinstance(node, Literal):
+            return literal_occurrences(node, doc_postings) > 0
+        if isinstance(node, Not):
+            return not self._matches(node.child, doc_postings)
+        if isinstance(node, And):
+            return all(self._matches(child, doc_postings) for child in node.children)
+        return any(self._matches(child, doc_postings) for child in node.children)
+
+    def literal_counts(self, doc_postings) -> list:
+        if not self.literals:
+            return [1]
+        return [literal_occurrences(literal, doc_postings) for literal in self.literals]
+
+    # --- kandidat dari index ------------------------------------------------------
+
+    def candidates(self, source):
+        """
+        Set resume id yang memenuhi query menurut posting list, atau None kalau index belum ada.
+        AND dievaluasi dari anak termurah (document frequency terkecil) dan berhenti saat kosong.
+        """
+        if not source.available():
+            return None
+        source.prefetch_doc_freqs(self.all_terms())
+        return self._candidates(self.root, source)
+
+    def all_terms(self):
+        terms = []
+        self._all_terms(self.root, terms)
+        return list(dict.fromkeys(terms))
+
+    def _all_terms(self, node, terms):
+        if isinstance(node, Literal):
+            terms.extend(node.tokens)
+        elif isinstance(node, Not):
+            self._all_terms(node.child, terms)
+        else:
+            for child in node.children:
+                self._all_terms(child, terms)
+
+    def _cost(self, node, source):
+        if isinstance(node, Literal):
+            return min(source.doc_freq(term) for term in node.tokens)
+        if isinstance(node, Not):
+            return source.total_docs() - self._cost(node.child, source)
+        costs = [self._cost(child, source) for child in node.children]
+        return min(costs) if isinstance(node, And) else sum(costs)
+
+    def _candidates(self, node, source):
+        if isinstance(node, Literal):
+            return self._literal_candidates(node, source)
+        if isinstance(node, Not):
+            return source.all_ids() - self._candidates(node.child, source)
+        if isinstance(node, Or):
+            result = set()
+            for child in node.children:
+                result |= self._candidates(child, source)
+            return result
+
+        positives = sorted(
+            (child for child in node.children if not isinstance(child, Not)),
+            key=lambda child: self._cost(child, source)
+        )
+        negatives = [child.child for child in node.children if isinstance(child, Not)]
+
+        result = None
+        for child in positives:
+            child_ids = self._candidates(child, source)
+            result = child_ids if result is None else result & child_ids
+            if not result:
+                return set()
+        if result is None:
+            result = source.all_ids()
+        for child in negatives:
+            result -= self._candidates(child, source)
+            if not result:
+                break
+        return result
+
+    def _literal_candidates(self, literal, source):
+        terms = sorted(set(literal.tokens), key=source.doc_freq)
+        fields = [literal.field] if literal.field else FIELDS
+
+        term_postings = {}
+        result = None
+        for term in terms:
+            postings = source.postings(term)
+            term_postings[term] = postings
+            ids = {resume_id for resume_id, by_field in postings.items() if any(f in by_field for f in fields)}
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+
+        if len(literal.tokens) == 1:
+            return result
+
+        # frasa / proximity: cek posisi dari posting list, tanpa membaca teks
+        verified = set()
+        for resume_id in result:
+            doc_postings = {
+                (term, field): positions
+                for term in terms
+                for field, positions in term_postings[term][resume_id].items()
+            }
+            if literal_occurrences(literal, doc_postings) > 0:
+                verified.add(resume_id)
+        return verified
+
+class DatabasePostingSource:
+    """Posting list dari tabel resume_terms (lihat DatabaseManager.index_resume_terms)"""
+
+    def __init__(self, db):
+        self.db = db
+        self._stats = None
+        self._postings = {}
+        self._all_ids = None
+
+    def _statistics(self, terms=()):
+        if self._stats is None:
+            self._stats = self.db.get_term_statistics(list(terms))
+        return self._stats
+
+    def available(self):
+        return self._statistics()['total_docs'] > 0
+
+    def prefetch_doc_freqs(self, terms):
+        missing = [term for term in terms if term not in self._statistics()['doc_freqs']]
+        if missing:
+            self._stats['doc_freqs'].update(self.db.get_term_statistics(missing)['doc_freqs'])
+            for term in missing:
+                self._stats['doc_freqs'].setdefault(term, 0)
+
+    def total_docs(self):
+        return self._statistics()['total_docs']
+
+    def doc_freq(self, term):
+        return self._statistics()['doc_freqs'].get(term, 0)
+
+    def postings(self, term):
+        """{resume_id: {field: [positions]}}"""
+        if term not in self._postings:
+            by_resume = {}
+            if self.doc_freq(term):
+                for _, field, resume_id, _, positions in self.db.get_term_postings([term], with_positions=True):
+                    by_resume.setdefault(resume_id, {})[field] = [int(p) for p in positions.split(',') if p]
+            self._postings[term] = by_resume
+        return self._postings[term]
+
+    def all_ids(self):
+        if self._all_ids is None:
+            self._all_ids = set(self.db.get_indexed_resume_ids())
+        return set(self._all_ids)
+
+def compile_query(text: str) -> QueryPlan:
+    """Parse query text; raises QuerySyntaxError"""
+    tokens = _lex(text)
+    if not tokens:
+        raise QuerySyntaxError("Empty query")
+    return QueryPlan(text, _Parser(tokens).parse())
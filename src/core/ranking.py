@@ -0,0 +1,136 @@
+import heapq
+
+class HitRecord:
+    """Satu resume yang cocok: hanya id, skor dan jumlah match per keyword (tuple)"""
+    __slots__ = ('resume_id', 'seq', 'exact_matches', 'fuzzy_matches', 'exact_counts', 'fuzzy_counts')
+
+    def __init__(self, resume_id, seq):
+        self.resume_id = resume_id
+        self.seq = seq                # urutan masuk, untuk tie-break yang sama dengan sort stabil
+        self.exact_matches = 0
+        self.fuzzy_matches = 0
+        self.exact_counts = None
+        self.fuzzy_counts = None
+
+    @property
+    def matches(self):
+        return self.exact_matches + self.fuzzy_matches
+
+    @property
+    def match_type(self):
+        if self.exact_counts and self.fuzzy_counts:
+            return 'both'
+        return 'exact' if self.exact_counts else 'fuzzy'
+
+class TopK:
+    """Bounded min-heap: menyimpan k skor tertinggi, seri dimenangkan yang masuk lebih dulu"""
+
+    def __init__(self, k):
+        self.k = max(0, int(k))
+        self._heap = []
+
+    def push(self, score, seq, item):
+        if self.k == 0:
+            return
+        entry = (score, -seq, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self):
+        """Item dari skor tertinggi ke terendah"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
+
+class RankingAccumulator:
+    """
+    Skor per resume selama search (exact lalu fuzzy), disimpan sebagai HitRecord.
+    Dict hasil untuk tampilan hanya dibuat untuk top-k terakhir.
+    """
+
+    def __init__(self, keywords, missing_keywords=None):
+        self.keywords = list(keywords)
+        self.missing_keywords = list(missing_keywords or [])
+        self._hits = {}
+        self.exact_count = 0
+        self.fuzzy_count = 0
+        self.scores = None            # {resume_id: relevance}, None = ranking berdasarkan jumlah match
+
+    def set_missing_keywords(self, missing_keywords):
+        self.missing_keywords = list(missing_keywords)
+
+    def _record(self, resume_id):
+        record = self._hits.get(resume_id)
+        if record is None:
+            record = HitRecord(resume_id, len(self._hits))
+            self._hits[resume_id] = record
+        return record
+
+    def add_exact(self, resume_id, counts):
+        """counts: jumlah match per keyword, urutan sama dengan self.keywords"""
+        total = sum(counts)
+        if total <= 0:
+            return
+        record = self._record(resume_id)
+        record.exact_matches += total
+        record.exact_counts = tuple(counts)
+        self.exact_count += 1
+
+    def add_fuzzy(self, resume_id, counts):
+        """counts: jumlah match fuzzy per keyword, urutan sama dengan self.missing_keywords"""
+        total = sum(counts)
+        if total <= 0:
+            return
+        record = self._record(resume_id)
+        record.fuzzy_matches += total
+        record.fuzzy_counts = tuple(counts)
+        self.fuzzy_count += 1
+
+    def __len__(self):
+        return len(self._hits)
+
+    def resume_ids(self):
+        return list(self._hits)
+
+    def set_scores(self, scores):
+        """Pakai skor relevansi (mis. BM25) sebagai kunci utama, jumlah match sebagai tie-break"""
+        self.scores = scores
+
+    def rank_key(self, record):
+        if self.scores is None:
+            return record.matches
+        return (self.scores.get(record.resume_id, 0.0), record.matches)
+
+    def top(self, k):
+        """k HitRecord terbaik, O(n log k)"""
+        top_k = TopK(k)
+        for record in self._hits.values():
+            top_k.push(self.rank_key(record), record.seq, record)
+        return top_k.items()
+
+    def materialize(self, record):
+        """Dict hasil seperti yang dipakai GUI (tanpa name/profile_data)"""
+        skills = {}
+        if record.exact_counts:
+            for keyword, count in zip(self.keywords, record.exact_counts):
+                if count:
+                    skills[keyword] = count
+        if record.fuzzy_counts:
+            for keyword, count in zip(self.missing_keywords, record.fuzzy_counts):
+                if count:
+                    skills[f"{keyword} (fuzzy)"] = count
+        result = {
+            'matches': record.matches,
+            'skills': skills,
+            'resume_id': record.resume_id,
+            'match_type': record.match_type
+        }
+        if self.scores is not None:
+            result['score'] = round(self.scores.get(record.resume_id, 0.0), 4)
+        return result
+
+    def top_results(self, k):
+        return [self.materialize(record) for record in self.top(k)]
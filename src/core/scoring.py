@@ -0,0 +1,76 @@
+import math
+import re
+from collections import defaultdict
+
+# field yang diindeks; body = seluruh extracted_text
+FIELDS = ('skills', 'experience', 'body')
+DEFAULT_FIELD_BOOSTS = {'skills': 3.0, 'experience': 2.0, 'body': 1.0}
+
+MAX_TERM_LENGTH = 64
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+[+#]*")
+
+def tokenize(text: str) -> list:
+    """Lowercase term, tetap mempertahankan c++ / c#"""
+    if not text:
+        return []
+    return [token[:MAX_TERM_LENGTH] for token in _TOKEN_PATTERN.findall(text.lower())]
+
+def build_postings(field_texts: dict):
+    """
+    field_texts: {field: text}
+    Returns (postings, lengths): postings = {(term, field): [positions]}, lengths = {field: jumlah token}
+    """
+    postings = defaultdict(list)
+    lengths = {}
+    for field in FIELDS:
+        tokens = tokenize(field_texts.get(field) or "")
+        lengths[field] = len(tokens)
+        for position, term in enumerate(tokens):
+            postings[(term, field)].append(position)
+    return dict(postings), lengths
+
+def query_terms(keywords) -> list:
+    """Term unik dari daftar keyword (keyword multi-kata dipecah)"""
+    terms = []
+    for keyword in keywords:
+        terms.extend(tokenize(keyword))
+    return list(dict.fromkeys(terms))
+
+class BM25Scorer:
+    """
+    BM25F: term frequency per field dinormalisasi panjang field, diberi boost,
+    dijumlahkan, lalu dipakai di saturasi BM25 dengan idf dari document frequency.
+    """
+
+    def __init__(self, total_docs, avg_lengths, doc_freqs, k1=1.2, b=0.75, boosts=None):
+        self.total_docs = max(0, int(total_docs or 0))
+        self.avg_lengths = {field: (avg_lengths.get(field) or 0) for field in FIELDS}
+        self.doc_freqs = doc_freqs
+        self.k1 = k1
+        self.b = b
+        self.boosts = dict(DEFAULT_FIELD_BOOSTS)
+        if boosts:
+            self.boosts.update(boosts)
+
+    def idf(self, term):
+        df = self.doc_freqs.get(term, 0)
+        # idf non-negatif ala Lucene: log(1 + (N - df + 0.5) / (df + 0.5))
+        return math.log(1 + (self.total_docs - df + 0.5) / (df + 0.5))
+
+    def score(self, postings, doc_lengths):
+        """
+        postings: iterable (term, field, resume_id, tf) hasil merge posting list query terms
+        doc_lengths: {resume_id: {field: length}}
+        Returns {resume_id: score}
+        """
+        weighted_tf = defaultdict(float)
+        for term, field, resume_id, tf in postings:
+            avg_length = self.avg_lengths.get(field) or 1
+            length = doc_lengths.get(resume_id, {}).get(field, avg_length)
+            norm = 1 - self.b + self.b * (length / avg_length)
+            weighted_tf[(resume_id, term)] += self.boosts.get(field, 1.0) * tf / norm
+
+        scores = defaultdict(float)
+        for (resume_id, term), tf in weighted_tf.items():
+            scores[resume_id] += self.idf(term) * tf * (self.k1 + 1) / (tf + self.k1)
+        return dict(scores)
@@ -0,0 +1,332 @@
+"""
+Search engine yang dipakai GUI (SearchWorker), batch CLI dan HTTP service.
+Source bisa DatabaseManager atau TextCorpus (in-memory); keduanya punya method
+iter_resumes / get_term_* / get_resume_metadata yang sama.
+"""
+
+import time
+
+from config import SEARCH_SETTINGS
+from core import tracing
+from core.cancellation import CancellationToken, SearchCancelled
+from core.matcher import kmp_search, bm_search, ac_search, fuzzy_search
+from core.query import DatabasePostingSource, QuerySyntaxError, compile_query, is_structured_query
+from core.ranking import RankingAccumulator
+from core.scoring import BM25Scorer, build_postings, query_terms
+
+SEARCH_METHODS = ("KMP", "BM", "AC")
+
+def normalize_method(method) -> str:
+    """'kmp' / 'bm' / 'boyer-moore' / 'ac' / 'aho-corasick' -> KMP / BM / AC"""
+    value = str(method or "KMP").strip().upper().replace("_", "-")
+    aliases = {"BOYER-MOORE": "BM", "AHO-CORASICK": "AC"}
+    value = aliases.get(value, value)
+    if value not in SEARCH_METHODS:
+        raise ValueError(f"Unknown search method: {method}")
+    return value
+
+class SearchEngine:
+    """
+    Exact matching (KMP/BM/AC) + fuzzy fallback, atau structured query, di atas satu source.
+    on_partial(results): dipanggil dengan top-k sementara selama scan (opsional).
+    metadata_factory(): source kedua untuk metadata partial result, dibutuhkan DatabaseManager
+    karena koneksi utama sedang streaming; None = pakai source yang sama.
+    """
+
+    def __init__(self, source, method="KMP", cancel_token=None, on_partial=None,
+                 metadata_factory=None, settings=None):
+        self.source = source
+        self.method = normalize_method(method)
+        self.cancel_token = cancel_token or CancellationToken()
+        self.settings = SEARCH_SETTINGS if settings is None else settings
+        self.on_partial = on_partial
+        self.progressive = on_partial is not None and self.settings.get('progressive_results', False)
+        self.metadata_factory = metadata_factory
+        self._metadata_source = None
+        self._metadata_cache = {}
+        self._last_partial_time = 0
+        self._last_partial_key = None
+        self._first_partial_ms = None
+        self._start_time = None
+        self.top_matches = 0
+
+    def search(self, keywords, top_matches):
+        """
+        Returns (results, timing_data). Raises QuerySyntaxError untuk structured query yang salah
+        dan SearchCancelled kalau cancel_token dibatalkan.
+        """
+        token = self.cancel_token
+        source = self.source
+        self.top_matches = top_matches
+        self._start_time = time.time()
+        self._last_partial_key = None
+        self._first_partial_ms = None
+
+        # AND/OR/NOT, "phrases", field:scope and ~N proximity; plain comma lists keep the old path
+        with tracing.span("query.compile"):
+            plan = compile_query(keywords) if is_structured_query(keywords) else None
+
+        chunk_size = self.settings.get('stream_chunk_size', 200)
+        # matching only needs id + text; names are fetched for the shown results only
+        search_columns = ['id', 'extracted_text']
+
+        candidate_ids = None
+        if plan is not None:
+            keywords_list = plan.labels
+            # candidate set from the postings (cheapest AND branch first), verified per resume below
+            with tracing.span("query.candidates"):
+                candidate_ids = plan.candidates(DatabasePostingSource(source))
+            search_columns = ['id', 'extracted_text', 'skills', 'experience']
+        else:
+            keywords_list = [k.strip() for k in keywords.split(',')]
+
+            # FULLTEXT prefilter (opt-in): only fetch resumes the index says can match, then verify
+            # them with the selected exact algorithm. Keywords inside longer words are missed.
+            if self.settings.get('fulltext_prefilter', False):
+                candidate_ids = source.get_fulltext_candidate_ids(keywords_list)
+
+        # Perform exact matching first, chunk by chunk while rows are still streaming in
+        exact_start_time = time.time()
+        # compact per-resume scores; result dicts are built for the final top-k only
+        ranking = RankingAccumulator(keywords_list)
+        found_keywords = set()
+        exact_scanned = 0
+        token.raise_if_cancelled()
+        with tracing.span("exact"):
+            for chunk in source.iter_resumes(columns=search_columns, resume_ids=candidate_ids,
+                                             with_profile=False, chunk_size=chunk_size):
+                token.raise_if_cancelled()
+                hits_before = len(ranking)
+                with tracing.span("match"):
+                    if plan is not None:
+                        found_keywords.update(self.perform_query_search(chunk, plan, ranking))
+                    else:
+                        found_keywords.update(self.perform_exact_search(chunk, ranking))
+                exact_scanned += len(chunk)
+                if len(ranking) > hits_before:
+                    self.emit_partial(ranking)
+        exact_time = (time.time() - exact_start_time) * 1000  # Convert to ms
+
+        # Get keywords that weren't found in exact matching
+        # (a structured query is a filter: no fuzzy fallback)
+        missing_keywords = [kw for kw in keywords_list if kw not in found_keywords] if plan is None else []
+
+        # Perform fuzzy matching for missing keywords
+        ranking.set_missing_keywords(missing_keywords)
+        fuzzy_time = 0
+        fuzzy_scanned = 0
+
+        if missing_keywords:
+            # fuzzy matching still needs the whole corpus, streamed again
+            fuzzy_start_time = time.time()
+            with tracing.span("fuzzy"):
+                for chunk in source.iter_resumes(columns=search_columns, with_profile=False, chunk_size=chunk_size):
+                    token.raise_if_cancelled()
+                    fuzzy_before = ranking.fuzzy_count
+                    with tracing.span("match"):
+                        self.perform_fuzzy_search(chunk, missing_keywords, ranking)
+                    fuzzy_scanned += len(chunk)
+                    if ranking.fuzzy_count > fuzzy_before:
+                        self.emit_partial(ranking)
+            fuzzy_time = (time.time() - fuzzy_start_time) * 1000
+
+        if self.settings.get('ranking', 'count') == 'bm25' and len(ranking):
+            bm25_keywords = plan.positive_terms() if plan is not None else keywords_list
+            with tracing.span("bm25"):
+                ranking.set_scores(self.score_bm25(bm25_keywords, ranking.resume_ids()))
+
+        # exact + fuzzy scores are already merged per resume; keep the top k
+        with tracing.span("rank"):
+            final_results = ranking.top_results(top_matches)
+        token.raise_if_cancelled()
+        with tracing.span("metadata"):
+            self.attach_metadata(source, final_results)
+        tracing.count("results", len(final_results))
+
+        timing_data = {
+            'exact_time': exact_time,
+            'fuzzy_time': fuzzy_time,
+            'total_time': (time.time() - self._start_time) * 1000,
+            'exact_count': ranking.exact_count,
+            'fuzzy_count': ranking.fuzzy_count,
+            'total_scanned': fuzzy_scanned or exact_scanned,
+            'candidate_count': exact_scanned,
+            'prefilter_used': candidate_ids is not None,
+            'first_partial_ms': self._first_partial_ms,
+            'missing_keywords': missing_keywords,
+            'method_used': self.method
+        }
+        return final_results, timing_data
+
+    def close(self):
+        """Tutup source metadata kedua (kalau dibuat oleh metadata_factory)"""
+        if self._metadata_source is not None and self._metadata_source is not self.source:
+            self._metadata_source.disconnect()
+        self._metadata_source = None
+
+    def perform_exact_search(self, all_resumes, ranking):
+        """Perform exact matching using selected algorithm, scores go into ranking"""
+        found_keywords = set()
+        keywords = ranking.keywords
+
+        for resume in all_resumes:
+            search_text = resume.get('content', '') or resume.get('extracted_text', '')
+            if not search_text:
+                continue
+
+            counts = []
+            for keyword in keywords:
+                matches = self.count_literal(search_text, keyword)
+                counts.append(len(matches))
+                if matches:
+                    found_keywords.add(keyword)
+
+            # display data is attached later, only for the results that are shown
+            ranking.add_exact(resume['id'], counts)
+
+        return found_keywords
+
+    def perform_query_search(self, all_resumes, plan, ranking):
+        """Verify a compiled query against each resume; counts use the selected algorithm where possible"""
+        found_keywords = set()
+
+        for resume in all_resumes:
+            search_text = resume.get('extracted_text') or ''
+            fields = {
+                'skills': resume.get('skills') or '',
+                'experience': resume.get('experience') or '',
+                'body': search_text
+            }
+            doc_postings, _ = build_postings(fields)
+            if not plan.matches(doc_postings):
+                continue
+
+            token_counts = plan.literal_counts(doc_postings)
+            counts = []
+            for literal, token_count in zip(plan.literals, token_counts):
+                count = 0
+                if literal.slop is None:
+                    scoped_text = fields[literal.field] if literal.field else search_text
+                    count = len(self.count_literal(scoped_text, literal.text))
+                # tokenisasi bisa cocok walau teks mentah beda spasi/tanda baca
+                counts.append(count or token_count)
+            if not plan.literals:
+                counts = token_counts
+
+            for label, count in zip(ranking.keywords, counts):
+                if count:
+                    found_keywords.add(label)
+            ranking.add_exact(resume['id'], counts)
+
+        return found_keywords
+
+    def count_literal(self, text, pattern):
+        """Match positions of one pattern with the selected exact algorithm"""
+        if not text:
+            return []
+        if self.method == "KMP":
+            return kmp_search(text, pattern)
+        elif self.method == "BM":
+            return bm_search(text, pattern)
+        elif self.method == "AC":
+            return [pos for pos, _ in ac_search(text, [pattern])]
+        return []
+
+    def perform_fuzzy_search(self, all_resumes, missing_keywords, ranking):
+        """Perform fuzzy matching using Levenshtein Distance, scores go into ranking"""
+        threshold = self.settings.get('fuzzy_threshold', 60)
+        high_similarity = self.settings.get('high_similarity_threshold', 70)
+        for resume in all_resumes:
+            search_text = resume.get('content', '') or resume.get('extracted_text', '')
+            if not search_text:
+                continue
+
+            counts = []
+            for keyword in missing_keywords:
+                fuzzy_matches = fuzzy_search(search_text, keyword, threshold=threshold)
+                high_sim_matches = [m for m in fuzzy_matches if m[2] >= high_similarity] if fuzzy_matches else []
+                counts.append(len(high_sim_matches))
+
+            ranking.add_fuzzy(resume['id'], counts)
+
+    def score_bm25(self, keywords, resume_ids):
+        """BM25F over the stored postings of the query terms, only for resumes that matched"""
+        terms = query_terms(keywords)
+        stats = self.source.get_term_statistics(terms)
+        scorer = BM25Scorer(
+            stats['total_docs'], stats['avg_lengths'], stats['doc_freqs'],
+            k1=self.settings.get('bm25_k1', 1.2),
+            b=self.settings.get('bm25_b', 0.75),
+            boosts=self.settings.get('field_boosts')
+        )
+        postings = self.source.get_term_postings(terms, resume_ids=resume_ids)
+        doc_lengths = self.source.get_field_lengths({resume_id for _, _, resume_id, _ in postings})
+        return scorer.score(postings, doc_lengths)
+
+    def emit_partial(self, ranking):
+        """Send provisional top-k to on_partial, throttled, only when the ranking changed"""
+        if not self.progressive or self.cancel_token.is_cancelled:
+            return
+        now = time.time()
+        interval = self.settings.get('progressive_interval_ms', 150) / 1000
+        # emit pertama langsung, berikutnya dibatasi interval
+        if self._last_partial_key is not None and now - self._last_partial_time < interval:
+            return
+
+        top_records = ranking.top(self.top_matches)
+        key = tuple((record.resume_id, record.matches) for record in top_records)
+        if key == self._last_partial_key:
+            return
+        provisional = [ranking.materialize(record) for record in top_records]
+        tracing.count("partial_emits")
+
+        # koneksi utama sedang streaming (unbuffered), metadata lewat source kedua
+        if self._metadata_source is None:
+            self._metadata_source = self.metadata_factory() if self.metadata_factory else self.source
+            if self._metadata_source is None:
+                self.progressive = False
+                return
+        self.attach_metadata(self._metadata_source, provisional)
+
+        self._last_partial_time = now
+        self._last_partial_key = key
+        if self._first_partial_ms is None:
+            self._first_partial_ms = (time.time() - self._start_time) * 1000
+        self.on_partial(provisional)
+
+    def build_display_name(self, metadata, resume_id):
+        """Name shown on the result card: applicant name, else derived from filename"""
+        first_name = metadata.get('first_name')
+        last_name = metadata.get('last_name')
+
+        if first_name and last_name:
+            return f"{first_name} {last_name}"
+        elif first_name:
+            return first_name
+        elif last_name:
+            return last_name
+
+        filename = (metadata.get('filename') or str(resume_id)).replace('.pdf', '')
+        if filename.isdigit():
+            return f"Candidate {filename}"
+        return filename
+
+    def attach_metadata(self, source, results):
+        """Fill name and lean profile data for the results that are actually displayed"""
+        # metadata sudah diambil untuk partial result sebelumnya tidak perlu di-query lagi
+        missing_ids = [result['resume_id'] for result in results if result['resume_id'] not in self._metadata_cache]
+        if missing_ids:
+            self._metadata_cache.update(source.get_resume_metadata(missing_ids))
+
+        for result in results:
+            meta = self._metadata_cache.get(result['resume_id'], {})
+            result['name'] = self.build_display_name(meta, result['resume_id'])
+            result['profile_data'] = {
+                'first_name': meta.get('first_name'),
+                'last_name': meta.get('last_name'),
+                'application_role': meta.get('application_role'),
+                'filename': meta.get('filename'),
+                'category': meta.get('category')
+            }
+
+        return results
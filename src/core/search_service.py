@@ -0,0 +1,303 @@
+"""
+HTTP/JSON search service (asyncio, tanpa dependency tambahan).
+
+    GET  /health
+    GET  /stats
+    GET  /resume/<id>
+    GET  /search?keywords=python,sql&method=KMP&top_k=5
+    POST /search  {"keywords": "python, sql", "method": "KMP", "top_k": 5}
+
+Corpus/index dimuat sekali per worker process dan tetap di memory; matching (CPU-bound)
+jalan di process pool, event loop hanya parsing HTTP. Jumlah search yang berjalan dibatasi
+semaphore, antrian yang terlalu panjang ditolak dengan 503. HTTP/1.1 keep-alive didukung.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from config import SERVICE_SETTINGS
+from core.batch_search import _init_worker, open_source, run_query, worker_ready
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"
+}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class SearchService:
+    def __init__(self, spec, settings=None):
+        self.spec = spec
+        self.settings = dict(SERVICE_SETTINGS)
+        if settings:
+            self.settings.update(settings)
+        self.source = None
+        self.pool = None
+        # source lokal (resume/stats) tidak thread-safe untuk DatabaseManager: satu thread saja
+        self.io_executor = ThreadPoolExecutor(max_workers=1)
+        self.search_slots = None
+        self.server = None
+        self.waiting = 0
+        self.in_flight = 0
+        self.stats = {'requests': 0, 'searches': 0, 'rejected': 0, 'errors': 0, 'search_ms_total': 0.0}
+        self.started_at = None
+
+    # --- lifecycle -------------------------------------------------------------
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self.source = await loop.run_in_executor(self.io_executor, open_source, self.spec)
+        if self.source is None:
+            raise RuntimeError("search source is not available")
+
+        workers = max(1, int(self.settings.get('workers', 2)))
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.spec,)
+        )
+        if self.settings.get('warmup', True):
+            # muat corpus di semua worker sebelum menerima request
+            ready = await asyncio.gather(*(loop.run_in_executor(self.pool, worker_ready) for _ in range(workers)))
+            if not all(ready):
+                raise RuntimeError("search source is not available in worker process")
+
+        self.search_slots = asyncio.Semaphore(max(1, int(self.settings.get('max_concurrent_searches', workers))))
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.settings.get('host', '127.0.0.1'), int(self.settings.get('port', 8765))
+        )
+        self.started_at = time.time()
+        return self.server
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()[:2] if self.server else None
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        host, port = self.address
+        print(f"Search service listening on http://{host}:{port}")
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+        if self.source is not None:
+            self.source.disconnect()
+        self.io_executor.shutdown(wait=False)
+
+    # --- HTTP ----------------------------------------------------------------------
+
+    async def handle_connection(self, reader, writer):
+        keepalive_timeout = self.settings.get('keepalive_timeout', 15)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader), timeout=keepalive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HttpError as e:
+                    await self.write_response(writer, e.status, {'error': e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers, body = request
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+                self.stats['requests'] += 1
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {'error': e.message}
+                except Exception as e:
+                    print(f"Error handling {method} {target}: {e}")
+                    status, payload = 500, {'error': str(e)}
+                if status >= 500:
+                    self.stats['errors'] += 1
+
+                await self.write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def read_request(self, reader):
+        """Returns (method, target, version, headers, body) atau None kalau koneksi ditutup client"""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode('latin-1').strip().split(' ', 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line or line in (b'\r\n', b'\n'):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        body = b''
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > self.settings.get('max_body_bytes', 65536):
+            raise HttpError(413, "Request body too large")
+        if length:
+            body = await reader.readexactly(length)
+        return method.upper(), target, version.upper(), headers, body
+
+    async def write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        head = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + body)
+        await writer.drain()
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/stats':
+            return 200, await self.get_stats()
+        if path.startswith('/resume/'):
+            if method != 'GET':
+                raise HttpError(405, "Use GET")
+            return await self.get_resume(path[len('/resume/'):])
+        if path == '/search':
+            if method == 'GET':
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            elif method == 'POST':
+                try:
+                    params = json.loads(body or b'{}')
+                except (ValueError, UnicodeDecodeError):
+                    raise HttpError(400, "Body must be JSON")
+                if not isinstance(params, dict):
+                    raise HttpError(400, "Body must be a JSON object")
+            else:
+                raise HttpError(405, "Use GET or POST")
+            return await self.search(params)
+        raise HttpError(404, f"Unknown path: {path}")
+
+    # --- endpoints -------------------------------------------------------------------
+
+    async def search(self, params):
+        keywords = str(params.get('keywords') or params.get('q') or '').strip()
+        if not keywords:
+            raise HttpError(400, "Missing 'keywords'")
+        try:
+            top_k = int(params.get('top_k') or self.settings.get('default_top_k', 10))
+        except (TypeError, ValueError):
+            raise HttpError(400, "'top_k' must be an integer")
+        top_k = max(1, min(top_k, self.settings.get('max_top_k', 100)))
+        query = {
+            'id': params.get('id'),
+            'keywords': keywords,
+            'method': params.get('method') or 'KMP',
+            'top_k': top_k
+        }
+
+        # batasi antrian: lebih baik 503 cepat daripada request menunggu tanpa batas
+        if self.waiting >= self.settings.get('max_queued_searches', 32):
+            self.stats['rejected'] += 1
+            raise HttpError(503, "Too many pending searches")
+
+        self.waiting += 1
+        try:
+            await self.search_slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            record = await loop.run_in_executor(self.pool, run_query, query)
+        finally:
+            self.in_flight -= 1
+            self.search_slots.release()
+
+        self.stats['searches'] += 1
+        self.stats['search_ms_total'] += record['latency_ms']
+        if record['error']:
+            # query salah -> 400; source/DB gagal adalah masalah server -> 503 (dengan Retry-After)
+            if record['error_kind'] == 'request':
+                return 400, record
+            return 503, record
+        return 200, record
+
+    async def get_resume(self, raw_id):
+        try:
+            resume_id = int(raw_id)
+        except ValueError:
+            raise HttpError(400, "Resume id must be an integer")
+        loop = asyncio.get_running_loop()
+        resume = await loop.run_in_executor(self.io_executor, self.source.get_resume_by_id, resume_id)
+        if not resume:
+            raise HttpError(404, f"Resume {resume_id} not found")
+        return 200, resume
+
+    async def get_stats(self):
+        loop = asyncio.get_running_loop()
+        corpus = await loop.run_in_executor(self.io_executor, self.source.get_statistics)
+        searches = self.stats['searches']
+        return {
+            'corpus': corpus,
+            'service': {
+                'uptime_seconds': round(time.time() - self.started_at, 1) if self.started_at else 0,
+                'workers': self.settings.get('workers'),
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'requests': self.stats['requests'],
+                'searches': searches,
+                'rejected': self.stats['rejected'],
+                'errors': self.stats['errors'],
+                'avg_search_ms': round(self.stats['search_ms_total'] / searches, 2) if searches else 0.0
+            }
+        }
+
+def run_service(spec, settings=None):
+    """Blocking: jalankan service sampai Ctrl+C"""
+    service = SearchService(spec, settings)
+
+    async def main():
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("Search service stopped")
@@ -0,0 +1,302 @@
+"""
+Instrumentasi ringan berbasis span.
+
+    with start_trace("search", keywords="python") as trace:
+        with span("exact"):
+            ...
+            count("matcher.kmp")
+    trace.phases()      # [(path, depth, ms, calls)] untuk panel timing
+    trace.to_dict()     # record JSONL
+
+Export ke TRACING_SETTINGS['path'] mati secara default; aktifkan lewat config 'enabled' atau
+env var BUKDUR_TRACE=1 (BUKDUR_TRACE=0 mematikan meski config aktif). Pohon span tetap dibangun
+di memory untuk panel timing GUI dan record batch/service.
+
+Span dengan nama sama di bawah parent yang sama digabung (durasi dijumlah, calls bertambah),
+jadi span per chunk tidak membuat trace membengkak. Tanpa trace aktif, span() dan count() no-op.
+State disimpan di contextvars: setiap thread (mis. QThread search) punya trace sendiri.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import fcntl
+except ImportError:  # windows: tidak ada flock, tiap process menulis file sendiri
+    fcntl = None
+
+ENV_VAR = "BUKDUR_TRACE"
+
+_current_span = contextvars.ContextVar("tracing_span", default=None)
+
+_DEFAULT_SETTINGS = {
+    'enabled': False,
+    'path': os.path.join('logs', 'search_trace.jsonl'),
+    'max_bytes': 5 * 1024 * 1024,
+    'backups': 3
+}
+
+def _load_settings():
+    settings = dict(_DEFAULT_SETTINGS)
+    try:
+        from config import TRACING_SETTINGS
+        settings.update(TRACING_SETTINGS)
+    except ImportError:
+        pass
+    if not os.path.isabs(settings['path']):
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        settings['path'] = os.path.join(project_root, settings['path'])
+    return settings
+
+def export_enabled() -> bool:
+    """Env var (kalau di-set) menimpa TRACING_SETTINGS['enabled']"""
+    value = os.environ.get(ENV_VAR)
+    if value is None:
+        return bool(_load_settings().get('enabled', False))
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+class Span:
+    __slots__ = ('name', 'duration_ms', 'calls', 'children', 'counters')
+
+    def __init__(self, name):
+        self.name = name
+        self.duration_ms = 0.0
+        self.calls = 0
+        self.children = {}
+        self.counters = {}
+
+    def child(self, name):
+        span = self.children.get(name)
+        if span is None:
+            span = Span(name)
+            self.children[name] = span
+        return span
+
+    def to_dict(self):
+        result = {'name': self.name, 'ms': round(self.duration_ms, 3), 'calls': self.calls}
+        if self.counters:
+            result['counters'] = dict(self.counters)
+        if self.children:
+            result['children'] = [child.to_dict() for child in self.children.values()]
+        return result
+
+class Trace:
+    """Satu operasi (mis. satu query search) dengan pohon span dan counter"""
+
+    def __init__(self, name, export=True, **attrs):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = attrs
+        self.export = export
+        self.root = Span(name)
+        self.started_at = None
+        self.error = None
+        self._start = None
+        self._token = None
+
+    def __enter__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self.root)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.root.duration_ms += (time.perf_counter() - self._start) * 1000
+        self.root.calls += 1
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        if self.export:
+            export_trace(self)
+        return False
+
+    @property
+    def duration_ms(self):
+        return self.root.duration_ms
+
+    def counters(self) -> dict:
+        """Semua counter dijumlah di seluruh pohon span"""
+        totals = {}
+        stack = [self.root]
+        while stack:
+            span = stack.pop()
+            for name, value in span.counters.items():
+                totals[name] = totals.get(name, 0) + value
+            stack.extend(span.children.values())
+        return totals
+
+    def phases(self, max_depth=2) -> list:
+        """[(path, depth, ms, calls)] depth-first, tanpa root"""
+        rows = []
+
+        def walk(span, prefix, depth):
+            for child in span.children.values():
+                path = f"{prefix}/{child.name}" if prefix else child.name
+                rows.append((path, depth, round(child.duration_ms, 3), child.calls))
+                if depth < max_depth:
+                    walk(child, path, depth + 1)
+
+        walk(self.root, "", 1)
+        return rows
+
+    def to_dict(self) -> dict:
+        record = {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at or time.time())),
+            'duration_ms': round(self.root.duration_ms, 3),
+            'attrs': self.attrs,
+            'spans': [child.to_dict() for child in self.root.children.values()],
+            'counters': self.counters()
+        }
+        if self.error:
+            record['error'] = self.error
+        return record
+
+def format_phases(phases, extra=None) -> str:
+    """
+    Satu baris untuk panel timing dari Trace.phases():
+    "db.connect 12ms · exact 40ms (db.fetch 30ms · match 8ms) · rank 0ms"
+    extra: [(label, ms)] yang ditambahkan di akhir (mis. render di GUI thread).
+    """
+    parts = []
+    for path, depth, ms, calls in phases:
+        name = path.rsplit("/", 1)[-1]
+        if depth == 1:
+            parts.append([f"{name} {ms:.0f}ms", []])
+        elif depth == 2 and parts:
+            parts[-1][1].append(f"{name} {ms:.0f}ms")
+    for label, ms in extra or []:
+        parts.append([f"{label} {ms:.0f}ms", []])
+    return " · ".join(head + (f" ({' · '.join(children)})" if children else "") for head, children in parts)
+
+def start_trace(name, export=True, **attrs) -> Trace:
+    return Trace(name, export=export, **attrs)
+
+def current_span():
+    return _current_span.get()
+
+@contextmanager
+def span(name):
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name)
+    token = _current_span.set(child)
+    start = time.perf_counter()
+    try:
+        yield child
+    finally:
+        child.duration_ms += (time.perf_counter() - start) * 1000
+        child.calls += 1
+        _current_span.reset(token)
+
+def traced(name):
+    """Decorator: seluruh pemanggilan fungsi menjadi satu span"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def add_duration(name, duration_ms, calls=1):
+    """
+    Tambahkan durasi yang diukur sendiri sebagai child span dari span aktif.
+    Dipakai di generator (mis. fetch per chunk) yang tidak bisa membungkus yield dengan span().
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return
+    child = parent.child(name)
+    child.duration_ms += duration_ms
+    child.calls += calls
+
+def count(name, value=1):
+    span = _current_span.get()
+    if span is not None:
+        span.counters[name] = span.counters.get(name, 0) + value
+
+class TraceWriter:
+    """
+    JSONL append dengan rotasi ukuran: path, path.1 ... path.<backups>.
+    Worker batch / service (process lain) menulis ke file yang sama, jadi cek ukuran + rotasi + append
+    dilakukan di bawah flock pada path.lock. Tanpa fcntl, setiap process memakai file path.<pid>.
+    """
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backups=3):
+        if fcntl is None:
+            root, ext = os.path.splitext(path)
+            path = f"{root}.{os.getpid()}{ext}"
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _process_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def write(self, record):
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._process_lock():
+                if self.max_bytes and os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    self._rotate()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_writer():
+    """TraceWriter dari config, None kalau tracing dimatikan"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            settings = _load_settings()
+            if not export_enabled():
+                _writer = False
+            else:
+                _writer = TraceWriter(settings['path'], settings.get('max_bytes'), settings.get('backups', 3))
+        return _writer or None
+
+def export_trace(trace):
+    writer = get_writer()
+    if writer is None:
+        return
+    try:
+        writer.write(trace.to_dict())
+    except OSError as e:
+        print(f"Warning: could not write trace: {e}")
@@ -4,10 +4,14 @@ import logging
 import sys, os
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from collections import OrderedDict
 import json
+import re
+import threading
+import time
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from config import DATABASE_CONFIG, ENCRYPTION_SETTINGS
+from config import DATABASE_CONFIG, ENCRYPTION_SETTINGS, SEARCH_SETTINGS
 
 #  custom encryption
 try:
@@ -17,7 +21,7 @@ try:
     
     if ENCRYPTION_ENABLED:
         master_key = ENCRYPTION_SETTINGS.get('master_key', 'BukitDuri2024')
-        encryption_engine = AdvancedEncryption(master_key)
+        encryption_engine = AdvancedEncryption(master_key, ENCRYPTION_SETTINGS.get('key_id', 1))
         print("✓ Encryption engine loaded and enabled")
     else:
         print("Encryption is disabled in config")
@@ -27,6 +31,201 @@ except ImportError:
     ENCRYPTION_ENABLED = False
     ENCRYPTED_FIELDS = []
 
+from encryption.blind_index import BlindIndexer
+from core.scoring import build_postings
+from core import tracing
+from core.name_index import canonical_tokens, match_name, name_keys, query_keys
+
+# tipe kolom untuk field terenkripsi: envelope biner, bukan hex string
+ENCRYPTED_COLUMN_TYPES = {
+    'first_name': 'VARBINARY(255)',
+    'last_name': 'VARBINARY(255)',
+    'address': 'VARBINARY(1024)',
+    'phone_number': 'VARBINARY(255)'
+}
+
+def profile_column_type(field, plain_type):
+    """Tipe kolom profil: VARBINARY untuk field yang dienkripsi, plain_type selain itu"""
+    if ENCRYPTION_ENABLED and field in ENCRYPTED_FIELDS:
+        return ENCRYPTED_COLUMN_TYPES.get(field, plain_type)
+    return plain_type
+
+def _stored_value_key(value):
+    """Nilai dari kolom VARBINARY datang sebagai bytearray (tidak hashable)"""
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    return value
+
+def _as_text(value):
+    """Plaintext yang tersimpan di kolom biner dikembalikan sebagai str"""
+    if isinstance(value, bytes):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return value.hex()
+    return value
+
+# kolom nama yang punya blind index (name_blind_index table)
+BLIND_INDEX_FIELDS = ('first_name', 'last_name')
+BLIND_INDEX_OWNERS = {'resumes': 'id', 'ApplicantProfile': 'applicant_id'}
+blind_indexer = BlindIndexer(
+    ENCRYPTION_SETTINGS.get('blind_index_key') or ENCRYPTION_SETTINGS.get('master_key', 'BukitDuri2024'),
+    ENCRYPTION_SETTINGS.get('blind_index_prefix_min', 2)
+)
+
+# default innodb_ft_min_token_size dan stopword list InnoDB; token seperti ini tidak masuk index
+FULLTEXT_MIN_TOKEN_SIZE = 3
+FULLTEXT_STOPWORDS = {
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for',
+    'from', 'how', 'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the',
+    'this', 'to', 'was', 'what', 'when', 'where', 'who', 'will', 'with', 'und', 'www'
+}
+
+def build_fulltext_query(keywords: List[str]) -> Optional[str]:
+    """
+    Build a BOOLEAN MODE query (OR of keywords) for the resumes FULLTEXT index.
+    Return None if some keyword cannot be answered by the index (too short, stopword,
+    punctuation), because then the candidate set would miss resumes.
+    The index still only matches whole words and word prefixes ("sql" misses "MySQL"),
+    so the prefilter is opt-in (SEARCH_SETTINGS['fulltext_prefilter']).
+    """
+    terms = []
+    for keyword in keywords:
+        if not re.fullmatch(r'\w+(?:\s+\w+)*', keyword or ''):
+            return None
+        
+        tokens = keyword.lower().split()
+        if any(len(token) < FULLTEXT_MIN_TOKEN_SIZE or token in FULLTEXT_STOPWORDS for token in tokens):
+            return None
+        
+        if len(tokens) == 1:
+            # prefix operator: "develop" juga kena "developer", "development"
+            terms.append(f"{tokens[0]}*")
+        else:
+            terms.append('"' + ' '.join(tokens) + '"')
+    
+    return ' '.join(terms) if terms else None
+
+RESUME_COLUMNS = (
+    'id', 'filename', 'category', 'file_path', 'extracted_text', 'skills', 'experience',
+    'education', 'gpa', 'certifications', 'created_at', 'updated_at', 'applicant_id',
+    'first_name', 'last_name', 'date_of_birth', 'address', 'phone_number', 'application_role'
+)
+
+PROFILE_COLUMNS = OrderedDict([
+    ('first_name', 'ap.first_name'),
+    ('last_name', 'ap.last_name'),
+    ('date_of_birth', 'ap.date_of_birth'),
+    ('address', 'ap.address'),
+    ('phone_number', 'ap.phone_number'),
+    ('application_role', 'ad.application_role'),
+])
+
+# positional postings + panjang field untuk BM25 / structured query; dibuat juga di database lama
+TERM_INDEX_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS resume_terms (
+        term VARCHAR(64) NOT NULL,
+        field VARCHAR(16) NOT NULL,
+        resume_id INT NOT NULL,
+        tf INT NOT NULL,
+        positions MEDIUMTEXT,
+        PRIMARY KEY (term, field, resume_id),
+        INDEX idx_terms_resume (resume_id),
+        FOREIGN KEY (resume_id) REFERENCES resumes(id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resume_lengths (
+        resume_id INT NOT NULL,
+        field VARCHAR(16) NOT NULL,
+        length INT NOT NULL,
+        PRIMARY KEY (resume_id, field),
+        FOREIGN KEY (resume_id) REFERENCES resumes(id) ON DELETE CASCADE
+    )
+    """
+)
+
+class DatabaseStreamError(RuntimeError):
+    """Query gagal di tengah search (stream resume, posting list); hasil parsial tidak boleh dipakai"""
+
+class ResumeLRUCache:
+    """Small thread-safe LRU for full resume rows fetched on demand (summary / view CV)"""
+    
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return dict(self._items[key])
+    
+    def put(self, key, value):
+        if self.maxsize <= 0 or value is None:
+            return
+        with self._lock:
+            self._items[key] = dict(value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+# shared across DatabaseManager instances (CVCard opens a new manager per click)
+resume_cache = ResumeLRUCache(SEARCH_SETTINGS.get('resume_cache_size', 32))
+
+class PlaintextCache:
+    """Size-bounded, TTL-limited cache of decrypted field values keyed by ciphertext"""
+    
+    def __init__(self, maxsize=2048, ttl_seconds=300):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_many(self, ciphertexts):
+        """Return {ciphertext: plaintext} for the entries that are cached and not expired"""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for ciphertext in ciphertexts:
+                entry = self._items.get(ciphertext)
+                if entry is None:
+                    continue
+                plaintext, expires_at = entry
+                if expires_at < now:
+                    del self._items[ciphertext]
+                    continue
+                self._items.move_to_end(ciphertext)
+                found[ciphertext] = plaintext
+        return found
+    
+    def put_many(self, pairs):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for ciphertext, plaintext in pairs.items():
+                self._items[ciphertext] = (plaintext, expires_at)
+                self._items.move_to_end(ciphertext)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+plaintext_cache = PlaintextCache(
+    ENCRYPTION_SETTINGS.get('plaintext_cache_size', 2048),
+    ENCRYPTION_SETTINGS.get('plaintext_cache_ttl', 300)
+)
+
 class DatabaseManager:
     def __init__(self, host=None, user=None, password=None, database=None):
         """Initialize database manager with connection parameters"""
@@ -36,7 +235,9 @@ class DatabaseManager:
         self.password = password or DATABASE_CONFIG['password'] 
         self.database = database or DATABASE_CONFIG['database']
         self.connection = None
+        self._term_index_ready = None  # None = belum dicek untuk koneksi ini
         
+    @tracing.traced("db.connect")
     def connect(self):
         """Establish database connection"""
         try:
@@ -47,6 +248,7 @@ class DatabaseManager:
                 database=self.database,
                 autocommit=True
             )
+            self._term_index_ready = None
             print(f"Connected to MySQL database: {self.database}")
             return True
         except Error as e:
@@ -69,6 +271,9 @@ class DatabaseManager:
             )
             cursor = temp_conn.cursor()
             
+            # ids are reused after a fresh setup, cached rows would be stale
+            resume_cache.clear()
+            
             cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
             cursor.execute(f"USE {self.database}")            
             cursor.execute("""
@@ -109,6 +314,35 @@ class DatabaseManager:
                 )
             """)
             
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_failures (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    filename VARCHAR(255) NOT NULL,
+                    category VARCHAR(100),
+                    file_path VARCHAR(500),
+                    mode VARCHAR(20) NOT NULL,
+                    reason TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    INDEX idx_failure_filename (filename)
+                )
+            """)
+            
+            # positional postings + panjang field untuk BM25 (lihat rebuild_term_index)
+            for statement in TERM_INDEX_TABLES:
+                cursor.execute(statement)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS name_blind_index (
+                    owner_table VARCHAR(32) NOT NULL,
+                    owner_id INT NOT NULL,
+                    field VARCHAR(32) NOT NULL,
+                    kind VARCHAR(16) NOT NULL,
+                    token_hash CHAR(64) NOT NULL,
+                    PRIMARY KEY (owner_table, owner_id, field, kind, token_hash),
+                    INDEX idx_blind_lookup (kind, token_hash)
+                )
+            """)
+            
             temp_conn.commit()
             temp_conn.close()
             print("Database and tables created successfully")
@@ -120,8 +354,14 @@ class DatabaseManager:
     
     def insert_resume(self, filename: str, category: str, file_path: str, 
                      extracted_text: str = "", skills: str = "", experience: str = "",
-                     education: str = "", gpa: float = None, certifications: str = "") -> int:
-        """Insert resume data into database"""
+                     education: str = "", gpa: float = None, certifications: str = "",
+                     index_terms: bool = True) -> int:
+        """
+        Insert resume data into database.
+        index_terms=False: postings tidak ditulis, bangun nanti dengan rebuild_term_index().
+        """
+        # DDL (CREATE TABLE) melakukan implicit commit, jadi dicek sebelum INSERT
+        index_terms = index_terms and self.ensure_term_index()
         try:
             cursor = self.connection.cursor()
             query = """
@@ -133,8 +373,12 @@ class DatabaseManager:
                      experience, education, gpa, certifications)
             
             cursor.execute(query, values)
-            self.connection.commit()
             resume_id = cursor.lastrowid
+            if index_terms:
+                self.index_resume_terms(resume_id, {
+                    'skills': skills, 'experience': experience, 'body': extracted_text
+                }, cursor=cursor)
+            self.connection.commit()
             cursor.close()
             return resume_id
             
@@ -284,6 +528,25 @@ class DatabaseManager:
             print(f"Error inserting search result: {err}")
             return -1
     
+    def insert_ingest_failure(self, filename: str, category: str, file_path: str,
+                              mode: str, reason: str) -> int:
+        """Record a document that timed out or crashed during ingest"""
+        try:
+            cursor = self.connection.cursor()
+            query = """
+                INSERT INTO ingest_failures (filename, category, file_path, mode, reason)
+                VALUES (%s, %s, %s, %s, %s)
+            """
+            cursor.execute(query, (filename, category, file_path, mode, reason))
+            self.connection.commit()
+            failure_id = cursor.lastrowid
+            cursor.close()
+            return failure_id
+            
+        except mysql.connector.Error as err:
+            print(f"Error inserting ingest failure: {err}")
+            return -1
+    
     def get_statistics(self) -> Dict:
         """Get database statistics"""
         try:
@@ -329,16 +592,19 @@ class DatabaseManager:
                                 gpa=None, certifications=None,
                                 applicant_id=None, first_name=None, last_name=None,
                                 date_of_birth=None, address=None, phone_number=None,
-                                application_role=None):
-        """Insert resume dengan enkripsi pada data sensitif"""
+                                application_role=None, index_terms=True):
+        """Insert resume dengan enkripsi pada data sensitif (index_terms seperti insert_resume)"""
+        index_terms = index_terms and self.ensure_term_index()
         try:
             cursor = self.connection.cursor()
             
             # encrypt sensitive data
-            encrypted_first_name = self._encrypt_field('first_name', first_name)
-            encrypted_last_name = self._encrypt_field('last_name', last_name)
-            encrypted_address = self._encrypt_field('address', address)
-            encrypted_phone = self._encrypt_field('phone_number', phone_number)
+            encrypted_first_name, encrypted_last_name, encrypted_address, encrypted_phone = self._encrypt_fields([
+                ('first_name', first_name),
+                ('last_name', last_name),
+                ('address', address),
+                ('phone_number', phone_number)
+            ])
             
             insert_query = """
             INSERT INTO resumes (
@@ -355,9 +621,19 @@ class DatabaseManager:
                 applicant_id, encrypted_first_name, encrypted_last_name, date_of_birth,
                 encrypted_address, encrypted_phone, application_role
             ))
+            resume_id = cursor.lastrowid
+            
+            if index_terms:
+                self.index_resume_terms(resume_id, {
+                    'skills': skills, 'experience': experience, 'body': extracted_text
+                }, cursor=cursor)
+            self.update_blind_index('resumes', resume_id, {
+                'first_name': first_name,
+                'last_name': last_name
+            }, cursor=cursor)
             
             self.connection.commit()
-            return cursor.lastrowid
+            return resume_id
             
         except Exception as e:
             print(f"Error inserting encrypted resume: {e}")
@@ -408,6 +684,7 @@ class DatabaseManager:
             print(f"Error searching resumes with profile: {e}")
             return []
 
+    @tracing.traced("db.get_all_resumes")
     def get_all_resumes(self):
         """Get all resumes with profile data from ApplicationDetail matching"""
         try:
@@ -444,8 +721,306 @@ class DatabaseManager:
             print(f"Error getting all resumes: {e}")
             return []
 
+    def ensure_term_index(self) -> bool:
+        """
+        Buat resume_terms / resume_lengths kalau belum ada (database dari sebelum term index).
+        False kalau tabel tidak bisa dibuat: insert tetap jalan tanpa postings.
+        """
+        if self._term_index_ready is None:
+            try:
+                cursor = self.connection.cursor()
+                for statement in TERM_INDEX_TABLES:
+                    cursor.execute(statement)
+                cursor.close()
+                self._term_index_ready = True
+            except mysql.connector.Error as err:
+                print(f"Term index unavailable, resumes are inserted without postings: {err}")
+                self._term_index_ready = False
+        return self._term_index_ready
+
+    def rebuild_term_index(self, chunk_size: int = 200) -> int:
+        """Index ulang postings semua resume dari tabel resumes, commit per chunk. Returns jumlah resume"""
+        if not self.ensure_term_index():
+            return 0
+        
+        indexed = 0
+        last_id = 0
+        try:
+            cursor = self.connection.cursor()
+            while True:
+                # keyset pagination: cursor buffered, jadi INSERT bisa jalan di koneksi yang sama
+                cursor.execute(
+                    "SELECT id, extracted_text, skills, experience FROM resumes WHERE id > %s ORDER BY id LIMIT %s",
+                    (last_id, chunk_size)
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                for resume_id, extracted_text, skills, experience in rows:
+                    self.index_resume_terms(resume_id, {
+                        'skills': skills, 'experience': experience, 'body': extracted_text
+                    }, cursor=cursor)
+                self.connection.commit()
+                indexed += len(rows)
+                last_id = rows[-1][0]
+            cursor.close()
+            print(f"Term index rebuilt for {indexed} resumes")
+        except mysql.connector.Error as err:
+            print(f"Error rebuilding term index after resume {last_id}: {err}")
+        return indexed
+
+    def index_resume_terms(self, resume_id, field_texts, cursor=None):
+        """Tulis positional postings dan panjang field satu resume (resume_terms / resume_lengths)"""
+        postings, lengths = build_postings(field_texts)
+        
+        own_cursor = cursor is None
+        if own_cursor:
+            cursor = self.connection.cursor()
+        try:
+            cursor.execute("DELETE FROM resume_terms WHERE resume_id = %s", (resume_id,))
+            cursor.execute("DELETE FROM resume_lengths WHERE resume_id = %s", (resume_id,))
+            if postings:
+                cursor.executemany(
+                    "INSERT INTO resume_terms (term, field, resume_id, tf, positions) VALUES (%s, %s, %s, %s, %s)",
+                    [
+                        (term, field, resume_id, len(positions), ','.join(map(str, positions)))
+                        for (term, field), positions in postings.items()
+                    ]
+                )
+            cursor.executemany(
+                "INSERT INTO resume_lengths (resume_id, field, length) VALUES (%s, %s, %s)",
+                [(resume_id, field, length) for field, length in lengths.items()]
+            )
+        finally:
+            if own_cursor:
+                cursor.close()
+
+    @tracing.traced("db.postings")
+    def get_term_postings(self, terms, resume_ids=None, with_positions=False,
+                          id_batch_size: int = 500) -> List[Tuple]:
+        """
+        Posting list untuk terms: [(term, field, resume_id, tf[, positions])].
+        resume_ids dipecah per id_batch_size supaya IN (...) tidak tumbuh seukuran ranking.
+        """
+        if not terms:
+            return []
+        
+        columns = "term, field, resume_id, tf" + (", positions" if with_positions else "")
+        base_query = f"SELECT {columns} FROM resume_terms WHERE term IN ({', '.join(['%s'] * len(terms))})"
+        if resume_ids is None:
+            id_batches = [None]
+        else:
+            resume_ids = sorted(resume_ids)
+            if not resume_ids:
+                return []
+            id_batches = [resume_ids[i:i + id_batch_size] for i in range(0, len(resume_ids), id_batch_size)]
+        
+        rows = []
+        try:
+            cursor = self.connection.cursor()
+            for batch in id_batches:
+                query = base_query
+                params = list(terms)
+                if batch is not None:
+                    query += f" AND resume_id IN ({', '.join(['%s'] * len(batch))})"
+                    params.extend(batch)
+                cursor.execute(query, params)
+                rows.extend(cursor.fetchall())
+            cursor.close()
+            return rows
+        except mysql.connector.Error as err:
+            # [] di sini membuat BM25 diam-diam memberi skor 0 untuk semua resume
+            print(f"Error fetching postings: {err}")
+            raise DatabaseStreamError(f"Error fetching postings: {err}") from err
+
+    @tracing.traced("db.term_stats")
+    def get_term_statistics(self, terms) -> Dict:
+        """Corpus statistics for BM25: document count, average field lengths, document frequency per term"""
+        stats = {'total_docs': 0, 'avg_lengths': {}, 'doc_freqs': {}}
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT COUNT(DISTINCT resume_id) FROM resume_lengths")
+            stats['total_docs'] = cursor.fetchone()[0] or 0
+            cursor.execute("SELECT field, AVG(length) FROM resume_lengths GROUP BY field")
+            stats['avg_lengths'] = {field: float(avg or 0) for field, avg in cursor.fetchall()}
+            if terms:
+                cursor.execute(
+                    f"SELECT term, COUNT(DISTINCT resume_id) FROM resume_terms "
+                    f"WHERE term IN ({', '.join(['%s'] * len(terms))}) GROUP BY term",
+                    list(terms)
+                )
+                stats['doc_freqs'] = {term: df for term, df in cursor.fetchall()}
+            cursor.close()
+        except mysql.connector.Error as err:
+            print(f"Error fetching term statistics: {err}")
+        return stats
+
+    def get_indexed_resume_ids(self) -> List[int]:
+        """Ids of resumes that have postings (universe for NOT queries)"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT DISTINCT resume_id FROM resume_lengths")
+            ids = [row[0] for row in cursor.fetchall()]
+            cursor.close()
+            return ids
+        except mysql.connector.Error as err:
+            print(f"Error fetching indexed resume ids: {err}")
+            return []
+
+    def get_field_lengths(self, resume_ids, id_batch_size: int = 500) -> Dict[int, Dict[str, int]]:
+        """Panjang field per resume; ids dipecah per id_batch_size seperti get_term_postings"""
+        resume_ids = sorted(resume_ids)
+        if not resume_ids:
+            return {}
+        lengths = {}
+        try:
+            cursor = self.connection.cursor()
+            for start in range(0, len(resume_ids), id_batch_size):
+                batch = resume_ids[start:start + id_batch_size]
+                cursor.execute(
+                    f"SELECT resume_id, field, length FROM resume_lengths "
+                    f"WHERE resume_id IN ({', '.join(['%s'] * len(batch))})",
+                    batch
+                )
+                for resume_id, field, length in cursor.fetchall():
+                    lengths.setdefault(resume_id, {})[field] = length
+            cursor.close()
+        except mysql.connector.Error as err:
+            print(f"Error fetching field lengths: {err}")
+        return lengths
+
+    @tracing.traced("db.fulltext")
+    def get_fulltext_candidate_ids(self, keywords: List[str]) -> Optional[set]:
+        """Return ids of resumes the FULLTEXT index matches for any keyword, None if the index can't prefilter"""
+        boolean_query = build_fulltext_query(keywords)
+        if boolean_query is None:
+            return None
+        
+        try:
+            cursor = self.connection.cursor()
+            query = """
+                SELECT id FROM resumes
+                WHERE MATCH(extracted_text, skills, experience, education)
+                AGAINST(%s IN BOOLEAN MODE)
+            """
+            cursor.execute(query, (boolean_query,))
+            candidate_ids = {row[0] for row in cursor.fetchall()}
+            cursor.close()
+            return candidate_ids
+            
+        except mysql.connector.Error as err:
+            print(f"FULLTEXT prefilter unavailable, falling back to full scan: {err}")
+            return None
+
+    def iter_resumes(self, columns: List[str] = None, resume_ids=None,
+                     with_profile: bool = True, chunk_size: int = 200, id_batch_size: int = 500,
+                     profile_columns: List[str] = None):
+        """
+        Stream resumes as chunks (lists of dicts) from an unbuffered cursor.
+        columns: projection of resumes columns (default r.*), resume_ids: optional id filter,
+        profile_columns: projection of joined applicant columns (default all of PROFILE_COLUMNS).
+        Rows arrive while the caller is still processing earlier chunks, and peak memory
+        is bounded by chunk_size instead of the corpus size. The connection can't run
+        other queries until the generator is exhausted or closed.
+        """
+        if columns:
+            unknown = [column for column in columns if column not in RESUME_COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown resume columns: {unknown}")
+            select_list = ", ".join(f"r.{column}" for column in columns)
+        else:
+            select_list = "r.*"
+        
+        join_sql = ""
+        if with_profile:
+            profile_columns = profile_columns or list(PROFILE_COLUMNS)
+            unknown = [column for column in profile_columns if column not in PROFILE_COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown profile columns: {unknown}")
+            select_list += ", " + ", ".join(PROFILE_COLUMNS[column] for column in profile_columns)
+            join_sql = """
+            LEFT JOIN ApplicationDetail ad ON (
+                ad.cv_path LIKE CONCAT('%', r.filename) OR
+                ad.cv_path LIKE CONCAT('%', r.category, '/', r.filename) OR
+                SUBSTRING_INDEX(ad.cv_path, '/', -1) = r.filename
+            )
+            LEFT JOIN ApplicantProfile ap ON ad.applicant_id = ap.applicant_id"""
+        
+        if resume_ids is None:
+            id_batches = [None]
+        else:
+            resume_ids = sorted(resume_ids)
+            id_batches = [resume_ids[i:i + id_batch_size] for i in range(0, len(resume_ids), id_batch_size)]
+        
+        for batch in id_batches:
+            where_sql = ""
+            if batch is not None:
+                where_sql = f"WHERE r.id IN ({', '.join(['%s'] * len(batch))})"
+            
+            query = f"""
+            SELECT {select_list}
+            FROM resumes r{join_sql}
+            {where_sql}
+            ORDER BY r.id
+            """
+            
+            cursor = None
+            try:
+                fetch_start = time.perf_counter()
+                cursor = self.connection.cursor(dictionary=True, buffered=False)
+                cursor.execute(query, batch or ())
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    # generator: durasi dicatat manual di span milik consumer
+                    tracing.add_duration("db.fetch", (time.perf_counter() - fetch_start) * 1000)
+                    if not rows:
+                        break
+                    tracing.count("db.rows", len(rows))
+                    yield rows
+                    fetch_start = time.perf_counter()
+            except mysql.connector.Error as err:
+                # jangan berhenti diam-diam: consumer akan meranking corpus yang terpotong
+                print(f"Error streaming resumes: {err}")
+                raise DatabaseStreamError(f"Error streaming resumes: {err}") from err
+            finally:
+                if cursor is not None:
+                    try:
+                        # drain unread rows if the consumer stopped early
+                        self.connection.consume_results()
+                        cursor.close()
+                    except Exception:
+                        pass
+
+    def get_resumes_by_ids(self, resume_ids) -> List[Dict]:
+        """Get resumes (with profile data) for the given ids only"""
+        return [row for chunk in self.iter_resumes(resume_ids=resume_ids) for row in chunk]
+
+    @tracing.traced("db.metadata")
+    def get_resume_metadata(self, resume_ids) -> Dict[int, Dict]:
+        """Lightweight listing data (no text columns) keyed by resume id"""
+        if not resume_ids:
+            return {}
+        
+        metadata = {}
+        chunks = self.iter_resumes(
+            columns=['id', 'filename', 'category', 'file_path'],
+            resume_ids=resume_ids,
+            profile_columns=['first_name', 'last_name', 'application_role']
+        )
+        for chunk in chunks:
+            for row in chunk:
+                # join bisa menghasilkan lebih dari satu baris per resume, ambil yang pertama
+                metadata.setdefault(row['id'], row)
+        
+        rows = self._decrypt_resumes(list(metadata.values()))
+        return {row['id']: row for row in rows}
+
     def get_resume_by_id(self, resume_id):
         """Get resume by ID with profile data"""
+        cached = resume_cache.get(resume_id)
+        if cached is not None:
+            return cached
+        
         try:
             cursor = self.connection.cursor(dictionary=True)
             
@@ -469,7 +1044,9 @@ class DatabaseManager:
             resume = cursor.fetchone()
             
             if resume:
+                resume = self._decrypt_resume_data(resume)
                 print(f"DEBUG - Resume {resume_id}: {resume['filename']} -> {resume.get('first_name', 'No name')} {resume.get('last_name', '')}")
+                resume_cache.put(resume_id, resume)
             
             return resume
             
@@ -477,6 +1054,211 @@ class DatabaseManager:
             print(f"Error getting resume by ID {resume_id}: {e}")
             return None
         
+    def update_blind_index(self, owner_table, owner_id, names, cursor=None):
+        """
+        Ganti entry blind index untuk satu baris. names: {field: plaintext};
+        hanya field yang ada di dict yang diperbarui.
+        """
+        if owner_table not in BLIND_INDEX_OWNERS:
+            raise ValueError(f"No blind index for table: {owner_table}")
+        
+        fields = [field for field in BLIND_INDEX_FIELDS if field in names]
+        if not fields:
+            return
+        
+        own_cursor = cursor is None
+        if own_cursor:
+            cursor = self.connection.cursor()
+        try:
+            placeholders = ', '.join(['%s'] * len(fields))
+            cursor.execute(
+                f"DELETE FROM name_blind_index WHERE owner_table = %s AND owner_id = %s AND field IN ({placeholders})",
+                [owner_table, owner_id] + fields
+            )
+            rows = [
+                (owner_table, owner_id, field, kind, token_hash)
+                for field in fields
+                for kind, token_hash in sorted(
+                    blind_indexer.entries(names[field]) | blind_indexer.hash_keys(name_keys(names[field]))
+                )
+            ]
+            if rows:
+                cursor.executemany(
+                    "INSERT IGNORE INTO name_blind_index (owner_table, owner_id, field, kind, token_hash) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    rows
+                )
+        finally:
+            if own_cursor:
+                cursor.close()
+
+    def rebuild_blind_index(self, owner_table):
+        """Index ulang semua baris satu tabel (nilai plaintext dipakai apa adanya, ciphertext didekripsi)"""
+        if owner_table not in BLIND_INDEX_OWNERS:
+            raise ValueError(f"No blind index for table: {owner_table}")
+        
+        id_column = BLIND_INDEX_OWNERS[owner_table]
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            cursor.execute(
+                f"SELECT {id_column} AS owner_id, {', '.join(BLIND_INDEX_FIELDS)} FROM {owner_table}"
+            )
+            rows = self._decrypt_resumes(cursor.fetchall())
+            cursor.close()
+            
+            write_cursor = self.connection.cursor()
+            # buang entry baris yang sudah tidak ada (misal setelah seeding ulang)
+            write_cursor.execute("DELETE FROM name_blind_index WHERE owner_table = %s", (owner_table,))
+            for row in rows:
+                self.update_blind_index(
+                    owner_table, row['owner_id'],
+                    {field: row[field] for field in BLIND_INDEX_FIELDS},
+                    cursor=write_cursor
+                )
+            self.connection.commit()
+            write_cursor.close()
+            print(f"Blind index rebuilt for {len(rows)} {owner_table} rows")
+            return len(rows)
+        except mysql.connector.Error as err:
+            print(f"Error rebuilding blind index for {owner_table}: {err}")
+            return 0
+
+    def update_profile_names(self, owner_table, owner_id, first_name=None, last_name=None):
+        """Update (encrypted) first/last name of a resumes or ApplicantProfile row and its blind index"""
+        if owner_table not in BLIND_INDEX_OWNERS:
+            raise ValueError(f"No blind index for table: {owner_table}")
+        
+        names = {}
+        if first_name is not None:
+            names['first_name'] = first_name
+        if last_name is not None:
+            names['last_name'] = last_name
+        if not names:
+            return False
+        
+        try:
+            cursor = self.connection.cursor()
+            encrypted_values = self._encrypt_fields(list(names.items()))
+            assignments = ', '.join(f"{field} = %s" for field in names)
+            cursor.execute(
+                f"UPDATE {owner_table} SET {assignments} WHERE {BLIND_INDEX_OWNERS[owner_table]} = %s",
+                encrypted_values + [owner_id]
+            )
+            self.update_blind_index(owner_table, owner_id, names, cursor=cursor)
+            self.connection.commit()
+            cursor.close()
+            
+            if owner_table == 'resumes':
+                resume_cache.clear()
+            return True
+        except mysql.connector.Error as err:
+            print(f"Error updating names for {owner_table} {owner_id}: {err}")
+            self.connection.rollback()
+            return False
+
+    def search_by_name(self, query: str, prefix: bool = False, limit: int = 50) -> List[Dict]:
+        """
+        Cari nama lewat blind index: setiap token query harus cocok (exact atau prefix)
+        di first_name/last_name. Hanya baris yang cocok yang didekripsi.
+        Returns list of dict dengan 'source' ('resumes' / 'ApplicantProfile') dan 'owner_id'.
+        """
+        hashes = blind_indexer.query_hashes(query, prefix=prefix)
+        if not hashes:
+            return []
+        
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            conditions = ' OR '.join(['(kind = %s AND token_hash = %s)'] * len(hashes))
+            params = [value for pair in hashes for value in pair]
+            cursor.execute(f"""
+                SELECT owner_table, owner_id
+                FROM name_blind_index
+                WHERE {conditions}
+                GROUP BY owner_table, owner_id
+                HAVING COUNT(DISTINCT token_hash) = %s
+                ORDER BY owner_table, owner_id
+                LIMIT %s
+            """, params + [len(hashes), limit])
+            hits = cursor.fetchall()
+            results = self._load_name_hits(cursor, hits)
+            cursor.close()
+            return self._decrypt_resumes(results)
+            
+        except mysql.connector.Error as err:
+            print(f"Error searching by name: {err}")
+            return []
+
+    def search_by_name_tolerant(self, query: str, max_distance: int = 1, phonetic: bool = True,
+                                limit: int = 50) -> List[Dict]:
+        """
+        Name search that ignores leetspeak/case (Moh4mm4d = mohammad) and tolerates small typos.
+        Candidates come from canonical, Soundex and delete-1 keys in the blind index; only those
+        rows are decrypted and verified with Levenshtein distance. Best matches first.
+        """
+        tokens = canonical_tokens(query)
+        if not tokens:
+            return []
+        
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            owners = None
+            for token in tokens:
+                hashes = sorted(blind_indexer.hash_keys(query_keys(token)))
+                conditions = ' OR '.join(['(kind = %s AND token_hash = %s)'] * len(hashes))
+                cursor.execute(
+                    f"SELECT DISTINCT owner_table, owner_id FROM name_blind_index WHERE {conditions}",
+                    [value for pair in hashes for value in pair]
+                )
+                token_owners = {(row['owner_table'], row['owner_id']) for row in cursor.fetchall()}
+                owners = token_owners if owners is None else owners & token_owners
+                if not owners:
+                    cursor.close()
+                    return []
+            
+            hits = [{'owner_table': table, 'owner_id': owner_id} for table, owner_id in sorted(owners)]
+            rows = self._decrypt_resumes(self._load_name_hits(cursor, hits))
+            cursor.close()
+        except mysql.connector.Error as err:
+            print(f"Error searching by name: {err}")
+            return []
+        
+        matches = []
+        for row in rows:
+            distance = match_name(query, [row.get('first_name'), row.get('last_name')], max_distance, phonetic)
+            if distance is not None:
+                row['distance'] = distance
+                matches.append(row)
+        matches.sort(key=lambda row: row['distance'])
+        return matches[:limit]
+
+    def _load_name_hits(self, cursor, hits) -> List[Dict]:
+        """Rows (still encrypted) for blind-index hits [{'owner_table', 'owner_id'}]"""
+        resume_ids = [hit['owner_id'] for hit in hits if hit['owner_table'] == 'resumes']
+        applicant_ids = [hit['owner_id'] for hit in hits if hit['owner_table'] == 'ApplicantProfile']
+        
+        results = []
+        if resume_ids:
+            placeholders = ', '.join(['%s'] * len(resume_ids))
+            cursor.execute(f"""
+                SELECT id AS owner_id, filename, category, file_path,
+                       first_name, last_name, application_role
+                FROM resumes WHERE id IN ({placeholders})
+            """, resume_ids)
+            results.extend(dict(row, source='resumes') for row in cursor.fetchall())
+        
+        if applicant_ids:
+            placeholders = ', '.join(['%s'] * len(applicant_ids))
+            cursor.execute(f"""
+                SELECT ap.applicant_id AS owner_id, ap.first_name, ap.last_name,
+                       ad.application_role, ad.cv_path
+                FROM ApplicantProfile ap
+                LEFT JOIN ApplicationDetail ad ON ad.applicant_id = ap.applicant_id
+                WHERE ap.applicant_id IN ({placeholders})
+            """, applicant_ids)
+            results.extend(dict(row, source='ApplicantProfile') for row in cursor.fetchall())
+        
+        return results
+
     def _encrypt_field(self, field_name, value):
         """Encrypt field jika dalam daftar encrypted fields"""
         if ENCRYPTION_ENABLED and field_name in ENCRYPTED_FIELDS and value:
@@ -486,13 +1268,56 @@ class DatabaseManager:
                 return value
         return value
 
+    def _encrypt_fields(self, field_values):
+        """Encrypt several fields in one engine call, returns values in the same order"""
+        pending = [
+            (index, str(value)) for index, (field_name, value) in enumerate(field_values)
+            if ENCRYPTION_ENABLED and field_name in ENCRYPTED_FIELDS and value
+        ]
+        result = [value for _, value in field_values]
+        if not pending:
+            return result
+        
+        try:
+            encrypted = encryption_engine.encrypt_many([value for _, value in pending])
+        except Exception as e:
+            print(f"Batch encryption failed, storing values as-is: {e}")
+            return result
+        
+        for (index, _), ciphertext in zip(pending, encrypted):
+            result[index] = ciphertext
+        return result
+
+    @tracing.traced("decrypt")
+    def _decrypt_values(self, ciphertexts):
+        """Decrypt ciphertexts via the plaintext cache; returns {ciphertext: plaintext}"""
+        ciphertexts = [_stored_value_key(value) for value in ciphertexts if value]
+        plaintexts = plaintext_cache.get_many(ciphertexts)
+        missing = list(dict.fromkeys(value for value in ciphertexts if value not in plaintexts))
+        tracing.count("decrypt.cache_hits", len(ciphertexts) - len(missing))
+        tracing.count("decrypt.values", len(missing))
+        
+        if missing:
+            try:
+                decrypted = encryption_engine.decrypt_many(missing)
+            except Exception as e:
+                print(f"Batch decryption failed: {e}")
+                decrypted = [None] * len(missing)
+            
+            # gagal decrypt (misal data masih plaintext) -> tampilkan nilai aslinya
+            fresh = {
+                ciphertext: plaintext if plaintext is not None else _as_text(ciphertext)
+                for ciphertext, plaintext in zip(missing, decrypted)
+            }
+            plaintext_cache.put_many(fresh)
+            plaintexts.update(fresh)
+        
+        return plaintexts
+
     def _decrypt_field(self, field_name, value):
         """Decrypt field jika dalam daftar encrypted fields"""
         if ENCRYPTION_ENABLED and field_name in ENCRYPTED_FIELDS and value:
-            try:
-                return encryption_engine.decrypt(str(value))
-            except:
-                return value
+            return self._decrypt_values([value]).get(_stored_value_key(value), value)
         return value
 
     def _encrypt_resume_data(self, resume_data):
@@ -501,21 +1326,39 @@ class DatabaseManager:
             return resume_data
         
         encrypted_data = resume_data.copy()
-        for field in ENCRYPTED_FIELDS:
-            if field in encrypted_data:
-                encrypted_data[field] = self._encrypt_field(field, encrypted_data[field])
+        fields = [field for field in ENCRYPTED_FIELDS if field in encrypted_data]
+        encrypted_values = self._encrypt_fields([(field, encrypted_data[field]) for field in fields])
+        encrypted_data.update(zip(fields, encrypted_values))
         return encrypted_data
 
     def _decrypt_resume_data(self, resume_data):
         """Decrypt sensitive fields dalam resume data"""
         if not ENCRYPTION_ENABLED or not resume_data:
             return resume_data
+        return self._decrypt_resumes([resume_data])[0]
+
+    def _decrypt_resumes(self, resumes):
+        """Decrypt sensitive fields of many rows with a single batch of cipher calls"""
+        if not ENCRYPTION_ENABLED or not resumes:
+            return resumes
+        
+        ciphertexts = [
+            resume[field] for resume in resumes if resume
+            for field in ENCRYPTED_FIELDS if resume.get(field)
+        ]
+        plaintexts = self._decrypt_values(ciphertexts)
         
-        decrypted_data = resume_data.copy()
-        for field in ENCRYPTED_FIELDS:
-            if field in decrypted_data:
-                decrypted_data[field] = self._decrypt_field(field, decrypted_data[field])
-        return decrypted_data
+        decrypted_rows = []
+        for resume in resumes:
+            if not resume:
+                decrypted_rows.append(resume)
+                continue
+            decrypted = resume.copy()
+            for field in ENCRYPTED_FIELDS:
+                if decrypted.get(field):
+                    decrypted[field] = plaintexts.get(_stored_value_key(decrypted[field]), decrypted[field])
+            decrypted_rows.append(decrypted)
+        return decrypted_rows
     
 def get_connection():
     """Legacy function - use DatabaseManager class instead"""
@@ -0,0 +1,65 @@
+# blind_index.py
+"""
+Blind index untuk nama yang dienkripsi.
+Setiap token nama dinormalisasi lalu di-hash dengan HMAC-SHA256 (keyed, deterministic),
+sehingga pencarian exact/prefix bisa dilakukan dengan equality lookup di SQL
+tanpa mendekripsi semua baris.
+"""
+
+import hashlib
+import hmac
+import re
+import unicodedata
+
+KIND_EXACT = "exact"
+KIND_PREFIX = "prefix"
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+def normalize_name(value) -> str:
+    """Lowercase, hilangkan aksen dan tanda baca"""
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return text.lower()
+
+def name_tokens(value) -> list:
+    """Token nama yang sudah dinormalisasi, urutan dipertahankan, tanpa duplikat"""
+    tokens = [token for token in _TOKEN_SPLIT.split(normalize_name(value)) if token]
+    return list(dict.fromkeys(tokens))
+
+class BlindIndexer:
+    def __init__(self, key, prefix_min_length=2):
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+        # pisahkan key HMAC dari master key enkripsi
+        self._key = hashlib.sha256(b"blind-index:" + key).digest()
+        self.prefix_min_length = max(1, int(prefix_min_length))
+
+    def token_hash(self, kind: str, token: str) -> str:
+        message = f"{kind}:{token}".encode("utf-8")
+        return hmac.new(self._key, message, hashlib.sha256).hexdigest()
+
+    def entries(self, value) -> set:
+        """Semua (kind, token_hash) untuk satu nilai nama"""
+        result = set()
+        for token in name_tokens(value):
+            result.add((KIND_EXACT, self.token_hash(KIND_EXACT, token)))
+            for length in range(self.prefix_min_length, len(token) + 1):
+                result.add((KIND_PREFIX, self.token_hash(KIND_PREFIX, token[:length])))
+        return result
+
+    def hash_keys(self, keys) -> set:
+        """Hash (kind, key) plaintext lain, mis. kunci canonical/phonetic dari core.name_index"""
+        return {(kind, self.token_hash(kind, key)) for kind, key in keys}
+
+    def query_hashes(self, query, prefix=False) -> list:
+        """Hash per token query; token lebih pendek dari prefix_min_length tidak bisa dicari sebagai prefix"""
+        kind = KIND_PREFIX if prefix else KIND_EXACT
+        hashes = []
+        for token in name_tokens(query):
+            if prefix and len(token) < self.prefix_min_length:
+                continue
+            hashes.append((kind, self.token_hash(kind, token)))
+        return hashes
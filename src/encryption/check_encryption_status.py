@@ -1,10 +1,18 @@
 # check_encryption_status.py
 import sys
 import os
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append('.')
 
 from src.db.db_connector import DatabaseManager
 from config import ENCRYPTION_SETTINGS
+from encryption_engine import encryption_engine, is_encrypted, ENVELOPE_MAGIC, ENVELOPE_VERSION, ENVELOPE_HEADER_SIZE
+
+AUDIT_TABLES = [('ApplicantProfile', 'applicant_id'), ('resumes', 'id')]
+# prefix envelope versi sekarang sebagai literal hex SQL, misal 0x424402
+ENVELOPE_PREFIX_SQL = '0x' + (ENVELOPE_MAGIC + bytes((ENVELOPE_VERSION,))).hex()
 
 def check_current_encryption_status():
     print("=== CHECKING DATABASE ENCRYPTION STATUS ===")
@@ -45,17 +53,13 @@ def check_current_encryption_status():
             for field in fields_to_check:
                 value = resume.get(field)
                 if value:
-                    # Check if looks encrypted (hex string > 50 chars)
-                    is_hex = all(c in '0123456789abcdefABCDEF' for c in str(value))
-                    is_long = len(str(value)) > 50
-                    
-                    if is_hex and is_long:
-                        print(f"  {field}: 🔒 ENCRYPTED ({len(value)} chars)")
+                    # envelope header
+                    if is_encrypted(value):
+                        print(f"  {field}: 🔒 ENCRYPTED ({len(value)} bytes)")
                         encrypted_count += 1
                         
                         # Try decrypt for verification
                         try:
-                            from encryption_engine import encryption_engine
                             decrypted = encryption_engine.decrypt(value)
                             print(f"  Decrypted: '{decrypted}'")
                         except Exception as e:
@@ -82,5 +86,173 @@ def check_current_encryption_status():
     finally:
         db.disconnect()
 
+def _classify_sql(field):
+    """Ekspresi SQL: 'envelope', 'legacy', 'plain' atau NULL untuk satu kolom"""
+    return f"""
+        CASE
+            WHEN {field} IS NULL OR LENGTH({field}) = 0 THEN NULL
+            WHEN LENGTH({field}) >= {ENVELOPE_HEADER_SIZE}
+                 AND SUBSTRING(CAST({field} AS BINARY), 1, 3) = {ENVELOPE_PREFIX_SQL} THEN 'envelope'
+            WHEN LENGTH({field}) >= 32 AND LENGTH({field}) % 2 = 0
+                 AND UNHEX({field}) IS NOT NULL THEN 'legacy'
+            ELSE 'plain'
+        END"""
+
+def is_mariadb(cursor):
+    cursor.execute("SELECT VERSION()")
+    return 'mariadb' in str(cursor.fetchone()[0]).lower()
+
+def _time_limited(select_sql, timeout_ms, mariadb):
+    """
+    Batas waktu per query: MariaDB mengabaikan hint MAX_EXECUTION_TIME milik MySQL,
+    jadi di MariaDB pakai SET STATEMENT max_statement_time (detik) FOR ...
+    """
+    if mariadb:
+        return f"SET STATEMENT max_statement_time={timeout_ms / 1000:g} FOR {select_sql}"
+    return select_sql.replace("SELECT ", f"SELECT /*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */ ", 1)
+
+def _audit_range(table, id_column, fields, start_id, end_id, max_ids, timeout_ms, mariadb=True):
+    """Hitung per kolom untuk satu range primary key, dijalankan di koneksi sendiri"""
+    db = DatabaseManager()
+    if not db.connect():
+        raise RuntimeError(f"could not connect for {table} range {start_id}-{end_id}")
+    
+    try:
+        cursor = db.connection.cursor()
+        counts = {}
+        bad_ids = {}
+        
+        sums = ', '.join(
+            f"SUM(({_classify_sql(field)}) = '{kind}')"
+            for field in fields for kind in ('envelope', 'legacy', 'plain')
+        )
+        cursor.execute(
+            _time_limited(f"SELECT COUNT(*), {sums} FROM {table} WHERE {id_column} BETWEEN %s AND %s",
+                          timeout_ms, mariadb),
+            (start_id, end_id)
+        )
+        row = cursor.fetchone()
+        total = row[0] or 0
+        values = [int(value or 0) for value in row[1:]]
+        for index, field in enumerate(fields):
+            envelope, legacy, plain = values[index * 3:index * 3 + 3]
+            counts[field] = {'envelope': envelope, 'legacy': legacy, 'plain': plain}
+            
+            if max_ids and (legacy or plain):
+                cursor.execute(
+                    _time_limited(
+                        f"SELECT {id_column} FROM {table} "
+                        f"WHERE {id_column} BETWEEN %s AND %s AND ({_classify_sql(field)}) IN ('legacy', 'plain') "
+                        f"ORDER BY {id_column} LIMIT %s",
+                        timeout_ms, mariadb
+                    ),
+                    (start_id, end_id, max_ids)
+                )
+                bad_ids[field] = [r[0] for r in cursor.fetchall()]
+        
+        cursor.close()
+        return total, counts, bad_ids
+    finally:
+        db.disconnect()
+
+def audit_encryption(workers=4, chunk_size=50000, max_ids=20, timeout_ms=60000):
+    """
+    Audit seluruh tabel: jumlah envelope / legacy hex / plaintext per kolom, dihitung di server.
+    Tabel dipecah menjadi range primary key yang diaudit paralel, masing-masing dengan batas waktu query.
+    Coverage hanya menghitung envelope: legacy v1 tidak bisa didekripsi dan masih perlu dimigrasi.
+    """
+    print("=== FULL ENCRYPTION AUDIT ===")
+    fields = ENCRYPTION_SETTINGS.get('encrypt_fields', [])
+    
+    db = DatabaseManager()
+    if not db.connect():
+        print("❌ Failed to connect to database")
+        return None
+    
+    ranges = []
+    try:
+        cursor = db.connection.cursor()
+        mariadb = is_mariadb(cursor)
+        for table, id_column in AUDIT_TABLES:
+            cursor.execute(f"SELECT MIN({id_column}), MAX({id_column}) FROM {table}")
+            min_id, max_id = cursor.fetchone()
+            if min_id is None:
+                continue
+            for start_id in range(min_id, max_id + 1, chunk_size):
+                ranges.append((table, id_column, start_id, min(start_id + chunk_size - 1, max_id)))
+        cursor.close()
+    finally:
+        db.disconnect()
+    
+    print(f"Auditing {len(ranges)} id ranges with {workers} workers (fields: {fields})")
+    start_time = time.time()
+    
+    report = {
+        table: {
+            'rows': 0,
+            'fields': {field: {'envelope': 0, 'legacy': 0, 'plain': 0, 'non_conforming_ids': []} for field in fields}
+        }
+        for table, _ in AUDIT_TABLES
+    }
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            (table, pool.submit(_audit_range, table, id_column, fields, start_id, end_id, max_ids, timeout_ms, mariadb))
+            for table, id_column, start_id, end_id in ranges
+        ]
+        for table, future in futures:
+            try:
+                total, counts, bad_ids = future.result()
+            except Exception as e:
+                print(f"❌ Audit range failed for {table}: {e}")
+                report[table]['incomplete'] = True
+                continue
+            
+            report[table]['rows'] += total
+            for field in fields:
+                field_report = report[table]['fields'][field]
+                for kind in ('envelope', 'legacy', 'plain'):
+                    field_report[kind] += counts[field][kind]
+                remaining = max_ids - len(field_report['non_conforming_ids'])
+                if remaining > 0:
+                    field_report['non_conforming_ids'].extend(bad_ids.get(field, [])[:remaining])
+    
+    for table, table_report in report.items():
+        suffix = " (INCOMPLETE)" if table_report.get('incomplete') else ""
+        print(f"\n--- {table}: {table_report['rows']} rows{suffix} ---")
+        for field, field_report in table_report['fields'].items():
+            non_null = field_report['envelope'] + field_report['legacy'] + field_report['plain']
+            coverage = field_report['envelope'] / non_null * 100 if non_null else 100.0
+            field_report['coverage'] = coverage
+            print(f"  {field}: {coverage:.1f}% encrypted "
+                  f"(envelope {field_report['envelope']}, plain {field_report['plain']})")
+            if field_report['legacy']:
+                print(f"    ❌ legacy v1 (undecryptable, run encrypt_existing_data.py --legacy-v1): "
+                      f"{field_report['legacy']}")
+            if field_report['non_conforming_ids']:
+                print(f"    non-conforming ids: {field_report['non_conforming_ids']}")
+    
+    print(f"\nAudit finished in {time.time() - start_time:.2f}s")
+    return report
+
 if __name__ == "__main__":
-    check_current_encryption_status()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Check encryption status of profile columns")
+    parser.add_argument("--audit", action="store_true", help="audit every row server-side instead of sampling")
+    parser.add_argument("--workers", type=int, default=4, help="parallel range queries for --audit")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="primary key range size for --audit")
+    parser.add_argument("--max-ids", type=int, default=20, help="non-conforming ids to list per column")
+    parser.add_argument("--timeout-ms", type=int, default=60000, help="per-range query time limit")
+    args = parser.parse_args()
+    
+    if args.audit:
+        report = audit_encryption(args.workers, args.chunk_size, args.max_ids, args.timeout_ms)
+        complete = report is not None and all(
+            not table_report.get('incomplete') and all(
+                field_report['legacy'] == 0 and field_report['plain'] == 0
+                for field_report in table_report['fields'].values()
+            )
+            for table_report in report.values()
+        )
+        sys.exit(0 if complete else 1)
+    else:
+        check_current_encryption_status()
\ No newline at end of file
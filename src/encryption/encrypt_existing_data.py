@@ -3,11 +3,206 @@ import sys
 import os
 sys.path.append('.')
 
+import argparse
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from src.db.db_connector import DatabaseManager
 from config import ENCRYPTION_SETTINGS
-from encryption_engine import encryption_engine
+from encryption_engine import encryption_engine, AdvancedEncryption, is_encrypted, looks_like_legacy
+
+# (table, primary key) yang punya kolom sensitif
+REENCRYPT_TABLES = [('ApplicantProfile', 'applicant_id'), ('resumes', 'id')]
+NAME_FIELDS = ('first_name', 'last_name')
+
+_old_engine = None
+_new_engine = None
+_legacy_v1 = False
+
+def key_fingerprint(key) -> str:
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]
+
+def _init_worker(old_engine, new_engine, legacy_v1=False):
+    """Engine (picklable, tanpa state RNG global) dikirim sekali per worker process"""
+    global _old_engine, _new_engine, _legacy_v1
+    _old_engine = old_engine
+    _new_engine = new_engine
+    _legacy_v1 = legacy_v1
+
+def _reencrypt_chunk(rows, fields):
+    """
+    rows: [(row_id, {field: stored value})]
+    Returns (updates, names, failed, skipped): updates = [(row_id, {field: new value})] hanya untuk baris yang berubah,
+    names = [(row_id, {first_name, last_name plaintext})] untuk blind index, failed = jumlah nilai yang gagal
+    didekripsi/di-decode, skipped = nilai mirip ciphertext versi 1 yang dibiarkan karena --legacy-v1 tidak dipakai.
+    """
+    updates = []
+    names = []
+    failed = 0
+    skipped = 0
+    
+    for row_id, values in rows:
+        new_values = dict(values)
+        plain_names = {}
+        changed = False
+        
+        for field in fields:
+            value = values.get(field)
+            if not value:
+                continue
+            
+            if is_encrypted(value):
+                if AdvancedEncryption.envelope_key_id(value) == _new_engine.key_id:
+                    # sudah envelope dengan key yang sekarang
+                    plaintext = _new_engine.decrypt(value)
+                    if field in NAME_FIELDS and plaintext is not None:
+                        plain_names[field] = plaintext
+                    continue
+                # envelope key lama -> decrypt lalu tulis ulang sebagai envelope baru
+                plaintext = (_old_engine or _new_engine).decrypt(value)
+                if plaintext is None:
+                    failed += 1
+                    continue
+            elif looks_like_legacy(value):
+                if not _legacy_v1:
+                    # mungkin ciphertext versi 1: jangan dienkripsi ulang sebagai plaintext (data asli hilang)
+                    skipped += 1
+                    continue
+                # migrasi eksplisit hex versi 1; yang tidak bisa didekripsi dibiarkan dan dihitung gagal
+                plaintext = (_old_engine or _new_engine).decrypt_legacy(value)
+                if plaintext is None:
+                    failed += 1
+                    continue
+            elif isinstance(value, (bytes, bytearray)):
+                # plaintext di kolom VARBINARY; byte non-UTF-8 dibiarkan dan dihitung gagal
+                try:
+                    plaintext = bytes(value).decode('utf-8')
+                except UnicodeDecodeError:
+                    failed += 1
+                    continue
+            else:
+                plaintext = str(value)
+            
+            new_values[field] = _new_engine.encrypt(plaintext)
+            if field in NAME_FIELDS:
+                plain_names[field] = plaintext
+            changed = True
+        
+        if changed:
+            updates.append((row_id, new_values))
+        if plain_names:
+            names.append((row_id, plain_names))
+    
+    return updates, names, failed, skipped
+
+def ensure_checkpoint_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS encryption_checkpoints (
+            job_name VARCHAR(64) NOT NULL,
+            table_name VARCHAR(64) NOT NULL,
+            last_id INT NOT NULL DEFAULT 0,
+            rows_done INT NOT NULL DEFAULT 0,
+            finished TINYINT(1) NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (job_name, table_name)
+        )
+    """)
+
+def load_checkpoint(cursor, job_name, table):
+    cursor.execute(
+        "SELECT last_id, rows_done, finished FROM encryption_checkpoints WHERE job_name = %s AND table_name = %s",
+        (job_name, table)
+    )
+    row = cursor.fetchone()
+    if not row:
+        return 0, 0, False
+    return row[0], row[1], bool(row[2])
+
+def save_checkpoint(cursor, job_name, table, last_id, rows_done, finished=False):
+    cursor.execute("""
+        INSERT INTO encryption_checkpoints (job_name, table_name, last_id, rows_done, finished)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE last_id = VALUES(last_id), rows_done = VALUES(rows_done), finished = VALUES(finished)
+    """, (job_name, table, last_id, rows_done, int(finished)))
 
-def encrypt_existing_database():
+def _read_chunks(cursor, table, id_column, fields, last_id, chunk_size, count):
+    """Keyset pagination: ambil sampai `count` chunk berikutnya setelah last_id"""
+    chunks = []
+    for _ in range(count):
+        cursor.execute(
+            f"SELECT {id_column}, {', '.join(fields)} FROM {table} "
+            f"WHERE {id_column} > %s ORDER BY {id_column} LIMIT %s",
+            (last_id, chunk_size)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        chunks.append([(row[0], dict(zip(fields, row[1:]))) for row in rows])
+        last_id = rows[-1][0]
+        if len(rows) < chunk_size:
+            break
+    return chunks
+
+def reencrypt_table(db, pool, job_name, table, id_column, fields, chunk_size, workers):
+    cursor = db.connection.cursor()
+    last_id, rows_done, finished = load_checkpoint(cursor, job_name, table)
+    if finished:
+        # job selesai sebelumnya: tetap scan baris yang di-insert setelah pass itu
+        print(f"{table}: done up to {id_column} {last_id} ({rows_done} rows), checking newer rows")
+    elif last_id:
+        print(f"{table}: resuming after {id_column} {last_id} ({rows_done} rows done)")
+    
+    updated_total = 0
+    failed_total = 0
+    skipped_total = 0
+    table_start = time.time()
+    
+    while True:
+        chunks = _read_chunks(cursor, table, id_column, fields, last_id, chunk_size, workers)
+        if not chunks:
+            break
+        
+        # encrypt paralel, tulis dan commit berurutan supaya checkpoint selalu valid
+        results = pool.map(_reencrypt_chunk, chunks, [fields] * len(chunks))
+        for chunk, (updates, names, failed, skipped) in zip(chunks, results):
+            chunk_start = time.time()
+            if updates:
+                assignments = ', '.join(f"{field} = %s" for field in fields)
+                cursor.executemany(
+                    f"UPDATE {table} SET {assignments} WHERE {id_column} = %s",
+                    [[values[field] for field in fields] + [row_id] for row_id, values in updates]
+                )
+            for row_id, plain_names in names:
+                db.update_blind_index(table, row_id, plain_names, cursor=cursor)
+            
+            last_id = chunk[-1][0]
+            rows_done += len(chunk)
+            save_checkpoint(cursor, job_name, table, last_id, rows_done)
+            db.connection.commit()
+            
+            updated_total += len(updates)
+            failed_total += failed
+            skipped_total += skipped
+            elapsed = time.time() - table_start
+            rate = rows_done / elapsed if elapsed > 0 else 0
+            print(f"  {table}: {rows_done} rows (+{len(updates)} updated, up to {id_column} {last_id}) "
+                  f"chunk {(time.time() - chunk_start) * 1000:.0f} ms, {rate:.0f} rows/s")
+    
+    save_checkpoint(cursor, job_name, table, last_id, rows_done, finished=True)
+    db.connection.commit()
+    cursor.close()
+    return rows_done, updated_total, failed_total, skipped_total
+
+def encrypt_existing_database(old_key=None, new_key=None, chunk_size=None, workers=None, restart=False,
+                              old_key_id=None, legacy_v1=False):
+    """
+    Enkripsi (atau rotasi key) semua kolom sensitif secara bertahap.
+    Commit per chunk dengan checkpoint, jadi job yang terhenti bisa dilanjutkan dengan perintah yang sama.
+    old_key: master key lama untuk rotasi; None = hanya enkripsi nilai yang masih plaintext.
+    legacy_v1: nilai hex tanpa header didekripsi sebagai ciphertext versi 1 (best effort);
+    tanpa flag ini nilai tersebut dilewati (tidak dienkripsi ulang) dan dilaporkan di akhir.
+    """
     print("=== ENCRYPTING EXISTING DATABASE ===")
     
     if not ENCRYPTION_SETTINGS.get('enabled', False):
@@ -15,117 +210,77 @@ def encrypt_existing_database():
         print("Please set ENCRYPTION_SETTINGS['enabled'] = True first!")
         return False
     
+    new_key = new_key or ENCRYPTION_SETTINGS.get('master_key', 'BukitDuri2024')
+    chunk_size = chunk_size or ENCRYPTION_SETTINGS.get('reencrypt_chunk_size', 500)
+    workers = workers or ENCRYPTION_SETTINGS.get('reencrypt_workers', 2)
+    fields = ENCRYPTION_SETTINGS.get('encrypt_fields', [])
+    
+    new_key_id = ENCRYPTION_SETTINGS.get('key_id', 1)
+    if old_key == new_key:
+        old_key = None
+    if old_key:
+        old_key_id = old_key_id if old_key_id is not None else new_key_id - 1
+        if old_key_id % 256 == new_key_id % 256:
+            print("❌ Old and new key must have different key ids (ENCRYPTION_SETTINGS['key_id'])")
+            return False
+
+        job_name = f"rotate:{key_fingerprint(old_key)}>{key_fingerprint(new_key)}:k{new_key_id}"
+    else:
+        job_name = f"encrypt:{key_fingerprint(new_key)}:k{new_key_id}"
+    if legacy_v1:
+        job_name += ":v1"
+    
+    new_engine = AdvancedEncryption(new_key, new_key_id)
+    old_engine = AdvancedEncryption(old_key, old_key_id) if old_key else None
+    
+    print(f"Fields to encrypt: {fields}")
+    print(f"Job: {job_name} (chunk size {chunk_size}, {workers} workers)")
+    
     # Connect to database
     db = DatabaseManager()
     if not db.connect():
         print("❌ Failed to connect to database")
         return False
     
+    # satu transaksi per chunk, bukan satu transaksi untuk seluruh tabel
+    db.connection.autocommit = False
+    
     try:
-        cursor = db.connection.cursor(dictionary=True)
-        fields_to_encrypt = ENCRYPTION_SETTINGS.get('encrypt_fields', [])
-        
-        print(f"Fields to encrypt: {fields_to_encrypt}")
-        total_encrypted = 0
-        
-        # 1. Encrypt ApplicantProfile table
-        print("\n=== ENCRYPTING ApplicantProfile TABLE ===")
-        cursor.execute("SELECT * FROM ApplicantProfile")
-        profiles = cursor.fetchall()
-        
-        print(f"Found {len(profiles)} profiles to encrypt")
-        
-        for profile in profiles:
-            applicant_id = profile['applicant_id']
-            updates = []
-            values = []
-            
-            print(f"Processing ApplicantProfile ID {applicant_id}...")
-            
-            for field in fields_to_encrypt:
-                if field in profile and profile[field]:
-                    original_value = profile[field]
-                    
-                    # Check if already encrypted
-                    is_hex = all(c in '0123456789abcdefABCDEF' for c in str(original_value))
-                    is_long = len(str(original_value)) > 50
-                    
-                    if not (is_hex and is_long):  # Not encrypted yet
-                        # Encrypt the value
-                        encrypted_value = encryption_engine.encrypt(str(original_value))
-                        updates.append(f"{field} = %s")
-                        values.append(encrypted_value)
-                        
-                        print(f"  {field}: '{original_value}' -> ENCRYPTED ({len(encrypted_value)} chars)")
-                    else:
-                        print(f"  {field}: Already encrypted")
-            
-            if updates:
-                # Update the record
-                update_query = f"UPDATE ApplicantProfile SET {', '.join(updates)} WHERE applicant_id = %s"
-                values.append(applicant_id)
-                
-                cursor.execute(update_query, values)
-                total_encrypted += 1
-                print(f"  ✓ Updated ApplicantProfile {applicant_id}")
-            else:
-                print(f"  ✓ No updates needed for ApplicantProfile {applicant_id}")
+        cursor = db.connection.cursor()
+        ensure_checkpoint_table(cursor)
+        if restart:
+            cursor.execute("DELETE FROM encryption_checkpoints WHERE job_name = %s", (job_name,))
+        db.connection.commit()
+        cursor.close()
         
-        # 2. Encrypt resumes table
-        print("\n=== ENCRYPTING RESUMES TABLE ===")
-        cursor.execute("""
-            SELECT id, first_name, last_name, address, phone_number 
-            FROM resumes 
-            WHERE (first_name IS NOT NULL OR last_name IS NOT NULL 
-                   OR address IS NOT NULL OR phone_number IS NOT NULL)
-        """)
-        resumes = cursor.fetchall()
+        start_time = time.time()
+        total_rows = total_updated = total_failed = total_skipped = 0
         
-        print(f"Found {len(resumes)} resumes with profile data to encrypt")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(old_engine, new_engine, legacy_v1)) as pool:
+            for table, id_column in REENCRYPT_TABLES:
+                print(f"\n=== ENCRYPTING {table} TABLE ===")
+                rows, updated, failed, skipped = reencrypt_table(
+                    db, pool, job_name, table, id_column, fields, chunk_size, workers
+                )
+                total_rows += rows
+                total_updated += updated
+                total_failed += failed
+                total_skipped += skipped
         
-        for resume in resumes:
-            resume_id = resume['id']
-            updates = []
-            values = []
-            
-            print(f"Processing resume ID {resume_id}...")
-            
-            for field in fields_to_encrypt:
-                if field in resume and resume[field]:
-                    original_value = resume[field]
-                    
-                    # Check if already encrypted
-                    is_hex = all(c in '0123456789abcdefABCDEF' for c in str(original_value))
-                    is_long = len(str(original_value)) > 50
-                    
-                    if not (is_hex and is_long):  # Not encrypted yet
-                        # Encrypt the value
-                        encrypted_value = encryption_engine.encrypt(str(original_value))
-                        updates.append(f"{field} = %s")
-                        values.append(encrypted_value)
-                        
-                        print(f"  {field}: '{original_value}' -> ENCRYPTED ({len(encrypted_value)} chars)")
-                    else:
-                        print(f"  {field}: Already encrypted")
-            
-            if updates:
-                # Update the record
-                update_query = f"UPDATE resumes SET {', '.join(updates)} WHERE id = %s"
-                values.append(resume_id)
-                
-                cursor.execute(update_query, values)
-                total_encrypted += 1
-                print(f"  ✓ Updated resume {resume_id}")
-            else:
-                print(f"  ✓ No updates needed for resume {resume_id}")
-        
-        # Commit all changes
-        db.connection.commit()
-        print(f"\n✅ Encryption completed! Updated {total_encrypted} records total")
+        elapsed = time.time() - start_time
+        print(f"\n✅ Encryption completed! {total_updated} of {total_rows} rows updated in {elapsed:.1f}s "
+              f"({total_rows / elapsed if elapsed > 0 else 0:.0f} rows/s)")
+        if total_failed:
+            print(f"⚠️ {total_failed} values could not be decrypted or decoded and were left unchanged")
+        if total_skipped:
+            print(f"⚠️ {total_skipped} values look like version 1 ciphertext and were left unchanged; "
+                  f"run again with --legacy-v1 to migrate them")
         
         return True
         
     except Exception as e:
+        # chunk yang sudah di-commit tetap aman, jalankan ulang untuk melanjutkan
         print(f"❌ Error during encryption: {e}")
         db.connection.rollback()
         return False
@@ -155,12 +310,12 @@ def verify_encryption():
             for field in fields_to_check:
                 if field in profile and profile[field]:
                     value = profile[field]
-                    is_encrypted = len(str(value)) > 50 and all(c in '0123456789abcdefABCDEF' for c in str(value))
-                    status = "🔒 ENCRYPTED" if is_encrypted else "🔓 PLAIN"
+                    is_encrypted_value = is_encrypted(value)
+                    status = "🔒 ENCRYPTED" if is_encrypted_value else "🔓 PLAIN"
                     print(f"  {field}: {status}")
                     
                     # Try to decrypt if encrypted
-                    if is_encrypted:
+                    if is_encrypted_value:
                         try:
                             decrypted = encryption_engine.decrypt(value)
                             print(f"    Decrypted: '{decrypted}'")
@@ -177,12 +332,12 @@ def verify_encryption():
             for field in fields_to_check:
                 if field in resume and resume[field]:
                     value = resume[field]
-                    is_encrypted = len(str(value)) > 50 and all(c in '0123456789abcdefABCDEF' for c in str(value))
-                    status = "🔒 ENCRYPTED" if is_encrypted else "🔓 PLAIN"
+                    is_encrypted_value = is_encrypted(value)
+                    status = "🔒 ENCRYPTED" if is_encrypted_value else "🔓 PLAIN"
                     print(f"  {field}: {status}")
                     
                     # Try to decrypt if encrypted
-                    if is_encrypted:
+                    if is_encrypted_value:
                         try:
                             decrypted = encryption_engine.decrypt(value)
                             print(f"    Decrypted: '{decrypted}'")
@@ -193,11 +348,28 @@ def verify_encryption():
         db.disconnect()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Encrypt (or re-key) sensitive profile columns in chunks")
+    parser.add_argument("--old-key", help="previous master key, enables key rotation")
+    parser.add_argument("--old-key-id", type=int, help="key id of the previous key (default: key_id - 1)")
+    parser.add_argument("--new-key", help="target master key (default: ENCRYPTION_SETTINGS['master_key'])")
+    parser.add_argument("--chunk-size", type=int, help="rows per chunk/commit")
+    parser.add_argument("--workers", type=int, help="encryption worker processes")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint and start over")
+    parser.add_argument("--legacy-v1", action="store_true",
+                        help="treat header-less hex values as v1 ciphertext and migrate them (best effort); "
+                             "by default every non-envelope value is encrypted as plaintext")
+    parser.add_argument("-y", "--yes", action="store_true", help="do not ask for confirmation")
+    args = parser.parse_args()
+    
     # Confirm before proceeding
-    response = input("This will encrypt all existing profile data in ALL tables. Continue? (y/N): ")
+    response = "y" if args.yes else input("This will encrypt all existing profile data in ALL tables. Continue? (y/N): ")
     if response.lower() == 'y':
-        success = encrypt_existing_database()
+        success = encrypt_existing_database(
+            old_key=args.old_key, old_key_id=args.old_key_id, new_key=args.new_key,
+            chunk_size=args.chunk_size, workers=args.workers, restart=args.restart,
+            legacy_v1=args.legacy_v1
+        )
         if success:
             verify_encryption()
     else:
-        print("Encryption cancelled.")
\ No newline at end of file
+        print("Encryption cancelled.")
@@ -5,45 +5,102 @@ Implementasi enkripsi hybrid dengan multiple layers tanpa pustaka bawaan
 """
 
 import random
+import re
 import time
 import os
 
+# Envelope (versi 2): MAGIC | version (1 byte) | key_id (1 byte) | length (4 byte) | payload
+ENVELOPE_MAGIC = b'BD'
+ENVELOPE_VERSION = 2
+ENVELOPE_HEADER_SIZE = 8
+
+# versi 1 (legacy): hex string tanpa header, minimal 16 byte -> 32 hex chars.
+# Tidak bisa dibedakan dari plaintext hex/angka panjang, jadi hanya dipakai untuk migrasi eksplisit.
+_LEGACY_HEX = re.compile(r'(?:[0-9a-fA-F]{2}){16,}')
+
+def is_encrypted(value):
+    """True hanya untuk envelope versi 2 (cek header, O(1))"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        if value[:2] == ENVELOPE_MAGIC and len(value) >= ENVELOPE_HEADER_SIZE:
+            return value[2] == ENVELOPE_VERSION
+    return False
+
+def looks_like_legacy(value):
+    """
+    Heuristik ciphertext versi 1 (hex tanpa header). Plaintext hex/angka >= 32 karakter juga cocok,
+    jadi tidak dipakai untuk is_encrypted. encrypt_existing_data.py melewati nilai yang cocok
+    kecuali operator memilih migrasi legacy (--legacy-v1).
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        if value[:2] == ENVELOPE_MAGIC:
+            return False
+        try:
+            value = value.decode('ascii')
+        except UnicodeDecodeError:
+            return False
+    if not isinstance(value, str):
+        return False
+    return _LEGACY_HEX.fullmatch(value) is not None
+
 class AdvancedEncryption:
-    def __init__(self, master_key="BukitDuri2024"):
+    def __init__(self, master_key="BukitDuri2024", key_id=1):
         self.master_key = master_key
+        self.key_id = key_id % 256
         self.key_matrix = self._generate_key_matrix()
+        self._build_tables()
         
     def _generate_key_matrix(self):
         """Generate dynamic key matrix dari master key"""
         seed = sum(ord(c) for c in self.master_key)
-        random.seed(seed)
-        return [[random.randint(1, 255) for _ in range(16)] for _ in range(16)]
+        # RNG per instance: urutan sama dengan random.seed(seed), tanpa menyentuh state global
+        rng = random.Random(seed)
+        return tuple(tuple(rng.randint(1, 255) for _ in range(16)) for _ in range(16))
+    
+    def __getstate__(self):
+        # cukup kirim key ke worker process, tabel dibangun ulang di sana
+        return {'master_key': self.master_key, 'key_id': self.key_id}
+    
+    def __setstate__(self, state):
+        self.__init__(state['master_key'], state['key_id'])
+    
+    def _build_tables(self):
+        """Precompute 256-entry translate tables untuk substitution layer"""
+        # byte b ada di key_matrix[b // 16][b % 16]
+        flat_matrix = [value for row in self.key_matrix for value in row]
+        self._substitution_encrypt_table = bytes((flat_matrix[b] + b) % 256 for b in range(256))
+        self._substitution_decrypt_table = bytes((b - flat_matrix[b]) % 256 for b in range(256))
+        
+        # tabel versi 1 tidak bijektif; versi 2 memakai permutasi byte yang diurutkan menurut key matrix
+        order = sorted(range(256), key=lambda b: (flat_matrix[b], b))
+        encrypt_table = bytearray(256)
+        for rank, b in enumerate(order):
+            encrypt_table[b] = rank
+        self._substitution_v2_encrypt_table = bytes(encrypt_table)
+        self._substitution_v2_decrypt_table = bytes(order)
     
     def _xor_cipher(self, data, key):
-        """XOR cipher dengan rotating key"""
-        result = bytearray()
-        key_len = len(key)
-        for i, byte in enumerate(data):
-            result.append(byte ^ ord(key[i % key_len]))
-        return bytes(result)
+        """XOR cipher dengan rotating key, satu operasi integer untuk seluruh buffer"""
+        length = len(data)
+        if length == 0:
+            return b''
+        key_bytes = key.encode('latin-1')
+        keystream = (key_bytes * (length // len(key_bytes) + 1))[:length]
+        result = int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')
+        return result.to_bytes(length, 'big')
     
-    def _substitution_cipher(self, data, encrypt=True):
-        """Custom substitution cipher menggunakan key matrix"""
-        result = bytearray()
-        for byte in data:
-            row = byte // 16
-            col = byte % 16
-            if encrypt:
-                new_val = (self.key_matrix[row][col] + byte) % 256
-            else:
-                new_val = (byte - self.key_matrix[row][col]) % 256
-            result.append(new_val)
-        return bytes(result)
+    def _substitution_cipher(self, data, encrypt=True, version=1):
+        """Custom substitution cipher menggunakan key matrix (via bytes.translate)"""
+        if version >= 2:
+            table = self._substitution_v2_encrypt_table if encrypt else self._substitution_v2_decrypt_table
+        else:
+            table = self._substitution_encrypt_table if encrypt else self._substitution_decrypt_table
+        return bytes(data).translate(table)
     
     def _permutation_cipher(self, data, encrypt=True):
         """Permutation cipher dengan block size 8"""
         block_size = 8
-        result = bytearray()
         
         # Pola permutasi
         if encrypt:
@@ -51,88 +108,144 @@ class AdvancedEncryption:
         else:
             pattern = [4, 2, 6, 0, 5, 3, 7, 1]  # Reverse pattern
         
-        for i in range(0, len(data), block_size):
-            block = data[i:i + block_size]
-            
-            # Pad jika perlu
-            while len(block) < block_size:
-                block += b'\x00'
-            
-            # Apply permutation
-            new_block = bytearray(block_size)
-            for j in range(block_size):
-                new_block[j] = block[pattern[j]]
-            
-            result.extend(new_block)
+        # Pad ke kelipatan block size sekaligus
+        padded_length = -(-len(data) // block_size) * block_size
+        data = bytes(data) + b'\x00' * (padded_length - len(data))
+        
+        # Apply permutation per posisi dalam block (strided slice)
+        result = bytearray(padded_length)
+        for j in range(block_size):
+            result[j::block_size] = data[pattern[j]::block_size]
         
         return bytes(result)
     
     def _add_entropy(self, data):
         """Tambah entropy dengan timestamp dan random bytes"""
         timestamp = int(time.time()).to_bytes(4, 'big')
-        random_bytes = bytes([random.randint(0, 255) for _ in range(4)])
+        random_bytes = os.urandom(4)
         return timestamp + random_bytes + data
     
     def _remove_entropy(self, data):
         """Hapus entropy layer"""
         return data[8:]  # Skip 8 bytes (4 timestamp + 4 random)
     
-    def encrypt(self, plaintext):
-        """Multi-layer encryption"""
-        if isinstance(plaintext, str):
-            data = plaintext.encode('utf-8')
-        else:
-            data = plaintext
-        
+    def _encrypt_layers(self, data, version):
         # Layer 1: Add entropy
         data = self._add_entropy(data)
+        length = len(data)
         
         # Layer 2: XOR dengan master key
         data = self._xor_cipher(data, self.master_key)
         
         # Layer 3: Substitution cipher
-        data = self._substitution_cipher(data, encrypt=True)
+        data = self._substitution_cipher(data, encrypt=True, version=version)
         
         # Layer 4: Permutation cipher
         data = self._permutation_cipher(data, encrypt=True)
         
         # Layer 5: Final XOR dengan reversed key
         reversed_key = self.master_key[::-1]
+        return self._xor_cipher(data, reversed_key), length
+    
+    def _decrypt_layers(self, data, version, length=None):
+        # Layer 5: Reverse final XOR
+        reversed_key = self.master_key[::-1]
         data = self._xor_cipher(data, reversed_key)
         
-        # Convert ke hex untuk storage
-        return data.hex()
+        # Layer 4: Reverse permutation
+        data = self._permutation_cipher(data, encrypt=False)
+        if length is not None:
+            # buang padding block permutation
+            data = data[:length]
+        
+        # Layer 3: Reverse substitution
+        data = self._substitution_cipher(data, encrypt=False, version=version)
+        
+        # Layer 2: Reverse XOR
+        data = self._xor_cipher(data, self.master_key)
+        
+        # Layer 1: Remove entropy
+        return self._remove_entropy(data)
+    
+    def encrypt(self, plaintext):
+        """Multi-layer encryption, hasil berupa envelope biner (VARBINARY)"""
+        if isinstance(plaintext, str):
+            data = plaintext.encode('utf-8')
+        else:
+            data = plaintext
+        
+        payload, length = self._encrypt_layers(data, ENVELOPE_VERSION)
+        header = ENVELOPE_MAGIC + bytes((ENVELOPE_VERSION, self.key_id)) + length.to_bytes(4, 'big')
+        return header + payload
+    
+    def encrypt_legacy(self, plaintext):
+        """Format versi 1 (hex string), hanya untuk kompatibilitas"""
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode('utf-8')
+        return self._encrypt_layers(plaintext, 1)[0].hex()
     
     def decrypt(self, ciphertext):
-        """Multi-layer decryption (reverse order)"""
+        """Multi-layer decryption (reverse order) untuk envelope versi 2; None untuk nilai lain"""
         try:
-            # Convert dari hex
-            data = bytes.fromhex(ciphertext)
-            
-            # Layer 5: Reverse final XOR
-            reversed_key = self.master_key[::-1]
-            data = self._xor_cipher(data, reversed_key)
-            
-            # Layer 4: Reverse permutation
-            data = self._permutation_cipher(data, encrypt=False)
-            
-            # Layer 3: Reverse substitution
-            data = self._substitution_cipher(data, encrypt=False)
-            
-            # Layer 2: Reverse XOR
-            data = self._xor_cipher(data, self.master_key)
-            
-            # Layer 1: Remove entropy
-            data = self._remove_entropy(data)
-            
-            return data.decode('utf-8')
+            if isinstance(ciphertext, (bytes, bytearray, memoryview)):
+                ciphertext = bytes(ciphertext)
+                if ciphertext[:2] == ENVELOPE_MAGIC:
+                    return self._decrypt_envelope(ciphertext)
+            return None
         except:
             return None
+    
+    def decrypt_legacy(self, ciphertext):
+        """
+        Best effort untuk hex versi 1. Substitution versi 1 tidak bijektif, jadi hasilnya bisa salah;
+        None kalau hasilnya bukan UTF-8 yang valid.
+        """
+        try:
+            if isinstance(ciphertext, (bytes, bytearray, memoryview)):
+                ciphertext = bytes(ciphertext).decode('ascii')
+            data = bytes.fromhex(ciphertext)
+            return self._decrypt_layers(data, 1).decode('utf-8')
+        except (ValueError, UnicodeDecodeError):
+            return None
+    
+    def _decrypt_envelope(self, envelope):
+        version = envelope[2]
+        key_id = envelope[3]
+        if version != ENVELOPE_VERSION or key_id != self.key_id:
+            # versi tidak dikenal atau dienkripsi dengan key lain
+            return None
+        length = int.from_bytes(envelope[4:ENVELOPE_HEADER_SIZE], 'big')
+        data = self._decrypt_layers(envelope[ENVELOPE_HEADER_SIZE:], version, length)
+        return data.decode('utf-8')
+    
+    @staticmethod
+    def envelope_key_id(value):
+        """key_id dari header envelope, None untuk nilai legacy/plaintext"""
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            value = bytes(value)
+            if value[:2] == ENVELOPE_MAGIC and len(value) >= ENVELOPE_HEADER_SIZE:
+                return value[3]
+        return None
+    
+    def is_encrypted(self, value):
+        return is_encrypted(value)
+    
+    def encrypt_many(self, values):
+        """Encrypt a batch of values; None/empty values are passed through unchanged"""
+        return [self.encrypt(value) if value else value for value in values]
+    
+    def decrypt_many(self, values):
+        """Decrypt a batch of values, each distinct ciphertext only once"""
+        plaintexts = {}
+        for value in values:
+            if value and value not in plaintexts:
+                plaintexts[value] = self.decrypt(value)
+        return [plaintexts[value] if value else value for value in values]
 
 # Global encryption instance
 try:
     from config import ENCRYPTION_SETTINGS
     master_key = ENCRYPTION_SETTINGS.get('master_key', 'BukitDuri2024')
-    encryption_engine = AdvancedEncryption(master_key)
+    encryption_engine = AdvancedEncryption(master_key, ENCRYPTION_SETTINGS.get('key_id', 1))
 except ImportError:
     encryption_engine = AdvancedEncryption()
\ No newline at end of file
@@ -1,9 +1,24 @@
 # fix_database_schema.py
 import sys
 import os
+import re
 sys.path.append('.')
 
-from src.db.db_connector import DatabaseManager
+from src.db.db_connector import DatabaseManager, ENCRYPTED_COLUMN_TYPES
+
+SCHEMA_TABLES = ('ApplicantProfile', 'resumes')
+
+def oversized_columns(cursor):
+    """[(table, column, max length, limit)] untuk nilai yang tidak muat di VARBINARY(n) baru"""
+    problems = []
+    for table in SCHEMA_TABLES:
+        for column, column_type in ENCRYPTED_COLUMN_TYPES.items():
+            limit = int(re.search(r'\((\d+)\)', column_type).group(1))
+            cursor.execute(f"SELECT MAX(LENGTH({column})) FROM {table}")
+            max_length = cursor.fetchone()[0] or 0
+            if max_length > limit:
+                problems.append((table, column, max_length, limit))
+    return problems
 
 def fix_database_schema():
     print("=== FIXING DATABASE SCHEMA FOR ENCRYPTION ===")
@@ -16,20 +31,22 @@ def fix_database_schema():
     try:
         cursor = db.connection.cursor()
         
-        # Alter ApplicantProfile table - perbesar kolom untuk encrypted data
+        # Kolom terenkripsi jadi VARBINARY: envelope biner setengah ukuran hex.
+        # Nilai hex lama tetap terbaca (bytes ASCII) dan dikenali sebagai legacy.
         alter_queries = [
-            "ALTER TABLE ApplicantProfile MODIFY first_name VARCHAR(1000)",
-            "ALTER TABLE ApplicantProfile MODIFY last_name VARCHAR(1000)", 
-            "ALTER TABLE ApplicantProfile MODIFY address TEXT",
-            "ALTER TABLE ApplicantProfile MODIFY phone_number VARCHAR(500)",
-            
-            # Alter resumes table juga
-            "ALTER TABLE resumes MODIFY first_name VARCHAR(1000)",
-            "ALTER TABLE resumes MODIFY last_name VARCHAR(1000)",
-            "ALTER TABLE resumes MODIFY address TEXT", 
-            "ALTER TABLE resumes MODIFY phone_number VARCHAR(500)"
+            f"ALTER TABLE {table} MODIFY {column} {column_type}"
+            for table in SCHEMA_TABLES
+            for column, column_type in ENCRYPTED_COLUMN_TYPES.items()
         ]
         
+        # MODIFY ke kolom yang lebih sempit memotong data (atau gagal di strict mode): cek dulu
+        problems = oversized_columns(cursor)
+        if problems:
+            for table, column, max_length, limit in problems:
+                print(f"❌ {table}.{column}: longest value is {max_length} bytes, new type allows {limit}")
+            print("Schema not modified. Shorten these values or raise ENCRYPTED_COLUMN_TYPES first.")
+            return False
+        
         print("Modifying database schema...")
         for query in alter_queries:
             print(f"Executing: {query}")
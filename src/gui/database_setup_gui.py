@@ -12,7 +12,7 @@ root_dir = os.path.dirname(parent_dir)
 
 sys.path.append(parent_dir) 
 sys.path.append(root_dir)    
-from config import DATABASE_CONFIG
+from config import DATABASE_CONFIG, INGEST_SETTINGS
 
 try:
     from PyQt5.QtSvg import QSvgWidget
@@ -20,8 +20,9 @@ except ImportError:
     print("QSvgWidget not available, using text fallback")
 
 try:
-    from db.db_connector import DatabaseManager
-    from core.extractor import extract_text_from_pdf, extract_profile_data
+    from db.db_connector import DatabaseManager, profile_column_type
+    from core.ingest import IsolatedIngestPool, get_ingest_source
+    from core.profiling import profile_run
 except ImportError as e:
     print(f"Import error: {e}")
     sys.exit(1)
@@ -94,15 +95,21 @@ class DatabaseSetupWorker(QThread):
             self.progress_update.emit("Running seeding SQL...")
             self.progress_percentage.emit(30)
             self.run_seeding_sql(DATABASE_CONFIG)  
+            db.rebuild_blind_index('ApplicantProfile')
             
             self.progress_update.emit("Adding profile columns...")
             self.progress_percentage.emit(35)
             self.add_profile_columns_to_resumes(db)
             
-            self.progress_update.emit("Loading resume data from PDF files...")
+            self.progress_update.emit("Loading resume data...")
             self.progress_percentage.emit(40)
             
-            self.load_resume_data_with_progress(db)
+            with profile_run("ingest", role="database_setup_gui"):
+                self.load_resume_data_with_progress(db)
+            
+            self.progress_update.emit("Building term index...")
+            self.progress_percentage.emit(92)
+            db.rebuild_term_index()
             
             self.progress_update.emit("Finalizing setup...")
             self.progress_percentage.emit(95)
@@ -158,11 +165,11 @@ class DatabaseSetupWorker(QThread):
             
             columns_to_add = [
                 ('applicant_id', 'INT DEFAULT NULL'),
-                ('first_name', 'VARCHAR(50) DEFAULT NULL'),
-                ('last_name', 'VARCHAR(50) DEFAULT NULL'),
+                ('first_name', f"{profile_column_type('first_name', 'VARCHAR(50)')} DEFAULT NULL"),
+                ('last_name', f"{profile_column_type('last_name', 'VARCHAR(50)')} DEFAULT NULL"),
                 ('date_of_birth', 'DATE DEFAULT NULL'),
-                ('address', 'VARCHAR(255) DEFAULT NULL'),
-                ('phone_number', 'VARCHAR(20) DEFAULT NULL'),
+                ('address', f"{profile_column_type('address', 'VARCHAR(255)')} DEFAULT NULL"),
+                ('phone_number', f"{profile_column_type('phone_number', 'VARCHAR(20)')} DEFAULT NULL"),
                 ('application_role', 'VARCHAR(100) DEFAULT NULL')
             ]
             
@@ -194,15 +201,12 @@ class DatabaseSetupWorker(QThread):
             print(f"PDF directory not found: {pdf_dir}")
             return
         
-        total_files = 0
-        categories = []
-        for category in os.listdir(pdf_dir):
-            category_path = os.path.join(pdf_dir, category)
-            if os.path.isdir(category_path):
-                pdf_files = [f for f in os.listdir(category_path) if f.endswith('.pdf')]
-                if pdf_files:  # only add categories with PDF files
-                    total_files += len(pdf_files)
-                    categories.append((category, pdf_files))
+        source = get_ingest_source(
+            os.path.join(root_dir, "data"),
+            INGEST_SETTINGS.get('source', 'text')
+        )
+        categories = source.categories()
+        total_files = sum(len(pdf_files) for _, pdf_files in categories)
         
         if total_files == 0:
             self.progress_update.emit("No PDF files found")
@@ -215,72 +219,88 @@ class DatabaseSetupWorker(QThread):
         self.progress_update.emit(f"Found {total_files} PDF files to process...")
         print(f"Total files to process: {total_files}")
         
+        tasks = []
         for category, pdf_files in categories:
-            self.progress_update.emit(f"Processing {category} category ({len(pdf_files)} files)...")
-            print(f"Processing category {category}: {len(pdf_files)} files")
-            files_to_process = pdf_files 
+            print(f"Queueing category {category}: {len(pdf_files)} files")
+            for filename in pdf_files:
+                tasks.append(source.make_task(category, filename))
+        
+        # isolated workers: one bad PDF can only cost its own timeout
+        pool = IsolatedIngestPool(
+            workers=INGEST_SETTINGS.get('workers', 2),
+            timeout_seconds=INGEST_SETTINGS.get('timeout_seconds', 30),
+            memory_limit_mb=INGEST_SETTINGS.get('memory_limit_mb'),
+            on_failure=lambda task, reason, mode: db.insert_ingest_failure(
+                task['filename'], task['category'], task['file_path'], mode, reason
+            )
+        )
+        
+        for task, result in pool.run(tasks):
+            filename = task['filename']
+            category = task['category']
+            pdf_path = task['file_path']
             
-            for filename in files_to_process:
-                pdf_path = os.path.join(pdf_dir, category, filename)
-                
-                try:
-                    extracted_text = extract_text_from_pdf(pdf_path)
-                    if extracted_text:
-                        profile = extract_profile_data(extracted_text)
-                        
-                        # prepare data for insertion
-                        skills = ", ".join(profile.get('skills', []))[:2000]
-                        
-                        experience_list = []
-                        for exp in profile.get('experience', []):
-                            exp_text = f"{exp.get('title', '')} ({exp.get('start', '')} - {exp.get('end', '')})"
-                            experience_list.append(exp_text)
-                        experience = " | ".join(experience_list)[:2000]
-                        
-                        education_list = []
-                        for edu in profile.get('education', []):
-                            edu_text = f"{edu.get('degree', '')} in {edu.get('field', '')}"
-                            education_list.append(edu_text)
-                        education = " | ".join(education_list)[:1000]
-                        
-                        gpa = float(profile['gpa'][0]) if profile.get('gpa') else None
-                        certifications = ", ".join(profile.get('certifications', []))[:1000]
-                        
-                        # insert to database
-                        resume_id = db.insert_resume(
-                            filename=filename,
-                            category=category,
-                            file_path=pdf_path,
-                            extracted_text=extracted_text[:100000],
-                            skills=skills,
-                            experience=experience,
-                            education=education,
-                            gpa=gpa,
-                            certifications=certifications
-                        )
-                        
-                        if resume_id and resume_id > 0:
-                            loaded_count += 1
-                            # only print every 10th success to avoid spam
-                            if loaded_count % 10 == 0:
-                                print(f"✓ Inserted {loaded_count} files so far...")
-                        else:
-                            print(f"✗ Failed to insert {filename}")
+            try:
+                extracted_text = result['text']
+                if result['error']:
+                    self.progress_update.emit(f"Skipped {filename}: {result['error']}")
+                elif extracted_text:
+                    profile = result['profile']
+                    
+                    # prepare data for insertion
+                    skills = ", ".join(profile.get('skills', []))[:2000]
                     
-                    processed += 1
+                    experience_list = []
+                    for exp in profile.get('experience', []):
+                        exp_text = f"{exp.get('title', '')} ({exp.get('start', '')} - {exp.get('end', '')})"
+                        experience_list.append(exp_text)
+                    experience = " | ".join(experience_list)[:2000]
                     
-                    progress_percent = 40 + int((processed / total_files) * 50)
-                    self.progress_percentage.emit(progress_percent)
+                    education_list = []
+                    for edu in profile.get('education', []):
+                        edu_text = f"{edu.get('degree', '')} in {edu.get('field', '')}"
+                        education_list.append(edu_text)
+                    education = " | ".join(education_list)[:1000]
                     
-                    if processed % 25 == 0:
-                        self.progress_update.emit(f"Processed {processed}/{total_files} files ({loaded_count} loaded)...")
-                        print(f"Progress: {processed}/{total_files} files processed, {loaded_count} loaded successfully")
+                    gpa = float(profile['gpa'][0]) if profile.get('gpa') else None
+                    certifications = ", ".join(profile.get('certifications', []))[:1000]
                     
-                except Exception as e:
-                    self.progress_update.emit(f"Error processing {filename}: {str(e)}")
-                    print(f"Error processing {filename}: {e}")
-                    processed += 1
-                    continue
+                    # insert to database
+                    resume_id = db.insert_resume(
+                        filename=filename,
+                        category=category,
+                        file_path=pdf_path,
+                        extracted_text=extracted_text[:100000],
+                        skills=skills,
+                        experience=experience,
+                        education=education,
+                        gpa=gpa,
+                        certifications=certifications,
+                        index_terms=False
+                    )
+                    
+                    if resume_id and resume_id > 0:
+                        loaded_count += 1
+                        # only print every 10th success to avoid spam
+                        if loaded_count % 10 == 0:
+                            print(f"✓ Inserted {loaded_count} files so far...")
+                    else:
+                        print(f"✗ Failed to insert {filename}")
+                
+                processed += 1
+                
+                progress_percent = 40 + int((processed / total_files) * 50)
+                self.progress_percentage.emit(progress_percent)
+                
+                if processed % 25 == 0:
+                    self.progress_update.emit(f"Processed {processed}/{total_files} files ({loaded_count} loaded)...")
+                    print(f"Progress: {processed}/{total_files} files processed, {loaded_count} loaded successfully")
+                
+            except Exception as e:
+                self.progress_update.emit(f"Error processing {filename}: {str(e)}")
+                print(f"Error processing {filename}: {e}")
+                processed += 1
+                continue
         
         print(f"Final: Successfully loaded {loaded_count} out of {processed} files processed")
         self.progress_update.emit(f"Loaded {loaded_count} resumes successfully!")
@@ -165,7 +165,8 @@ class CVCard(QWidget):
                 return
             
             try:
-                resume = db_manager.get_resume_by_id(self.resume_id)
+                # only the path is needed here, skip the text columns
+                resume = db_manager.get_resume_metadata([self.resume_id]).get(self.resume_id)
                 
                 if resume and resume.get('file_path'):
                     file_path = resume['file_path']
@@ -375,6 +376,15 @@ class SearchApp(QWidget):
         self.fuzzy_timing_label.hide()  # Hidden initially, akan ditampilkan setelah search
         summary_layout.addWidget(self.fuzzy_timing_label)
         
+        # Per-phase breakdown dari trace search (Font 12)
+        self.trace_timing_label = QLabel("")
+        self.trace_timing_label.setFont(QFont("Arial", 12))
+        self.trace_timing_label.setStyleSheet("color: #A5C5BE; background: transparent;")
+        self.trace_timing_label.setAlignment(Qt.AlignCenter)
+        self.trace_timing_label.setWordWrap(True)
+        self.trace_timing_label.hide()  # Hidden initially
+        summary_layout.addWidget(self.trace_timing_label)
+        
         self.main_layout.addLayout(summary_layout)
 
     def go_back_to_landing(self):
@@ -403,6 +413,7 @@ class SearchApp(QWidget):
         # Hide timing labels during search
         self.exact_timing_label.hide()
         self.fuzzy_timing_label.hide()
+        self.trace_timing_label.hide()
         
         try:
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -2,9 +2,11 @@ import os
 import sys
 import time
 import getpass
+import argparse
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
+sys.path.append(os.path.dirname(current_dir))  # config.py
 
 from core.extractor import extract_text_from_pdf, extract_profile_data, print_profile
 from core.matcher import kmp_search, bm_search, fuzzy_search, ac_search
@@ -35,8 +37,9 @@ def database_search_demo(db: DatabaseManager):
     print("3. Search by skill")
     print("4. Advanced search")
     print("5. View statistics")
+    print("6. Search by applicant name")
     
-    choice = input("Pilih opsi (1-5): ")
+    choice = input("Pilih opsi (1-6): ")
     
     if choice == "1":
         keyword = input("Masukkan keyword: ")
@@ -102,6 +105,23 @@ def database_search_demo(db: DatabaseManager):
                 print(f"  {cat_stat['category']}: {cat_stat['count']}")
         except AttributeError:
             print("Statistics method not available")
+    
+    elif choice == "6":
+        name = input("Masukkan nama: ")
+        mode = input("Mode (1=exact, 2=prefix, 3=toleran leetspeak/typo) [1]: ").strip()
+        start_time = time.time()
+        if mode == "3":
+            results = db.search_by_name_tolerant(name)
+        else:
+            results = db.search_by_name(name, prefix=(mode == "2"))
+        search_time = (time.time() - start_time) * 1000
+        
+        print(f"\nDitemukan {len(results)} hasil dalam {search_time:.2f} ms:")
+        for i, row in enumerate(results, 1):
+            full_name = f"{row.get('first_name') or ''} {row.get('last_name') or ''}".strip()
+            location = row.get('filename') or row.get('cv_path') or '-'
+            distance = f" (jarak {row['distance']})" if 'distance' in row else ""
+            print(f"{i}. {full_name} [{row['source']} #{row['owner_id']}] {location}{distance}")
 
 def string_matching_demo():
     """Demo algoritma string matching pada file"""
@@ -320,5 +340,85 @@ def main():
         else:
             print("Pilihan tidak valid!")
 
+def run_cli(argv):
+    """
+    Headless commands:
+        python src/main.py search --queries q.jsonl --output out.jsonl
+        python src/main.py serve --port 8765
+        python src/main.py reindex
+    """
+    parser = argparse.ArgumentParser(description="Resume Search System (headless)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    search_parser = subparsers.add_parser("search", help="Run a JSON lines file of queries and write ranked results")
+    search_parser.add_argument("--queries", required=True, help='JSON lines: {"keywords", "method", "top_k"} per line')
+    search_parser.add_argument("--output", required=True, help="JSON lines output: results + timing per query")
+    search_parser.add_argument("--workers", type=int, default=1, help="Worker processes (1 = run in this process)")
+    search_parser.add_argument("--source", choices=["corpus", "db"], default="corpus",
+                               help="corpus = in-memory data/regex text, db = MySQL")
+    search_parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(current_dir), "data"))
+    search_parser.add_argument("--profile", action="store_true",
+                               help="Extract skills/experience fields when loading the corpus (slower)")
+    search_parser.add_argument("--method", default="KMP", help="Default method for queries without one")
+    search_parser.add_argument("--top-k", type=int, default=10, help="Default top_k for queries without one")
+    
+    serve_parser = subparsers.add_parser("serve", help="Run the HTTP/JSON search service on localhost")
+    serve_parser.add_argument("--host", default=None)
+    serve_parser.add_argument("--port", type=int, default=None)
+    serve_parser.add_argument("--workers", type=int, default=None)
+    serve_parser.add_argument("--source", choices=["corpus", "db"], default=None)
+    serve_parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(current_dir), "data"))
+    serve_parser.add_argument("--profile", action="store_true",
+                              help="Extract skills/experience fields when loading the corpus (slower)")
+    
+    subparsers.add_parser("reindex", help="Rebuild the BM25 / structured query postings from the resumes table")
+    args = parser.parse_args(argv)
+    
+    if args.command == "reindex":
+        db = DatabaseManager(password=get_mysql_password())
+        if not db.connect():
+            return 1
+        try:
+            return 0 if db.rebuild_term_index() else 1
+        finally:
+            db.disconnect()
+    
+    if args.command == "serve":
+        from config import SERVICE_SETTINGS
+        from core.search_service import run_service
+        
+        settings = {key: value for key, value in
+                    (('host', args.host), ('port', args.port), ('workers', args.workers)) if value is not None}
+        source = args.source or SERVICE_SETTINGS.get('source', 'corpus')
+        spec = {'type': source, 'data_dir': args.data_dir, 'with_profile': args.profile}
+        if source == "db":
+            spec['password'] = get_mysql_password()
+        run_service(spec, settings)
+        return 0
+    
+    if args.command == "search":
+        from core.batch_search import run_batch_to_file
+        
+        spec = {'type': args.source, 'data_dir': args.data_dir, 'with_profile': args.profile}
+        if args.source == "db":
+            spec['password'] = get_mysql_password()
+        
+        try:
+            summary = run_batch_to_file(args.queries, args.output, spec, args.workers, args.method, args.top_k)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] {e}")
+            return 1
+        
+        latency = summary['latency_ms']
+        print(f"{summary['queries']} queries ({summary['errors']} errors) in {summary['wall_seconds']:.2f}s "
+              f"- {summary['qps']:.2f} queries/s")
+        print(f"Latency ms: mean {latency['mean']:.2f}, p50 {latency['p50']:.2f}, "
+              f"p95 {latency['p95']:.2f}, max {latency['max']:.2f}")
+        print(f"Results written to {args.output}")
+        return 1 if summary['errors'] else 0
+    return 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     main()
\ No newline at end of file
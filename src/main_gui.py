@@ -21,10 +21,15 @@ from gui.summary_gui import SummaryPage
 # Import core functionality
 from src.core.extractor import extract_text_from_pdf, extract_profile_data
 from src.core.matcher import kmp_search, bm_search, ac_search, fuzzy_search
+# exceptions come from the engine's own modules so except clauses match what it raises
+from src.core.search_engine import CancellationToken, QuerySyntaxError, SearchCancelled, SearchEngine
 from src.db.db_connector import DatabaseManager
+# core.* (bukan src.core.*): module yang sama dengan yang dipakai engine, jadi span/run-nya tersambung
+from core import profiling, tracing
 
 class SearchWorker(QThread):
     results_ready = pyqtSignal(list)
+    partial_results = pyqtSignal(list)  # provisional top-k, results_ready stays authoritative
     error_occurred = pyqtSignal(str)
     timing_info = pyqtSignal(dict)  # New signal for timing information
     
@@ -33,218 +38,69 @@ class SearchWorker(QThread):
         self.keywords = keywords
         self.method = method
         self.top_matches = top_matches
+        self.cancel_token = CancellationToken()
+        self.progressive = SEARCH_SETTINGS.get('progressive_results', False)
+    
+    def cancel(self):
+        """Minta worker berhenti di batas chunk berikutnya; tidak ada hasil yang di-emit setelahnya"""
+        self.cancel_token.cancel()
+    
+    def open_metadata_db(self):
+        """Second connection for partial-result metadata while the main one is streaming"""
+        db = DatabaseManager()
+        return db if db.connect() else None
     
     def run(self):
+        # BUKDUR_PROFILE=search: satu profile per search, lihat core/profiling.py
+        with profiling.profile_run("search", keywords=self.keywords, method=self.method,
+                                   top_k=self.top_matches):
+            self.run_search()
+    
+    def run_search(self):
+        db = None
+        engine = None
+        token = self.cancel_token
         try:
-            # Connect to database
-            db = DatabaseManager()
-            if not db.connect():
-                self.error_occurred.emit("Failed to connect to database")
-                return
-            
-            # Get all resumes
-            all_resumes = db.get_all_resumes()
-            
-            # Perform exact matching first
-            exact_start_time = time.time()
-            exact_results, found_keywords = self.perform_exact_search(all_resumes)
-            exact_time = (time.time() - exact_start_time) * 1000  # Convert to ms
-            
-            # Get keywords that weren't found in exact matching
-            keywords_list = [k.strip() for k in self.keywords.split(',')]
-            missing_keywords = [kw for kw in keywords_list if kw not in found_keywords]
-            
-            # Perform fuzzy matching for missing keywords
-            fuzzy_results = []
-            fuzzy_time = 0
-            
-            if missing_keywords:
-                fuzzy_start_time = time.time()
-                fuzzy_results = self.perform_fuzzy_search(all_resumes, missing_keywords)
-                fuzzy_time = (time.time() - fuzzy_start_time) * 1000
-            else:
-                # Even if no missing keywords, set fuzzy_time to 0 for display
-                fuzzy_time = 0
-            
-            # Combine results
-            combined_results = self.combine_results(exact_results, fuzzy_results)
-            
-            # Sort by total matches and limit
-            final_results = sorted(combined_results, key=lambda x: x['matches'], reverse=True)[:self.top_matches]
-            
-            # ALWAYS emit timing information (even if fuzzy_time is 0)
-            timing_data = {
-                'exact_time': exact_time,
-                'fuzzy_time': fuzzy_time,
-                'exact_count': len(exact_results),
-                'fuzzy_count': len(fuzzy_results),
-                'total_scanned': len(all_resumes),
-                'missing_keywords': missing_keywords,
-                'method_used': self.method  # Add method info
-            }
+            with tracing.start_trace("search", keywords=self.keywords, method=self.method,
+                                     top_k=self.top_matches) as trace:
+                # Connect to database
+                db = DatabaseManager()
+                if not db.connect():
+                    self.error_occurred.emit("Failed to connect to database")
+                    return
+                
+                engine = SearchEngine(
+                    db, self.method,
+                    cancel_token=token,
+                    on_partial=self.partial_results.emit if self.progressive else None,
+                    metadata_factory=self.open_metadata_db
+                )
+                try:
+                    final_results, timing_data = engine.search(self.keywords, self.top_matches)
+                except QuerySyntaxError as e:
+                    self.error_occurred.emit(f"Invalid query: {e}")
+                    return
+            timing_data['trace_id'] = trace.trace_id
+            timing_data['phases'] = trace.phases()
             self._timing_data = timing_data
             
             print(f"DEBUG - Timing data: {timing_data}")  # Debug
             
+            # query sudah diganti yang baru: jangan kirim hasil basi
+            token.raise_if_cancelled()
             self.timing_info.emit(timing_data)
             self.results_ready.emit(final_results)
-            db.disconnect()
             
+        except SearchCancelled:
+            print(f"Search for '{self.keywords}' cancelled")
         except Exception as e:
-            self.error_occurred.emit(str(e))
-    
-    def perform_exact_search(self, all_resumes):
-        """Perform exact matching using selected algorithm"""
-        results = []
-        found_keywords = set()
-        keywords = [k.strip() for k in self.keywords.split(',')]
-        
-        for resume in all_resumes:
-            search_text = resume.get('content', '') or resume.get('extracted_text', '')
-            if not search_text:
-                continue
-            
-            total_matches = 0
-            skill_matches = {}
-            
-            for keyword in keywords:
-                # Use selected algorithm for exact matching
-                if self.method == "KMP":
-                    from src.core.matcher import kmp_search
-                    matches = kmp_search(search_text, keyword)
-                elif self.method == "BM":
-                    from src.core.matcher import bm_search
-                    matches = bm_search(search_text, keyword)
-                elif self.method == "AC":
-                    from src.core.matcher import ac_search
-                    matches = ac_search(search_text, [keyword])
-                    matches = [pos for pos, _ in matches]
-                else:
-                    matches = []
-                
-                if matches:
-                    total_matches += len(matches)
-                    skill_matches[keyword] = len(matches)
-                    found_keywords.add(keyword)
-            
-            if total_matches > 0:
-                display_name = ""
-                first_name = resume.get('first_name')
-                last_name = resume.get('last_name')
-                
-                if first_name and last_name:
-                    display_name = f"{first_name} {last_name}"
-                elif first_name:
-                    display_name = first_name
-                elif last_name:
-                    display_name = last_name
-                else:
-                    filename = resume['filename'].replace('.pdf', '')
-                    if filename.isdigit():
-                        display_name = f"Candidate {filename}"
-                    else:
-                        display_name = filename
-                
-                results.append({
-                    'name': display_name,
-                    'matches': total_matches,
-                    'skills': skill_matches,
-                    'resume_id': resume['id'],
-                    'match_type': 'exact',
-                    'profile_data': {
-                        'first_name': resume.get('first_name'),
-                        'last_name': resume.get('last_name'),
-                        'application_role': resume.get('application_role'),
-                        'date_of_birth': resume.get('date_of_birth'),
-                        'address': resume.get('address'),
-                        'phone_number': resume.get('phone_number'),
-                        'filename': resume.get('filename')
-                    }
-                })
-        
-        return results, found_keywords
-
-    def perform_fuzzy_search(self, all_resumes, missing_keywords):
-        """Perform fuzzy matching using Levenshtein Distance"""
-        results = []
-        
-        for resume in all_resumes:
-            search_text = resume.get('content', '') or resume.get('extracted_text', '')
-            if not search_text:
-                continue
-            
-            total_fuzzy_matches = 0
-            fuzzy_skill_matches = {}
-            
-            for keyword in missing_keywords:
-                from src.core.matcher import fuzzy_search
-                fuzzy_matches = fuzzy_search(search_text, keyword, threshold=60)
-                
-                if fuzzy_matches:
-                    high_sim_matches = [m for m in fuzzy_matches if m[2] >= 70]
-                    if high_sim_matches:
-                        total_fuzzy_matches += len(high_sim_matches)
-                        fuzzy_skill_matches[f"{keyword} (fuzzy)"] = len(high_sim_matches)
-            
-            if total_fuzzy_matches > 0:
-                display_name = ""
-                first_name = resume.get('first_name')
-                last_name = resume.get('last_name')
-                
-                if first_name and last_name:
-                    display_name = f"{first_name} {last_name}"
-                elif first_name:
-                    display_name = first_name
-                elif last_name:
-                    display_name = last_name
-                else:
-                    filename = resume['filename'].replace('.pdf', '')
-                    if filename.isdigit():
-                        display_name = f"Candidate {filename}"
-                    else:
-                        display_name = filename
-                
-                results.append({
-                    'name': display_name,
-                    'matches': total_fuzzy_matches,
-                    'skills': fuzzy_skill_matches,
-                    'resume_id': resume['id'],
-                    'match_type': 'fuzzy',
-                    'profile_data': {
-                        'first_name': resume.get('first_name'),
-                        'last_name': resume.get('last_name'),
-                        'application_role': resume.get('application_role'),
-                        'date_of_birth': resume.get('date_of_birth'),
-                        'address': resume.get('address'),
-                        'phone_number': resume.get('phone_number'),
-                        'filename': resume.get('filename')
-                    }
-                })
-        
-        return results
-            
-    def combine_results(self, exact_results, fuzzy_results):
-        """Combine exact and fuzzy results, avoiding duplicates"""
-        # Create dict to track resumes by ID
-        combined = {}
-        
-        # Add exact results first (higher priority)
-        for result in exact_results:
-            resume_id = result['resume_id']
-            combined[resume_id] = result
-        
-        # Add fuzzy results for resumes not in exact results
-        for result in fuzzy_results:
-            resume_id = result['resume_id']
-            if resume_id in combined:
-                # Merge fuzzy skills with exact skills
-                combined[resume_id]['skills'].update(result['skills'])
-                combined[resume_id]['matches'] += result['matches']
-                combined[resume_id]['match_type'] = 'both'
-            else:
-                combined[resume_id] = result
-        
-        return list(combined.values())
+            if not token.is_cancelled:
+                self.error_occurred.emit(str(e))
+        finally:
+            if db is not None:
+                db.disconnect()
+            if engine is not None:
+                engine.close()
     
     def search_with_kmp(self, db):
         # Get all resumes from database
@@ -345,7 +201,87 @@ class SearchWorker(QThread):
         return sorted(results, key=lambda x: x['matches'], reverse=True)
 
 
-class IntegratedLandingPage(BukitDuriApp):
+class SearchLauncher:
+    """
+    Mixin untuk halaman yang menjalankan SearchWorker: query baru membatalkan query lama,
+    dan hanya worker terakhir yang boleh mengirim hasil ke handler.
+    """
+    search_worker = None
+    
+    def start_search_worker(self, keywords, method, top_matches, on_results, on_error,
+                            on_timing=None, on_finished=None, progress_dialog=None, on_partial=None):
+        self.cancel_search()
+        
+        worker = SearchWorker(keywords, method, top_matches, "")
+        worker.delivered = False
+        worker.results_ready.connect(lambda results, w=worker: self._deliver_if_current(w, on_results, results, final=True))
+        worker.error_occurred.connect(lambda message, w=worker: self._deliver_if_current(w, on_error, message, final=True))
+        if progress_dialog is not None:
+            # QProgressDialog juga emit canceled() saat ditutup setelah hasil datang
+            progress_dialog.canceled.connect(lambda w=worker: self._cancel_if_pending(w))
+        if on_partial is not None:
+            worker.partial_results.connect(lambda results, w=worker: self._deliver_if_current(w, on_partial, results))
+        if on_timing is not None:
+            worker.timing_info.connect(lambda timing, w=worker: self._deliver_if_current(w, on_timing, timing))
+        if on_finished is not None:
+            worker.finished.connect(lambda w=worker: self._deliver_if_current(w, on_finished))
+        worker.finished.connect(lambda w=worker: self._release_worker(w))
+        
+        self.search_worker = worker
+        worker.start()
+        return worker
+    
+    def cancel_search(self):
+        """Cancel the running search; the thread object is kept alive until it actually finishes"""
+        worker = self.search_worker
+        if worker is None:
+            return
+        worker.cancel()
+        if worker.isRunning():
+            if not hasattr(self, '_retired_workers'):
+                self._retired_workers = []
+            self._retired_workers.append(worker)
+        self.search_worker = None
+    
+    def _cancel_if_pending(self, worker):
+        if worker is self.search_worker and not worker.delivered:
+            self.cancel_search()
+    
+    def _deliver_if_current(self, worker, handler, *args, final=False):
+        if worker is self.search_worker and not worker.cancel_token.is_cancelled:
+            if final:
+                worker.delivered = True
+            handler(*args)
+    
+    def _release_worker(self, worker):
+        retired = getattr(self, '_retired_workers', [])
+        if worker in retired:
+            retired.remove(worker)
+    
+    def update_partial_results(self, results):
+        """Provisional top-k while the search is still running"""
+        if hasattr(self, 'loading_dialog'):
+            self.loading_dialog.hide()
+        self.show_result_cards(results)
+        if hasattr(self, 'results_label'):
+            self.results_label.setText(f"Found {len(self.cv_data)} resumes so far (searching...)")
+    
+    def show_result_cards(self, results):
+        """Simpan hasil dan gambar ulang kartu dari halaman pertama (dipakai hasil parsial dan final)"""
+        self.search_results = results
+        self.cv_data = []
+        for result in results:
+            self.cv_data.append({
+                'name': result['name'],
+                'matches': result['matches'],
+                'skills': result['skills'],
+                'resume_id': result['resume_id']
+            })
+        
+        self.current_page = 0
+        self.updateCards()
+
+class IntegratedLandingPage(BukitDuriApp, SearchLauncher):
     """Enhanced landing page with search functionality"""
     
     def __init__(self):
@@ -396,12 +332,26 @@ class IntegratedLandingPage(BukitDuriApp):
         self.loading_dialog.setWindowModality(Qt.WindowModal)
         self.loading_dialog.show()
         
-        # Start search in worker thread
-        self.search_worker = SearchWorker(keywords, method, top_matches, self.db_password)
-        self.search_worker.results_ready.connect(self.show_results)
-        self.search_worker.error_occurred.connect(self.show_error)
-        self.search_worker.finished.connect(self.search_finished)
-        self.search_worker.start()
+        # Start search in worker thread (cancels a search that is still running)
+        self.results_window = None
+        self.start_search_worker(
+            keywords, method, top_matches,
+            on_results=self.show_results,
+            on_partial=self.show_partial_results,
+            on_error=self.show_error,
+            on_finished=self.search_finished,
+            progress_dialog=self.loading_dialog
+        )
+    
+    def show_partial_results(self, results):
+        """First provisional results open the results page; later ones refresh it"""
+        if self.results_window is None:
+            if hasattr(self, 'loading_dialog'):
+                # hide, bukan close: close() memicu canceled()
+                self.loading_dialog.hide()
+            self.open_results_window(results)
+        else:
+            self.results_window.update_partial_results(results)
     
     def show_results(self, results):
         if hasattr(self, 'loading_dialog'):
@@ -409,6 +359,14 @@ class IntegratedLandingPage(BukitDuriApp):
         
         print(f"Search completed! Found {len(results)} results")
         
+        if self.results_window is not None:
+            # results page sudah dibuka oleh partial result (timing signal sudah tersambung)
+            self.results_window.update_search_results(results)
+            return
+        
+        self.open_results_window(results)
+    
+    def open_results_window(self, results):
         # Get search parameters
         line_edits = self.findChildren(QLineEdit)
         keywords = line_edits[0].text().strip() if line_edits else ""
@@ -437,7 +395,7 @@ class IntegratedLandingPage(BukitDuriApp):
 
     def connect_timing_signal(self):
         """Connect timing signal after UI is ready"""
-        if hasattr(self, 'search_worker') and hasattr(self.results_window, 'exact_timing_label'):
+        if self.search_worker is not None and hasattr(self.results_window, 'exact_timing_label'):
             print("DEBUG - Connecting timing signal from landing page")
             self.search_worker.timing_info.connect(self.results_window.update_timing_display)
             
@@ -471,12 +429,15 @@ class IntegratedLandingPage(BukitDuriApp):
             self.loading_dialog.setWindowModality(Qt.WindowModal)
             self.loading_dialog.show()
             
-            # Create search worker
-            self.search_worker = SearchWorker(keywords, method, top_matches, "")
-            self.search_worker.results_ready.connect(self.update_search_results)
-            self.search_worker.timing_info.connect(self.update_timing_display)  # New connection
-            self.search_worker.error_occurred.connect(self.search_error)
-            self.search_worker.start()
+            # Create search worker; a previous query that is still running is cancelled
+            self.start_search_worker(
+                keywords, method, top_matches,
+                on_results=self.update_search_results,
+                on_error=self.search_error,
+                on_timing=self.update_timing_display,
+                on_partial=self.update_partial_results,
+                progress_dialog=self.loading_dialog
+            )
             
         except Exception as e:
             QMessageBox.critical(self, "Search Error", f"Could not start search: {str(e)}")
@@ -513,19 +474,7 @@ class IntegratedLandingPage(BukitDuriApp):
         if hasattr(self, 'loading_dialog'):
             self.loading_dialog.close()
         
-        # Update data
-        self.search_results = results
-        self.cv_data = []
-        for result in results:
-            self.cv_data.append({
-                'name': result['name'],
-                'matches': result['matches'],
-                'skills': result['skills'],
-                'resume_id': result['resume_id']
-            })
-        
-        self.current_page = 0
-        self.updateCards()
+        self.show_result_cards(results)
         
         # Update results count
         self.results_label.setText(f"Found {len(self.cv_data)} resumes")
@@ -535,7 +484,7 @@ class IntegratedLandingPage(BukitDuriApp):
             self.loading_dialog.close()
         QMessageBox.critical(self, "Search Error", f"Error: {error_msg}")
 
-class IntegratedHomePage(SearchApp):
+class IntegratedHomePage(SearchApp, SearchLauncher):
     def __init__(self, search_results=None, search_params=None):
         self.search_results = search_results or []
         self.search_params = search_params or {}
@@ -605,6 +554,17 @@ class IntegratedHomePage(SearchApp):
             
             self.fuzzy_timing_label.setText(fuzzy_text)
             self.fuzzy_timing_label.show()  # Always show
+        
+        # Breakdown per fase dari trace; render ditambahkan setelah kartu hasil digambar
+        self._trace_phases = timing_data.get('phases') or []
+        self.show_trace_phases()
+
+    def show_trace_phases(self, render_ms=None):
+        if not hasattr(self, 'trace_timing_label') or not getattr(self, '_trace_phases', None):
+            return
+        extra = [("render", render_ms)] if render_ms is not None else None
+        self.trace_timing_label.setText(tracing.format_phases(self._trace_phases, extra))
+        self.trace_timing_label.show()
 
     def perform_new_search(self):
         keywords = self.keyword_input.text().strip()
@@ -621,12 +581,15 @@ class IntegratedHomePage(SearchApp):
             self.loading_dialog.setWindowModality(Qt.WindowModal)
             self.loading_dialog.show()
             
-            # Create search worker
-            self.search_worker = SearchWorker(keywords, method, top_matches, "")
-            self.search_worker.results_ready.connect(self.update_search_results)
-            self.search_worker.timing_info.connect(self.update_timing_display)  # This will now work
-            self.search_worker.error_occurred.connect(self.search_error)
-            self.search_worker.start()
+            # Create search worker; a previous query that is still running is cancelled
+            self.start_search_worker(
+                keywords, method, top_matches,
+                on_results=self.update_search_results,
+                on_error=self.search_error,
+                on_timing=self.update_timing_display,
+                on_partial=self.update_partial_results,
+                progress_dialog=self.loading_dialog
+            )
             
         except Exception as e:
             QMessageBox.critical(self, "Search Error", f"Could not start search: {str(e)}")
@@ -635,19 +598,9 @@ class IntegratedHomePage(SearchApp):
         if hasattr(self, 'loading_dialog'):
             self.loading_dialog.close()
         
-        # Update data
-        self.search_results = results
-        self.cv_data = []
-        for result in results:
-            self.cv_data.append({
-                'name': result['name'],
-                'matches': result['matches'],
-                'skills': result['skills'],
-                'resume_id': result['resume_id']
-            })
-        
-        self.current_page = 0
-        self.updateCards()
+        render_start = time.perf_counter()
+        self.show_result_cards(results)
+        self.show_trace_phases((time.perf_counter() - render_start) * 1000)
         
         # Update results count
         if hasattr(self, 'results_label'):
@@ -781,6 +734,15 @@ class IntegratedHomePage(SearchApp):
         self.fuzzy_timing_label.hide()  # Hidden initially
         summary_layout.addWidget(self.fuzzy_timing_label)
         
+        # Per-phase breakdown dari trace search (Font 12)
+        self.trace_timing_label = QLabel("")
+        self.trace_timing_label.setFont(QFont("Arial", 12))
+        self.trace_timing_label.setStyleSheet("color: #A5C5BE; background: transparent;")
+        self.trace_timing_label.setAlignment(Qt.AlignCenter)
+        self.trace_timing_label.setWordWrap(True)
+        self.trace_timing_label.hide()  # Hidden initially
+        summary_layout.addWidget(self.trace_timing_label)
+        
         # Add summary layout to main layout
         top_layout.addLayout(summary_layout)
         
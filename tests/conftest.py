@@ -0,0 +1,35 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# same layout the scripts use: config.py at the root, core/db/encryption under src
+for path in (ROOT, os.path.join(ROOT, "src"), os.path.join(ROOT, "src", "encryption")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import pytest
+
+# corpus kecil dengan layout data/: pdf/<CATEGORY>/<id>.pdf + regex/<CATEGORY>/<id>_regex.txt
+SMALL_CORPUS = {
+    ('ACCOUNTANT', '1001'): "Accountant\nSkills\nExcel, SQL, Python\nExperience\nSenior Accountant at Alpha 2018 - 2022\n",
+    ('ACCOUNTANT', '1002'): "Accountant\nSkills\nExcel, Payroll\nExperience\nStaff Accountant at Beta 2015 - 2019\n",
+    ('ENGINEERING', '2001'): "Engineer\nSkills\nPython, Django, PostgreSQL\nExperience\nBackend Engineer at Gamma 2019 - 2024\n",
+    ('ENGINEERING', '2002'): "Engineer\nSkills\nJava, JavaScript, MySQL\nExperience\nSoftware Engineer at Delta 2016 - 2021\n",
+    ('DESIGNER', '3001'): "Designer\nSkills\nFigma, Photoshop\nExperience\nUI Designer at Epsilon 2020 - 2023\n",
+}
+
+def write_corpus(data_dir, documents=SMALL_CORPUS):
+    for (category, stem), text in documents.items():
+        pdf_dir = data_dir / "pdf" / category
+        regex_dir = data_dir / "regex" / category
+        pdf_dir.mkdir(parents=True, exist_ok=True)
+        regex_dir.mkdir(parents=True, exist_ok=True)
+        # PDF tidak pernah dibuka selama sidecar teks ada
+        (pdf_dir / f"{stem}.pdf").write_bytes(b"")
+        if text is not None:
+            (regex_dir / f"{stem}_regex.txt").write_text(text, encoding="utf-8")
+    return data_dir
+
+@pytest.fixture(scope="session")
+def small_corpus_dir(tmp_path_factory):
+    return write_corpus(tmp_path_factory.mktemp("data"))
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from core.batch_search import percentile, read_queries, run_batch_to_file, summarize
+
+QUERIES = [
+    {"id": "q1", "keywords": "python, sql", "top_k": 5},
+    {"id": "q2", "keywords": "(python"},
+    {"id": "q3", "keywords": "excel", "method": "BM"},
+    "figma",
+    {"id": "q5", "keywords": "java NOT figma", "method": "AC"},
+]
+
+def write_queries(path, queries=QUERIES):
+    lines = ["# komentar dan baris kosong dilewati", ""]
+    lines += [json.dumps(query) for query in queries]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_to_file(tmp_path, small_corpus_dir, workers):
+    queries_path = write_queries(tmp_path / "queries.jsonl")
+    output_path = tmp_path / "results.jsonl"
+    spec = {'type': 'corpus', 'data_dir': str(small_corpus_dir)}
+
+    summary = run_batch_to_file(str(queries_path), str(output_path), spec, workers=workers)
+    records = read_records(output_path)
+
+    # urutan output sama dengan urutan query, juga dengan beberapa worker
+    assert [record['id'] for record in records] == ["q1", "q2", "q3", 6, "q5"]
+    assert [record['method'] for record in records] == ["KMP", "KMP", "BM", "KMP", "AC"]
+
+    bad = records[1]
+    assert bad['error_kind'] == "request"
+    assert bad['error'].startswith("QuerySyntaxError")
+    assert bad['results'] == []
+
+    for record in records[:1] + records[2:]:
+        assert record['error'] is None and record['error_kind'] is None
+        assert record['results']
+        assert record['timing']['trace_id']
+    assert [result['profile_data']['filename'] for result in records[0]['results']] == ["1001.pdf", "2001.pdf", "2002.pdf"]
+    assert {result['profile_data']['category'] for result in records[2]['results']} == {"ACCOUNTANT"}
+    assert [result['profile_data']['filename'] for result in records[4]['results']] == ["2002.pdf"]
+
+    assert summary['queries'] == 5
+    assert summary['errors'] == 1
+    assert summary['qps'] > 0
+    latency = summary['latency_ms']
+    assert 0 < latency['p50'] <= latency['p95'] <= latency['max']
+
+def test_read_queries_defaults_and_errors(tmp_path):
+    path = write_queries(tmp_path / "queries.jsonl", ["python", {"keywords": "sql", "top_k": "3"}])
+    assert read_queries(str(path), default_method="BM", default_top_k=7) == [
+        {"id": 3, "keywords": "python", "method": "BM", "top_k": 7},
+        {"id": 4, "keywords": "sql", "method": "BM", "top_k": 3},
+    ]
+
+    (tmp_path / "broken.jsonl").write_text('{"keywords": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match="broken.jsonl:1"):
+        read_queries(str(tmp_path / "broken.jsonl"))
+    (tmp_path / "empty.jsonl").write_text('{"id": 1}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="missing 'keywords'"):
+        read_queries(str(tmp_path / "empty.jsonl"))
+
+def test_summarize_and_percentile():
+    records = [{"latency_ms": float(ms), "error": None} for ms in range(1, 21)]
+    records[0]["error"] = "ValueError: bad"
+    summary = summarize(records, 2.0)
+    assert summary['queries'] == 20 and summary['errors'] == 1 and summary['qps'] == 10.0
+    assert summary['latency_ms'] == {'mean': 10.5, 'p50': 10.0, 'p95': 19.0, 'max': 20.0}
+
+    assert percentile([], 0.5) == 0.0
+    assert percentile([5.0], 0.95) == 5.0
+    assert summarize([], 0)['qps'] == 0.0
@@ -0,0 +1,32 @@
+import fitz
+
+from conftest import write_corpus
+from core.corpus import load_text_corpus
+
+def write_pdf(path, text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+def test_corpus_loads_every_document(small_corpus_dir):
+    corpus = load_text_corpus(str(small_corpus_dir))
+    assert len(corpus) == 5
+    assert corpus.get_statistics()['total_resumes'] == 5
+    assert corpus.get_resume_by_id(1)['filename'] == "1001.pdf"
+
+def test_missing_or_empty_sidecar_falls_back_to_pdf(tmp_path):
+    data_dir = write_corpus(tmp_path, {
+        ('IT', 'a'): "Python developer",
+        ('IT', 'b'): "",       # sidecar kosong
+        ('IT', 'c'): None,     # tanpa sidecar
+        ('IT', 'd'): None,     # tanpa sidecar, PDF tanpa teks
+    })
+    write_pdf(data_dir / "pdf" / "IT" / "b.pdf", "Kotlin engineer")
+    write_pdf(data_dir / "pdf" / "IT" / "c.pdf", "Rust engineer")
+
+    corpus = load_text_corpus(str(data_dir))
+
+    texts = {row['filename']: row['extracted_text'] for chunk in corpus.iter_resumes() for row in chunk}
+    assert texts == {'a.pdf': "Python developer", 'b.pdf': "Kotlin engineer", 'c.pdf': "Rust engineer"}
+    assert corpus.get_term_postings(['kotlin'])
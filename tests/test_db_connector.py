@@ -0,0 +1,103 @@
+import mysql.connector
+
+from db.db_connector import DatabaseManager
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.lastrowid = None
+        self._rows = []
+
+    def execute(self, query, params=()):
+        query = " ".join(query.split())
+        self.connection.executed.append((query, list(params)))
+        if any(query.startswith(prefix) for prefix in self.connection.failing):
+            raise mysql.connector.Error(msg="Table 'resume_terms' doesn't exist")
+        if query.startswith("INSERT INTO resumes"):
+            self.lastrowid = 7
+        self._rows = self.connection.results.pop(0) if query.startswith("SELECT") and self.connection.results else []
+
+    def executemany(self, query, rows):
+        self.connection.executed.append((" ".join(query.split()), list(rows)))
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    """Cukup untuk DatabaseManager: catat SQL, gagal untuk prefix di `failing`"""
+
+    def __init__(self, failing=(), results=()):
+        self.failing = failing
+        self.results = list(results)
+        self.executed = []
+        self.commits = 0
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+def manager(connection):
+    db = DatabaseManager(host="localhost", user="test", password="test", database="test")
+    db.connection = connection
+    return db
+
+def statements(connection, prefix):
+    return [params for query, params in connection.executed if query.startswith(prefix)]
+
+def test_insert_creates_term_tables_once_and_indexes():
+    connection = FakeConnection()
+    db = manager(connection)
+
+    assert db.insert_resume("a.pdf", "IT", "data/pdf/IT/a.pdf", "python sql", "python") == 7
+    assert db.insert_resume("b.pdf", "IT", "data/pdf/IT/b.pdf", "java") == 7
+
+    assert len(statements(connection, "CREATE TABLE IF NOT EXISTS resume_terms")) == 1
+    assert len(statements(connection, "INSERT INTO resume_terms")) == 2
+
+def test_insert_without_term_tables_still_succeeds():
+    connection = FakeConnection(failing=("CREATE TABLE IF NOT EXISTS resume_terms",))
+    db = manager(connection)
+
+    assert db.insert_resume("a.pdf", "IT", "data/pdf/IT/a.pdf", "python sql") == 7
+    assert db.insert_resume_with_profile("b.pdf", "IT", "data/pdf/IT/b.pdf", "java", first_name="Budi") == 7
+    assert statements(connection, "INSERT INTO resume_terms") == []
+    assert statements(connection, "DELETE FROM resume_terms") == []
+
+def test_insert_can_skip_indexing():
+    connection = FakeConnection()
+    db = manager(connection)
+
+    assert db.insert_resume("a.pdf", "IT", "data/pdf/IT/a.pdf", "python", index_terms=False) == 7
+    assert statements(connection, "INSERT INTO resume_terms") == []
+
+def test_rebuild_term_index_pages_through_resumes():
+    connection = FakeConnection(results=[
+        [(1, "python sql", "python", ""), (2, "java", "", "")],
+        [(3, "go", "", "")],
+        [],
+    ])
+    db = manager(connection)
+
+    assert db.rebuild_term_index(chunk_size=2) == 3
+    assert [params[0] for params in statements(connection, "SELECT id, extracted_text")] == [0, 2, 3]
+    assert [params[0] for params in statements(connection, "DELETE FROM resume_terms")] == [1, 2, 3]
+    assert connection.commits == 2
+
+def test_get_field_lengths_is_batched():
+    connection = FakeConnection(results=[[(1, 'body', 10)], [(600, 'body', 3)], []])
+    db = manager(connection)
+
+    lengths = db.get_field_lengths(range(1, 1201), id_batch_size=500)
+
+    batches = statements(connection, "SELECT resume_id, field, length FROM resume_lengths")
+    assert [len(batch) for batch in batches] == [500, 500, 200]
+    assert lengths == {1: {'body': 10}, 600: {'body': 3}}
+    assert db.get_field_lengths([]) == {}
@@ -0,0 +1,70 @@
+import pytest
+
+import encrypt_existing_data as job
+from encryption_engine import AdvancedEncryption, is_encrypted
+
+FIELDS = ['first_name', 'address']
+
+@pytest.fixture
+def engines():
+    old_engine = AdvancedEncryption("OldKey", key_id=1)
+    new_engine = AdvancedEncryption("NewKey", key_id=2)
+    yield old_engine, new_engine
+    job._init_worker(None, None)
+
+def test_plaintext_is_encrypted(engines):
+    _, new_engine = engines
+    job._init_worker(None, new_engine)
+
+    updates, names, failed, skipped = job._reencrypt_chunk([(1, {'first_name': "Budi", 'address': b"Jl. Merdeka"})], FIELDS)
+
+    (row_id, values), = updates
+    assert row_id == 1 and is_encrypted(values['first_name'])
+    assert new_engine.decrypt(values['address']) == "Jl. Merdeka"
+    assert names == [(1, {'first_name': "Budi"})]
+    assert (failed, skipped) == (0, 0)
+
+def test_old_envelope_is_rotated(engines):
+    old_engine, new_engine = engines
+    job._init_worker(old_engine, new_engine)
+
+    updates, _, failed, _ = job._reencrypt_chunk([(1, {'first_name': old_engine.encrypt("Siti")})], FIELDS)
+
+    assert new_engine.decrypt(updates[0][1]['first_name']) == "Siti"
+    assert failed == 0
+
+def test_legacy_value_is_skipped_without_flag(engines):
+    old_engine, new_engine = engines
+    job._init_worker(old_engine, new_engine)
+    legacy = old_engine.encrypt_legacy("Legacy Name")
+
+    updates, names, failed, skipped = job._reencrypt_chunk([(1, {'first_name': legacy})], FIELDS)
+
+    assert updates == [] and names == []
+    assert (failed, skipped) == (0, 1)
+
+def test_legacy_value_is_migrated_with_flag(engines):
+    old_engine, new_engine = engines
+    job._init_worker(old_engine, new_engine, legacy_v1=True)
+    # decrypt versi 1 best effort: tidak semua nilai bisa dikembalikan
+    values = [old_engine.encrypt_legacy(f"Name {i}") for i in range(20)]
+    rows = list(enumerate(({'first_name': value} for value in values), 1))
+
+    updates, _, failed, skipped = job._reencrypt_chunk(rows, FIELDS)
+
+    assert skipped == 0
+    assert updates and len(updates) + failed == len(values)
+    for row_id, new_values in updates:
+        assert new_engine.decrypt(new_values['first_name']) == old_engine.decrypt_legacy(values[row_id - 1])
+
+def test_non_utf8_bytes_count_as_failed(engines):
+    _, new_engine = engines
+    job._init_worker(None, new_engine)
+
+    updates, _, failed, _ = job._reencrypt_chunk(
+        [(1, {'first_name': b"\xff\xfe", 'address': "Jl. Merdeka"}), (2, {'first_name': "Ani"})], FIELDS
+    )
+
+    assert failed == 1
+    assert [row_id for row_id, _ in updates] == [1, 2]
+    assert updates[0][1]['first_name'] == b"\xff\xfe"
@@ -0,0 +1,83 @@
+import pickle
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from encryption_engine import AdvancedEncryption, ENVELOPE_MAGIC, is_encrypted, looks_like_legacy
+
+@pytest.fixture
+def engine():
+    return AdvancedEncryption("TestKey2024", key_id=3)
+
+@pytest.mark.parametrize("plaintext", [
+    "", "a", "John", "Doe-Smith", "Jl. Bukit Duri No. 17, Jakarta", "+62 812 3456 7890",
+    "Zoë Ñúñez 日本語", "x" * 7, "x" * 8, "x" * 9, "long " * 400,
+])
+def test_roundtrip(engine, plaintext):
+    envelope = engine.encrypt(plaintext)
+    assert envelope[:2] == ENVELOPE_MAGIC
+    assert is_encrypted(envelope)
+    assert engine.decrypt(envelope) == plaintext
+
+def test_roundtrip_every_length(engine):
+    # padding block permutation (8) dan semua nilai byte
+    for length in range(0, 40):
+        plaintext = "".join(chr(32 + (i * 7) % 95) for i in range(length))
+        assert engine.decrypt(engine.encrypt(plaintext)) == plaintext
+    data = bytes(range(256))
+    assert engine.decrypt(engine.encrypt(data.decode("latin-1"))) == data.decode("latin-1")
+
+def test_ciphertext_differs_per_call(engine):
+    first, second = engine.encrypt("Alice"), engine.encrypt("Alice")
+    assert first != second
+    assert engine.decrypt(first) == engine.decrypt(second) == "Alice"
+
+def test_memoryview_and_bytearray(engine):
+    envelope = engine.encrypt("Budi")
+    assert engine.decrypt(bytearray(envelope)) == "Budi"
+    assert engine.decrypt(memoryview(envelope)) == "Budi"
+
+def test_pickle_roundtrip(engine):
+    clone = pickle.loads(pickle.dumps(engine))
+    assert clone.key_id == engine.key_id
+    assert clone.decrypt(engine.encrypt("Siti")) == "Siti"
+    assert engine.decrypt(clone.encrypt("Siti")) == "Siti"
+
+def test_other_key_or_key_id_does_not_decrypt(engine):
+    envelope = engine.encrypt("Rahasia")
+    assert AdvancedEncryption("TestKey2024", key_id=4).decrypt(envelope) is None
+    assert AdvancedEncryption("OtherKey", key_id=3).decrypt(envelope) != "Rahasia"
+
+def test_global_random_state_untouched():
+    random.seed(1234)
+    expected = [random.random() for _ in range(3)]
+    random.seed(1234)
+    AdvancedEncryption("TestKey2024").encrypt("x")
+    assert [random.random() for _ in range(3)] == expected
+
+def test_concurrent_use(engine):
+    values = [f"name-{i}" for i in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        envelopes = list(pool.map(engine.encrypt, values))
+        assert list(pool.map(engine.decrypt, envelopes)) == values
+
+def test_is_encrypted_only_checks_envelope_header(engine):
+    assert not is_encrypted("1234567890123456789012345678901234")
+    assert not is_encrypted(b"0123456789abcdef0123456789abcdef")
+    assert not is_encrypted("John")
+    assert not is_encrypted(None)
+    assert is_encrypted(bytearray(engine.encrypt("John")))
+
+def test_legacy_values_need_explicit_path(engine):
+    legacy = engine.encrypt_legacy("Legacy Name")
+    assert not is_encrypted(legacy)
+    assert looks_like_legacy(legacy)
+    assert engine.decrypt(legacy) is None
+    assert not looks_like_legacy(engine.encrypt("x"))
+
+def test_batch_helpers(engine):
+    values = ["a", None, "", "a", "b"]
+    encrypted = engine.encrypt_many(values)
+    assert encrypted[1] is None and encrypted[2] == ""
+    assert engine.decrypt_many(encrypted) == values
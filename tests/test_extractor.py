@@ -0,0 +1,40 @@
+import fitz
+
+from core.extractor import extract_text_from_pdf, iter_pdf_pages
+
+def make_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+def test_iter_pdf_pages_yields_one_page_at_a_time(tmp_path):
+    pdf = tmp_path / "cv.pdf"
+    make_pdf(pdf, ["Skills\nPython", "Experience\nData Engineer"])
+
+    pages = iter_pdf_pages(str(pdf))
+    assert "Python" in next(pages)
+    assert "Data Engineer" in next(pages)
+    assert next(pages, None) is None
+
+def test_with_blocks_yields_coordinates(tmp_path):
+    pdf = tmp_path / "cv.pdf"
+    make_pdf(pdf, ["Skills\nPython"])
+
+    (text, blocks), = list(iter_pdf_pages(str(pdf), with_blocks=True))
+    assert "Python" in text
+    x0, y0, x1, y1, block_text = blocks[0]
+    assert x0 < x1 and y0 < y1
+    assert "Python" in block_text
+
+def test_extract_text_normalises_whole_document(tmp_path):
+    pdf = tmp_path / "cv.pdf"
+    make_pdf(pdf, ["Skills\nPython", "Experience\nData Engineer"])
+
+    raw = "".join(iter_pdf_pages(str(pdf)))
+    assert extract_text_from_pdf(str(pdf)) == raw.replace("\n\n", "\n").strip()
+
+def test_missing_file_returns_empty_text(tmp_path):
+    assert extract_text_from_pdf(str(tmp_path / "missing.pdf")) == ""
+    assert list(iter_pdf_pages(str(tmp_path / "missing.pdf"))) == []
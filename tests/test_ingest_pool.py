@@ -0,0 +1,141 @@
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from core.ingest import IsolatedIngestPool
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="butuh FIFO (POSIX)")
+
+RESUME_TEXT = "John Doe\nSkills\nPython, SQL\nExperience\nData Engineer at Example Corp 2019 - 2023\n"
+
+@pytest.fixture(autouse=True)
+def no_profiling(monkeypatch):
+    monkeypatch.setenv("BUKDUR_PROFILE", "")
+
+def sidecar_task(tmp_path, name, text=RESUME_TEXT):
+    text_path = tmp_path / f"{name}.txt"
+    text_path.write_text(text, encoding="utf-8")
+    return {'filename': f"{name}.pdf", 'category': "TEST",
+            'file_path': str(tmp_path / f"{name}.pdf"), 'text_path': str(text_path)}
+
+def hanging_task(tmp_path, name):
+    # open() pada FIFO tanpa writer blok selamanya: worker tidak pernah menjawab
+    fifo = tmp_path / f"{name}.fifo"
+    os.mkfifo(fifo)
+    return {'filename': f"{name}.pdf", 'category': "TEST",
+            'file_path': str(tmp_path / f"{name}.pdf"), 'text_path': str(fifo)}
+
+class RecordingPool(IsolatedIngestPool):
+    """Simpan semua worker process supaya test bisa mematikannya"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.spawned = []
+
+    def _spawn_worker(self):
+        slot = super()._spawn_worker()
+        self.spawned.append(slot.process)
+        return slot
+
+def test_sidecar_tasks_succeed(tmp_path):
+    failures = []
+    pool = IsolatedIngestPool(workers=2, timeout_seconds=30, memory_limit_mb=None,
+                              on_failure=lambda *args: failures.append(args))
+    tasks = [sidecar_task(tmp_path, f"cv{i}") for i in range(3)]
+
+    results = dict((task['filename'], result) for task, result in pool.run(tasks))
+
+    assert sorted(results) == ["cv0.pdf", "cv1.pdf", "cv2.pdf"]
+    for result in results.values():
+        assert result['error'] is None
+        assert result['mode'] == "full"
+        assert result['text'] == RESUME_TEXT.strip()
+        assert isinstance(result['profile'], dict)
+    assert failures == []
+
+def test_timeout_is_recorded_and_retried_text_only(tmp_path):
+    failures = []
+    pool = IsolatedIngestPool(workers=2, timeout_seconds=1, memory_limit_mb=None,
+                              on_failure=lambda task, reason, mode: failures.append((task['filename'], reason, mode)))
+    tasks = [hanging_task(tmp_path, "stuck"), sidecar_task(tmp_path, "ok")]
+
+    results = dict((task['filename'], result) for task, result in pool.run(tasks))
+
+    assert results["ok.pdf"]['error'] is None
+    stuck = results["stuck.pdf"]
+    assert stuck['mode'] == "text_only"
+    assert stuck['text'] == ""
+    assert "timeout" in stuck['error']
+    assert [(name, mode) for name, _, mode in failures] == [("stuck.pdf", "full"), ("stuck.pdf", "text_only")]
+    assert all("timeout" in reason for _, reason, _ in failures)
+
+def test_crashed_worker_is_replaced_and_retried(tmp_path):
+    failures = []
+    pool = RecordingPool(workers=1, timeout_seconds=60, memory_limit_mb=None,
+                         on_failure=lambda task, reason, mode: failures.append((reason, mode)))
+    tasks = [hanging_task(tmp_path, "crash"), sidecar_task(tmp_path, "after")]
+
+    def kill_first_two_workers():
+        for index in range(2):
+            while len(pool.spawned) <= index:
+                time.sleep(0.05)
+            time.sleep(0.5)
+            os.kill(pool.spawned[index].pid, signal.SIGKILL)
+
+    killer = threading.Thread(target=kill_first_two_workers, daemon=True)
+    killer.start()
+    results = dict((task['filename'], result) for task, result in pool.run(tasks))
+    killer.join(5)
+
+    assert "worker crashed" in results["crash.pdf"]['error']
+    assert results["crash.pdf"]['mode'] == "text_only"
+    assert [mode for _, mode in failures] == ["full", "text_only"]
+    # worker pengganti tetap memproses task berikutnya
+    assert results["after.pdf"]['error'] is None
+    assert results["after.pdf"]['text'] == RESUME_TEXT.strip()
+
+def test_slow_consumer_is_not_a_timeout(tmp_path):
+    # caller yang lambat memproses hasil tidak boleh membuat hasil worker lain dianggap timeout
+    failures = []
+    pool = IsolatedIngestPool(workers=2, timeout_seconds=1, memory_limit_mb=None,
+                              on_failure=lambda *args: failures.append(args))
+    tasks = [sidecar_task(tmp_path, f"cv{i}") for i in range(4)]
+
+    results = []
+    for task, result in pool.run(tasks):
+        results.append(result)
+        time.sleep(1.5)
+
+    assert len(results) == 4
+    assert all(result['error'] is None and result['mode'] == "full" for result in results)
+    assert failures == []
+
+def test_deadline_pauses_while_caller_holds_a_result(tmp_path):
+    # "slow" masih jalan di worker saat caller selesai memproses hasil pertama; waktu caller
+    # (lebih lama dari timeout) tidak boleh menghabiskan budget worker tersebut
+    failures = []
+    pool = IsolatedIngestPool(workers=2, timeout_seconds=2, memory_limit_mb=None,
+                              on_failure=lambda *args: failures.append(args))
+    slow = hanging_task(tmp_path, "slow")
+    tasks = [sidecar_task(tmp_path, "fast"), slow]
+
+    def release_slow_worker():
+        with open(slow['text_path'], "w", encoding="utf-8") as fifo:
+            fifo.write(RESUME_TEXT)
+
+    results = {}
+    writer = threading.Thread(target=release_slow_worker, daemon=True)
+    for task, result in pool.run(tasks):
+        results[task['filename']] = result
+        if task['filename'] == "fast.pdf":
+            time.sleep(3)
+            writer.start()
+    writer.join(5)
+
+    assert failures == []
+    assert results["slow.pdf"]['error'] is None
+    assert results["slow.pdf"]['mode'] == "full"
+    assert results["slow.pdf"]['text'] == RESUME_TEXT.strip()
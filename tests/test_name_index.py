@@ -0,0 +1,74 @@
+import pytest
+
+from core.name_index import (KIND_CANON, KIND_DELETE, KIND_PHONETIC, canonical_token, canonical_tokens,
+                             deletion_keys, levenshtein, match_name, name_keys, query_keys, soundex)
+
+@pytest.mark.parametrize("token, expected", [
+    ("J0hn", "john"), ("5m1th", "smith"), ("D03", "doe"), ("@nn4", "anna"), ("$ari", "sari"),
+    ("8ud!", "budi"), ("7om", "tom"), ("Zoë", "zoe"), ("Ñúñez", "nunez"), ("O'Brien", "obrien"),
+])
+def test_canonical_token(token, expected):
+    assert canonical_token(token) == expected
+
+def test_canonical_tokens_split_and_dedupe():
+    assert canonical_tokens("J0hn  D03-5m1th") == ["john", "doe", "smith"]
+    assert canonical_tokens("Anna anna 4nn4") == ["anna"]
+    assert canonical_tokens(None) == [] and canonical_tokens("") == []
+
+@pytest.mark.parametrize("token, code", [
+    ("robert", "R163"), ("rupert", "R163"), ("rubin", "R150"), ("ashcraft", "A261"),
+    ("tymczak", "T522"), ("pfister", "P236"), ("honeyman", "H555"), ("lee", "L000"), ("", ""),
+])
+def test_soundex(token, code):
+    assert soundex(token) == code
+
+def test_deletion_keys():
+    assert deletion_keys("jon") == set()
+    assert deletion_keys("john") == {"ohn", "jhn", "jon", "joh"}
+
+def test_name_keys():
+    assert name_keys("Jon") == {(KIND_CANON, "jon"), (KIND_PHONETIC, "J500")}
+    keys = name_keys("J0hn")
+    assert (KIND_CANON, "john") in keys and (KIND_DELETE, "jhn") in keys
+
+@pytest.mark.parametrize("query, name", [
+    ("john", "john"), ("jhon", "john"), ("jonh", "john"), ("johnn", "john"),
+    ("smyth", "smith"), ("smith", "smiht"), ("jon", "john"), ("john", "jon"),
+])
+def test_query_keys_find_close_names(query, name):
+    # symmetric delete: satu hapus di kedua sisi mencakup jarak edit 1 dan transposisi (jarak 2)
+    assert levenshtein(query, name) <= 2
+    assert query_keys(query) & name_keys(name)
+
+@pytest.mark.parametrize("a, b, distance", [
+    ("kitten", "sitting", 3), ("john", "john", 0), ("", "abc", 3), ("abc", "", 3),
+    ("flaw", "lawn", 2), ("gumbo", "gambol", 2),
+])
+def test_levenshtein(a, b, distance):
+    assert levenshtein(a, b) == distance
+    assert levenshtein(b, a) == distance
+
+def test_levenshtein_stops_at_max_distance():
+    assert levenshtein("kitten", "sitting", max_distance=3) == 3
+    assert levenshtein("kitten", "sitting", max_distance=1) == 2
+    assert levenshtein("abc", "abcdef", max_distance=2) == 3
+    assert levenshtein("abcdefgh", "zyxwvuts", max_distance=0) == 1
+
+def test_match_name_leet_and_typos():
+    assert match_name("J0hn D03", ["John", "Doe"]) == 0
+    assert match_name("jon", ["John", "Doe"]) == 1
+    assert match_name("jhn smyth", ["John", "Smith"]) == 2
+    assert match_name("john", [None, ""]) is None
+
+def test_match_name_max_distance():
+    assert match_name("jonathan", ["John"]) is None
+    assert match_name("jonh", ["John"], max_distance=0, phonetic=False) is None
+    assert match_name("jonh", ["John"], max_distance=2) == 2
+    assert match_name("jnoh", ["John"], max_distance=1, phonetic=False) is None
+
+def test_match_name_phonetic_switch():
+    # rupert vs robert: jarak 2, soundex sama
+    assert match_name("Rupert", ["Robert"], max_distance=1) == 1
+    assert match_name("Rupert", ["Robert"], max_distance=1, phonetic=False) is None
+    assert match_name("Smyth", ["Smith"], max_distance=0) == 0
+    assert match_name("Smyth", ["Smith"], max_distance=0, phonetic=False) is None
@@ -0,0 +1,105 @@
+import pytest
+
+from core.query import And, Literal, Not, Or, QuerySyntaxError, compile_query, is_structured_query
+from core.scoring import build_postings
+
+def shape(node):
+    """Pohon query sebagai tuple supaya mudah dibandingkan"""
+    if isinstance(node, Literal):
+        return node.label
+    if isinstance(node, Not):
+        return ('NOT', shape(node.child))
+    return (type(node).__name__.upper(), *[shape(child) for child in node.children])
+
+def matches(query, body="", skills="", experience=""):
+    postings = build_postings({'body': body, 'skills': skills, 'experience': experience})[0]
+    return compile_query(query).matches(postings)
+
+@pytest.mark.parametrize("query, expected", [
+    ("python", "python"),
+    ("python java", ('AND', 'python', 'java')),
+    ("python AND java", ('AND', 'python', 'java')),
+    ("a OR b c", ('OR', 'a', ('AND', 'b', 'c'))),
+    ("a b OR c", ('OR', ('AND', 'a', 'b'), 'c')),
+    ("a, b AND c", ('OR', 'a', ('AND', 'b', 'c'))),
+    ("a NOT b", ('AND', 'a', ('NOT', 'b'))),
+    ("NOT a OR b", ('OR', ('NOT', 'a'), 'b')),
+    ("NOT NOT a", ('NOT', ('NOT', 'a'))),
+    ("(a OR b) c", ('AND', ('OR', 'a', 'b'), 'c')),
+    ("python AND (django OR flask) NOT php",
+     ('AND', 'python', ('OR', 'django', 'flask'), ('NOT', 'php'))),
+    ('skills:sql experience:"data engineer"', ('AND', 'skills:sql', 'experience:"data engineer"')),
+    ('exp:java text:go', ('AND', 'experience:java', 'body:go')),
+    ('"sql server"~3', '"sql server"~3'),
+])
+def test_precedence(query, expected):
+    assert shape(compile_query(query).root) == expected
+
+def test_lowercase_operators_are_terms():
+    assert shape(compile_query("a or b").root) == ('AND', 'a', 'or', 'b')
+
+@pytest.mark.parametrize("query", [
+    "", "   ", "python AND (", "(python", "python)", "()", "AND", "python OR", "NOT",
+    "foo:bar", '"', '"unterminated', '""', '"!!"', "a ~ b(",
+])
+def test_syntax_errors(query):
+    with pytest.raises(QuerySyntaxError):
+        compile_query(query)
+
+def test_syntax_error_is_value_error():
+    assert issubclass(QuerySyntaxError, ValueError)
+
+def test_boolean_matching():
+    body = "python developer with django and postgres"
+    assert matches("python AND (django OR flask) NOT php", body)
+    assert not matches("python AND (django OR flask) NOT postgres", body)
+    assert matches("ruby, python", body)
+    assert not matches("ruby java", body)
+
+def test_phrase_is_exact_and_ordered():
+    body = "senior sql server administrator"
+    assert matches('"sql server"', body)
+    assert not matches('"server sql"', body)
+    assert not matches('"sql administrator"', body)
+
+@pytest.mark.parametrize("query, body, expected", [
+    ('"sql server"~0', "sql server", True),
+    ('"server sql"~0', "sql server", False),
+    ('"server sql"~5', "sql server", False),
+    ('"sql server"~2', "sql big fat server", True),
+    ('"sql server"~1', "sql big fat server", False),
+    ('"sql server"~1', "sql big fat server then sql x server", True),
+    ('"a b c"~1', "a x b c", True),
+    ('"a b c"~1', "a x b y c", False),
+    ('"a b c"~2', "a x b y c", True),
+    ('"a a"~0', "a a", True),
+    ('"a a"~3', "a", False),
+])
+def test_slop(query, body, expected):
+    assert matches(query, body) is expected
+
+def test_field_scope():
+    assert matches("skills:sql", skills="SQL, Python", body="sql")
+    assert not matches("skills:sql", body="sql")
+    assert matches('experience:"data engineer"', experience="Data Engineer at X")
+    assert not matches('skills:"data engineer"', skills="engineer data")
+    # tanpa field: semua field
+    assert matches('"data engineer"', experience="data engineer")
+
+def test_positive_terms_skip_negated():
+    plan = compile_query('python NOT php "sql server"')
+    terms = plan.positive_terms()
+    assert 'python' in terms and 'sql' in terms and 'server' in terms
+    assert 'php' not in terms
+
+@pytest.mark.parametrize("query, expected", [
+    ("python, java", False),
+    ("python developer", False),
+    ("python AND java", True),
+    ('"machine learning"', True),
+    ("(python)", True),
+    ("skills:sql", True),
+    ("python and java", False),
+])
+def test_is_structured_query(query, expected):
+    assert is_structured_query(query) is expected
@@ -0,0 +1,137 @@
+import asyncio
+import http.client
+import json
+import threading
+
+import pytest
+
+from core.search_service import SearchService
+
+class RunningService:
+    """SearchService di event loop thread terpisah, diakses lewat http.client seperti client biasa"""
+
+    def __init__(self, spec, settings):
+        self.service = SearchService(spec, dict({'host': '127.0.0.1', 'port': 0}, **settings))
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.service.start(), self.loop).result(60)
+        self.host, self.port = self.service.address
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.service.close(), self.loop).result(30)
+        asyncio.run_coroutine_threadsafe(self._cancel_handlers(), self.loop).result(30)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+    @staticmethod
+    async def _cancel_handlers():
+        # handler koneksi keep-alive yang masih menunggu request berikutnya
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def request(self, method, path, body=None, headers=None):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            return response.status, dict(response.getheaders()), json.loads(response.read() or b'null')
+        finally:
+            conn.close()
+
+@pytest.fixture(scope="module")
+def service(small_corpus_dir):
+    spec = {'type': 'corpus', 'data_dir': str(small_corpus_dir)}
+    with RunningService(spec, {'workers': 1, 'max_body_bytes': 1024}) as running:
+        yield running
+
+def test_health(service):
+    status, headers, payload = service.request("GET", "/health")
+    assert status == 200
+    assert payload == {'status': 'ok'}
+    assert headers['Content-Type'].startswith("application/json")
+
+def test_search_get(service):
+    status, _, record = service.request("GET", "/search?keywords=python,sql&method=KMP&top_k=5")
+    assert status == 200
+    assert record['error'] is None
+    assert [result['profile_data']['filename'] for result in record['results']] == ["1001.pdf", "2001.pdf", "2002.pdf"]
+    assert record['results'][0]['skills'] == {'python': 1, 'sql': 1}
+
+def test_search_post(service):
+    body = json.dumps({'keywords': "figma", 'method': "BM", 'top_k': 1})
+    status, _, record = service.request("POST", "/search", body, {'Content-Type': "application/json"})
+    assert status == 200
+    assert record['method'] == "BM" and record['top_k'] == 1
+    assert [result['profile_data']['category'] for result in record['results']] == ["DESIGNER"]
+
+def test_keep_alive_connection_serves_several_requests(service):
+    conn = http.client.HTTPConnection(service.host, service.port, timeout=30)
+    try:
+        for keywords in ("python", "excel", "java"):
+            conn.request("GET", f"/search?keywords={keywords}")
+            response = conn.getresponse()
+            assert response.status == 200
+            assert json.loads(response.read())['keywords'] == keywords
+    finally:
+        conn.close()
+
+def test_resume(service):
+    status, _, resume = service.request("GET", "/resume/1")
+    assert status == 200
+    assert resume['filename'] == "1001.pdf"
+    assert "Senior Accountant" in resume['extracted_text']
+
+    assert service.request("GET", "/resume/999")[0] == 404
+    assert service.request("GET", "/resume/abc")[0] == 400
+
+def test_stats(service):
+    status, _, stats = service.request("GET", "/stats")
+    assert status == 200
+    assert stats['corpus']['total_resumes'] == 5
+    assert stats['service']['searches'] >= 0
+
+@pytest.mark.parametrize("method, path, body", [
+    ("GET", "/search?keywords=(python", None),
+    ("GET", "/search?keywords=%22sql", None),
+    ("GET", "/search", None),
+    ("GET", "/search?keywords=python&top_k=many", None),
+    ("POST", "/search", "{not json"),
+    ("POST", "/search", "[1, 2]"),
+])
+def test_bad_requests(service, method, path, body):
+    status, _, payload = service.request(method, path, body)
+    assert status == 400
+    assert payload['error']
+
+def test_malformed_query_reports_request_error(service):
+    status, _, record = service.request("GET", "/search?keywords=(python")
+    assert status == 400
+    assert record['error_kind'] == "request"
+    assert "QuerySyntaxError" in record['error']
+
+def test_unknown_path_and_method(service):
+    assert service.request("GET", "/nope")[0] == 404
+    assert service.request("DELETE", "/search")[0] == 405
+
+def test_oversized_body(service):
+    status, headers, payload = service.request("POST", "/search", json.dumps({'keywords': "x" * 2048}))
+    assert status == 413
+    assert headers['Connection'] == "close"
+
+def test_queue_limit_returns_503_with_retry_after(small_corpus_dir):
+    spec = {'type': 'corpus', 'data_dir': str(small_corpus_dir)}
+    # tanpa slot antrian: setiap search ditolak sebelum sampai ke worker
+    with RunningService(spec, {'workers': 1, 'warmup': False, 'max_queued_searches': 0}) as running:
+        status, headers, payload = running.request("GET", "/search?keywords=python")
+        assert status == 503
+        assert headers['Retry-After'] == "1"
+        assert payload == {'error': "Too many pending searches"}
+        assert running.request("GET", "/health")[0] == 200
+        assert running.request("GET", "/stats")[2]['service']['rejected'] == 1
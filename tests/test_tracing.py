@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from core import tracing
+
+@pytest.fixture
+def trace_path(tmp_path, monkeypatch):
+    path = tmp_path / "search_trace.jsonl"
+    monkeypatch.setattr(tracing, "_load_settings",
+                        lambda: dict(tracing._DEFAULT_SETTINGS, path=str(path)))
+    monkeypatch.setattr(tracing, "_writer", None)
+    monkeypatch.delenv(tracing.ENV_VAR, raising=False)
+    return path
+
+def run_trace():
+    with tracing.start_trace("search", keywords="python") as trace:
+        with tracing.span("exact"):
+            tracing.count("matcher.kmp", 3)
+    return trace
+
+def test_export_is_off_by_default(trace_path):
+    trace = run_trace()
+    assert not trace_path.exists()
+    # span tetap dicatat di memory untuk panel timing
+    assert [path for path, _, _, _ in trace.phases()] == ["exact"]
+    assert trace.counters() == {"matcher.kmp": 3}
+
+def test_env_var_enables_export(trace_path, monkeypatch):
+    monkeypatch.setenv(tracing.ENV_VAR, "1")
+    trace = run_trace()
+    record, = [json.loads(line) for line in trace_path.read_text(encoding="utf-8").splitlines()]
+    assert record['trace_id'] == trace.trace_id
+    assert record['attrs'] == {'keywords': "python"}
+
+def test_env_var_overrides_config(trace_path, monkeypatch):
+    monkeypatch.setattr(tracing, "_load_settings",
+                        lambda: dict(tracing._DEFAULT_SETTINGS, path=str(trace_path), enabled=True))
+    monkeypatch.setenv(tracing.ENV_VAR, "0")
+    run_trace()
+    assert not trace_path.exists()
+
+def test_writer_rotates(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    writer = tracing.TraceWriter(str(path), max_bytes=200, backups=2)
+    for index in range(20):
+        writer.write({'index': index, 'padding': "x" * 40})
+    files = sorted(p.name for p in tmp_path.iterdir() if not p.name.endswith(".lock"))
+    assert files == ["trace.jsonl", "trace.jsonl.1", "trace.jsonl.2"]
+    last = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert last[-1]['index'] == 19
+    assert all(p.stat().st_size <= 200 for p in tmp_path.iterdir())